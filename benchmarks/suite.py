@@ -0,0 +1,276 @@
+"""Benchmark suite for partitions, Young groups and isomorphism search
+
+Each benchmark is timed as the best of several repeats, and its peak memory is measured by
+tracemalloc in one further run, with the caches of formality cleared before every run. Results
+are compared against a saved JSON baseline, and benchmarks slower or larger than the baseline
+by more than a tolerance are flagged as regressions.
+
+Usage:
+
+    python -m benchmarks.suite                   # run and compare against benchmarks/baseline.json
+    python -m benchmarks.suite --save            # run and overwrite the baseline
+    python -m benchmarks.suite -k find_iso       # run only benchmarks whose name contains find_iso
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy
+from sympy.combinatorics import DihedralGroup, SymmetricGroup
+
+from maths.comb import partition, rsk, standard
+from maths.comb.young import YoungTableau
+from maths.groups import cache, cayley, invariants, iso, perm, young
+from maths.groups.iso import IsoMethod
+
+BASELINE = pathlib.Path(__file__).parent / 'baseline.json'
+
+# Relative increase over the baseline above which a benchmark is flagged
+TOLERANCE = 0.5
+
+
+def _y22(**flags):
+    """Y(2+2) group of the experiments"""
+    return young.group(YoungTableau("2 + 2", zero_indexed=True), **flags)
+
+
+def _y222(**flags):
+    """Y(2+2+2) group of the experiments"""
+    return young.group(YoungTableau("2 + 2 + 2", zero_indexed=True), **flags)
+
+
+def _generate(n: int) -> Callable[[], None]:
+    def run():
+        for _ in partition.generate_partitions(n, reuse=True):
+            pass
+    return run
+
+
+def _standard_words(p: str) -> Callable[[], None]:
+    def run():
+        for _ in standard.words(YoungTableau(p)):
+            pass
+    return run
+
+
+def _standard_sample(p: str, size: int) -> Callable[[], None]:
+    def run():
+        standard.sample(YoungTableau(p), size, rng=0)
+    return run
+
+
+def _rsk(m: int, n: int, **kwargs) -> Callable[[], None]:
+    perms = numpy.argsort(numpy.random.default_rng(0).random((m, n)), axis=1)
+
+    def run():
+        rsk.rsk(perms, **kwargs)
+    return run
+
+
+def _order(p: str, **flags) -> Callable[[], None]:
+    def run():
+        young.group(YoungTableau(p), **flags).order()
+    return run
+
+
+def _closure(p: str, **flags) -> Callable[[], None]:
+    gens = young.group(YoungTableau(p, zero_indexed=True), backend='numpy', **flags).gens_array
+
+    def run():
+        perm.closure(gens)
+    return run
+
+
+def _schreier_sims(p: str, **flags) -> Callable[[], None]:
+    """Enumeration by sympy of the same group as _closure, for comparison"""
+    def run():
+        for _ in young.group(YoungTableau(p, zero_indexed=True), **flags).generate_schreier_sims(af=True):
+            pass
+    return run
+
+
+def _is_iso_possible(A: Callable, B: Callable) -> Callable[[], None]:
+    def run():
+        iso.is_iso_possible(A(), B())
+    return run
+
+
+def _find_iso(A: Callable, B: Callable, method: IsoMethod, **kwargs) -> Callable[[], None]:
+    def run():
+        iso.find_iso(A(), B(), method, **kwargs)
+    return run
+
+
+# Benchmarks by name, each a callable run from cold caches
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    'generate_partitions[20]': _generate(20),
+    'generate_partitions[40]': _generate(40),
+    'generate_partitions[50]': _generate(50),
+    'standard_words[6+5+4+2]': _standard_words("6 + 5 + 4 + 2"),
+    'standard_sample[6+5+4+2,10000]': _standard_sample("6 + 5 + 4 + 2", 10000),
+    'rsk[2000x50]': _rsk(2000, 50),
+    'rsk[2000x50,shape_only]': _rsk(2000, 50, shape_only=True),
+    'group_order[3+2+1]': _order("3 + 2 + 1"),
+    'group_order[4+3+2+1]': _order("4 + 3 + 2 + 1"),
+    'group_order[4+3+2+1,R]': _order("4 + 3 + 2 + 1", include_cols=False, include_fused_rows=True),
+    'group_order[5+5+3+3,R]': _order("5 + 5 + 3 + 3", include_cols=False, include_fused_rows=True),
+    'closure[4+4+4+3+1,R]': _closure("4 + 4 + 4 + 3 + 1", include_cols=False),
+    'closure[3+3+3+3+3,R+FR]': _closure("3 + 3 + 3 + 3 + 3", include_cols=False, include_fused_rows=True),
+    'closure[6+5+5,C+FC]': _closure("6 + 5 + 5", include_rows=False, include_fused_cols=True),
+    'schreier_sims[4+4+4+3+1,R]': _schreier_sims("4 + 4 + 4 + 3 + 1", include_cols=False),
+    'schreier_sims[3+3+3+3+3,R+FR]': _schreier_sims("3 + 3 + 3 + 3 + 3", include_cols=False, include_fused_rows=True),
+    'schreier_sims[6+5+5,C+FC]': _schreier_sims("6 + 5 + 5", include_rows=False, include_fused_cols=True),
+    'is_iso_possible[Y(2+2),D8]': _is_iso_possible(_y22, lambda: DihedralGroup(4)),
+    'is_iso_possible[Y(2+2)_R,D8]': _is_iso_possible(lambda: _y22(include_cols=False, include_fused_rows=True), lambda: DihedralGroup(4)),
+    'is_iso_possible[Y(2+2+2),D12]': _is_iso_possible(_y222, lambda: DihedralGroup(6)),
+    'is_iso_possible[Y(2+2+2)_R,D12]': _is_iso_possible(lambda: _y222(include_cols=False, include_fused_rows=True), lambda: DihedralGroup(6)),
+    'find_iso[Y(2+2)_R,D8,element_orders]': _find_iso(lambda: _y22(include_cols=False, include_fused_rows=True), lambda: DihedralGroup(4), IsoMethod.ElementOrders),
+    'find_iso[Y(2+2)_R,D8,backtrack]': _find_iso(lambda: _y22(include_cols=False, include_fused_rows=True), lambda: DihedralGroup(4), IsoMethod.Backtrack),
+    'find_iso[Y(2+2),S4,backtrack]': _find_iso(_y22, lambda: SymmetricGroup(4), IsoMethod.Backtrack),
+    'find_iso[Y(2+2+2),S6,backtrack]': _find_iso(_y222, lambda: SymmetricGroup(6), IsoMethod.Backtrack),
+}
+
+
+def clear_caches():
+    """Clear the in-memory caches of formality, so that every run starts cold"""
+    cache.clear()
+    standard._completions.cache_clear()
+    cayley.cayley_table.cache_clear()
+    invariants.invariants.cache_clear()
+
+
+def measure(func: Callable[[], None], repeat: int = 3) -> Dict[str, float]:
+    """Measure the time and peak memory of a benchmark
+
+    Args:
+        func:
+            Callable, benchmark
+        repeat:
+            int, number of timed runs, the fastest of which is reported
+
+    Returns:
+        dict: time, in seconds, and peak_memory, in bytes
+    """
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    # Memory is measured separately, as tracing slows down the run
+    clear_caches()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'time': min(times), 'peak_memory': peak}
+
+
+def run(names: Optional[List[str]] = None, repeat: int = 3, verbose: bool = True) -> Dict[str, Dict[str, float]]:
+    """Run benchmarks
+
+    Args:
+        names:
+            List[str], optional, names of the benchmarks to run, default all of BENCHMARKS
+        repeat:
+            int, number of timed runs of each benchmark
+        verbose:
+            bool, print each result as it is measured
+
+    Returns:
+        dict: results by benchmark name, see measure
+    """
+    results = {}
+    for name in names if names is not None else BENCHMARKS:
+        results[name] = measure(BENCHMARKS[name], repeat=repeat)
+        if verbose:
+            print(f"{name:45s} {results[name]['time'] * 1e3:10.2f} ms {results[name]['peak_memory'] / 1024:10.1f} KiB")
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float = TOLERANCE) -> List[str]:
+    """Compare results against a baseline
+
+    Args:
+        results:
+            dict, results by benchmark name, see run
+        baseline:
+            dict, baseline results by benchmark name
+        tolerance:
+            float, relative increase over the baseline above which a result is a regression
+
+    Returns:
+        List[str]: description of each regression, empty if there are none
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric in ('time', 'peak_memory'):
+            before, after = baseline[name][metric], result[metric]
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {before:.4g} -> {after:.4g} ({after / before - 1:+.0%})")
+    return regressions
+
+
+def load(path: pathlib.Path = BASELINE) -> Dict[str, Dict[str, float]]:
+    """Load the benchmark results of a baseline file
+
+    Args:
+        path:
+            pathlib.Path, baseline file
+
+    Returns:
+        dict: results by benchmark name, empty if the file does not exist
+    """
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())['results']
+
+
+def save(results: Dict[str, Dict[str, float]], path: pathlib.Path = BASELINE):
+    """Save benchmark results as a baseline file, along with the platform they were measured on
+
+    Args:
+        results:
+            dict, results by benchmark name, see run
+        path:
+            pathlib.Path, baseline file
+    """
+    data = {'machine': platform.machine(), 'python': platform.python_version(), 'results': results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line, returning 1 if any benchmark regressed"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='keyword', default='', help='run only benchmarks whose name contains this keyword')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each benchmark')
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE, help='baseline file')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='relative increase flagged as a regression')
+    parser.add_argument('--save', action='store_true', help='save the results as the baseline')
+    args = parser.parse_args(argv)
+
+    results = run([name for name in BENCHMARKS if args.keyword in name], repeat=args.repeat)
+    if args.save:
+        save({**load(args.baseline), **results}, args.baseline)
+        return 0
+
+    regressions = compare(results, load(args.baseline), tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
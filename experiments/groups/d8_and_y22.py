@@ -4,7 +4,7 @@
 from sympy.combinatorics import DihedralGroup, SymmetricGroup
 
 from maths.comb.young import YoungTableau
-from maths.groups import iso, young
+from maths.groups import cache, iso
 
 
 def create_s4():
@@ -23,7 +23,7 @@ def create_y22():
     Young Symmetrizer group generated by Riemann Tensor index symmetries
     """
     yt = YoungTableau("2 + 2", zero_indexed=True)
-    return young.group(yt)
+    return cache.group(yt)
 
 
 def create_y22_row_fused():
@@ -32,7 +32,7 @@ def create_y22_row_fused():
     Young Symmetrizer group generated by Riemann Tensor index symmetries
     """
     yt = YoungTableau("2 + 2", zero_indexed=True)
-    return young.group(yt, include_fused_rows=True, include_cols=False)
+    return cache.group(yt, include_fused_rows=True, include_cols=False)
 
 
 # return PermutationGroup([
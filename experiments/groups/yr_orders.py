@@ -10,42 +10,59 @@ Conclusions:
     - |Y(p)_R| = |Y(p)_RO| * Prod(q_i!), where q_i is the number of rows with length i in the partition p
 
 """
+from typing import Iterable, List, Optional
+
 import pandas
 from sympy.combinatorics import DihedralGroup, SymmetricGroup
 
-from maths.comb import partition
+from maths import sweep
 from maths.comb.young import YoungTableau
 from maths.groups import young
+from maths.groups.cache import InvariantStore
 
+# Generator flags of Y(p), Y(p)_R and Y(p)_RO
+FLAGS = ({}, {'include_fused_rows': True, 'include_cols': False}, {'include_fused_rows': False, 'include_cols': False})
 
-def check_effect_of_row_fusing_on_orders(n: int):
-    """Check the effect of fusing rows on the orders of the resulting groups"""
-    data = []
 
-    for p in partition.generate_partitions(n):
-        # Create the Young Tableau
-        yt_p = YoungTableau(p)
+def _save(path: str, rows: Iterable[List]):
+    """Save the orders of Y(p), Y(p)_R and Y(p)_RO of each row to an InvariantStore, in one transaction"""
+    with InvariantStore(path) as store:
+        store.put('order', ((YoungTableau(row[0]), flags, order) for row in rows for flags, order in zip(FLAGS, row[1:4])))
 
-        o_y = young.group(yt_p).order()
-        o_yr = young.group(yt_p, include_fused_rows=True, include_cols=False).order()
-        o_y_r2 = young.group(yt_p, include_fused_rows=False, include_cols=False).order()
 
+def row_fusing_orders(p):
+    """Compute the group orders for a single partition, see check_effect_of_row_fusing_on_orders"""
+    n = sum(p)
 
-        data.append([
-            p,
-            o_y,
-            o_yr,
-            o_y_r2,
-            o_y / o_yr,
-            o_y / o_y_r2,
-            DihedralGroup(n).order(),  # 2 * n
-            SymmetricGroup(n).order(),  # n!
-        ])
+    # Create the Young Tableau
+    yt_p = YoungTableau(p)
 
+    o_y = young.group_order(yt_p)
+    o_yr = young.group_order(yt_p, include_fused_rows=True, include_cols=False)
+    o_y_r2 = young.group_order(yt_p, include_fused_rows=False, include_cols=False)
+
+    return [
+        p,
+        o_y,
+        o_yr,
+        o_y_r2,
+        o_y / o_yr,
+        o_y / o_y_r2,
+        DihedralGroup(n).order(),  # 2 * n
+        SymmetricGroup(n).order(),  # n!
+    ]
+
+
+def check_effect_of_row_fusing_on_orders(n: int, workers: Optional[int] = None, path: Optional[str] = None):
+    """Check the effect of fusing rows on the orders of the resulting groups, saving the orders to the
+    InvariantStore at path, if given, once the sweep is over"""
+    data = [row for _, row in sweep.sweep(row_fusing_orders, n, workers=workers)]
+    if path is not None:
+        _save(path, data)
     return data
 
 
-def check_row_fused_subgroup_order(n: int):
+def check_row_fused_subgroup_order(n: int, path: Optional[str] = None):
     """Check the effect of fusing rows on the orders of the resulting groups"""
     data = []
 
@@ -55,9 +72,9 @@ def check_row_fused_subgroup_order(n: int):
         p = k * [2]
         yt_p = YoungTableau(p)
 
-        o_y = young.group(yt_p).order()
-        o_yr = young.group(yt_p, include_fused_rows=True, include_cols=False).order()
-        o_y_r2 = young.group(yt_p, include_fused_rows=False, include_cols=False).order()
+        o_y = young.group_order(yt_p)
+        o_yr = young.group_order(yt_p, include_fused_rows=True, include_cols=False)
+        o_y_r2 = young.group_order(yt_p, include_fused_rows=False, include_cols=False)
 
 
         data.append([
@@ -71,6 +88,9 @@ def check_row_fused_subgroup_order(n: int):
             SymmetricGroup(n).order(),  # n!
         ])
 
+    if path is not None:
+        _save(path, data)
+
     return pandas.DataFrame(data, columns=[
         'Partition',
         'Yk2',
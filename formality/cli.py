@@ -0,0 +1,106 @@
+"""Command line interface, the formality console command
+
+    formality sweep --family all --n 2:8 --flags rows,cols --flags rows,fused_rows --compare dihedral --store results.db
+    formality show --store results.db
+
+A sweep computes the rows missing from its store, see experiment.run, so rerunning it, or
+extending its range, only computes new rows, and an interrupted sweep resumes where it stopped.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from maths import experiment
+from maths.store import ResultStore
+
+# Default path of the result store
+STORE = 'formality.db'
+
+
+def parse_range(spec: str) -> range:
+    """Parse a range of n, either a single value 'n' or an inclusive range 'start:stop'
+
+    Args:
+        spec:
+            str, range
+
+    Returns:
+        range
+    """
+    start, _, stop = spec.partition(':')
+    return range(int(start), int(stop or start) + 1)
+
+
+def _format(row: dict, result: dict) -> str:
+    """Format a row as a line of tab separated values"""
+    flags = ','.join(name for name, kwarg in experiment.FLAGS.items() if row['flags'][kwarg])
+    p = ' + '.join(str(part) for part in row['partition'])
+    fields = [p, flags, str(result['order'])]
+    if row['compare'] is not None:
+        fields += [row['compare'], str(result['compare_order']), str(result['iso_possible'])]
+    return '\t'.join(fields)
+
+
+def sweep(args: argparse.Namespace) -> int:
+    """Run a sweep, printing each row as it is computed"""
+    flags = [experiment.parse_flags(spec) for spec in args.flags or ['rows,cols']]
+    rows = experiment.params(args.family, parse_range(args.n), flags, compare=args.compare or [None])
+
+    computed = 0
+    with ResultStore(args.store) as store:
+        for row, result, new in experiment.run(store, rows, workers=args.workers):
+            computed += new
+            if args.verbose or new:
+                print(_format(row, result))
+
+    print(f"{computed} rows computed, {len(rows) - computed} found in {args.store}", file=sys.stderr)
+    return 0
+
+
+def show(args: argparse.Namespace) -> int:
+    """Print every row of a store"""
+    with ResultStore(args.store) as store:
+        for row, result in store.rows():
+            print(json.dumps({**row, **result}) if args.json else _format(row, result))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the formality console command
+
+    Args:
+        argv:
+            List[str], optional, command line arguments, default sys.argv[1:]
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(prog='formality', description='Sweeps over the groups of Young Tableaux')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_sweep = commands.add_parser('sweep', help='compute the rows of a sweep missing from the store')
+    parser_sweep.add_argument('--family', default='all', choices=list(experiment.FAMILIES), help='family of partitions')
+    parser_sweep.add_argument('--n', required=True, help="number of boxes, 'n' or an inclusive range 'start:stop'")
+    parser_sweep.add_argument('--flags', action='append', help=f"comma separated generators, some of {','.join(experiment.FLAGS)}, may be repeated")
+    parser_sweep.add_argument('--compare', action='append', choices=list(experiment.COMPARISONS), help='group to compare with, may be repeated')
+    parser_sweep.add_argument('--workers', type=int, default=0, help='number of worker processes, 0 to run in this process')
+    parser_sweep.add_argument('--store', default=STORE, help='path of the result store')
+    parser_sweep.add_argument('--verbose', action='store_true', help='also print rows found in the store')
+    parser_sweep.set_defaults(func=sweep)
+
+    parser_show = commands.add_parser('show', help='print the rows of a store')
+    parser_show.add_argument('--store', default=STORE, help='path of the result store')
+    parser_show.add_argument('--json', action='store_true', help='print rows as JSON lines')
+    parser_show.set_defaults(func=show)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
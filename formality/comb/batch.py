@@ -0,0 +1,299 @@
+"""Array-backed batches of integer partitions
+
+A PartitionBatch stores many partitions as a zero-padded matrix of parts, one
+partition per row with parts in non-increasing order, along with the number of
+parts in each row. Statistics are computed for the whole batch at once, so that
+sweeps over all partitions of n can be processed one array at a time, see batches.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Generator, List, Sequence, Union
+
+import numpy
+
+from maths.comb import partition
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import IntegerPartition
+
+
+def int_dtype(max_value: int) -> numpy.dtype:
+    """Get the smallest signed integer dtype that can hold values up to max_value
+
+    Args:
+        max_value:
+            int, largest value to be stored
+
+    Returns:
+        numpy.dtype
+    """
+    for dtype in (numpy.int8, numpy.int16, numpy.int32):
+        if max_value <= numpy.iinfo(dtype).max:
+            return numpy.dtype(dtype)
+    return numpy.dtype(numpy.int64)
+
+
+class PartitionBatch:
+    """Batch of integer partitions, stored as a padded matrix of parts"""
+
+    def __init__(self, parts: numpy.ndarray, lengths: numpy.ndarray):
+        """Create a batch of partitions
+
+        Args:
+            parts:
+                numpy.ndarray, shape (k, m), parts of each partition in non-increasing order, zero-padded
+            lengths:
+                numpy.ndarray, shape (k,), number of parts in each partition
+        """
+        self.parts = parts
+        self.lengths = lengths
+
+    @classmethod
+    def from_lists(cls, partitions: Sequence[Sequence[int]]) -> 'PartitionBatch':
+        """Create a batch from a sequence of partitions, each a sequence of non-increasing parts
+
+        Args:
+            partitions:
+                Sequence[Sequence[int]], partitions
+
+        Returns:
+            PartitionBatch
+        """
+        lengths = numpy.fromiter((len(p) for p in partitions), dtype=numpy.int64, count=len(partitions))
+        flat = numpy.fromiter((part for p in partitions for part in p), dtype=numpy.int64, count=int(lengths.sum()))
+        width = int(lengths.max()) if len(lengths) else 0
+        dtype = int_dtype(int(flat.max()) if len(flat) else 0)
+
+        # Scatter the flat parts into the rows of the padded matrix
+        parts = numpy.zeros((len(partitions), width), dtype=dtype)
+        parts[numpy.arange(width) < lengths[:, None]] = flat
+        return cls(parts, lengths.astype(int_dtype(width)))
+
+    def __len__(self) -> int:
+        """Number of partitions in the batch"""
+        return len(self.lengths)
+
+    def __getitem__(self, i: int) -> List[int]:
+        """Get a single partition as a list of parts"""
+        return self.parts[i, :self.lengths[i]].tolist()
+
+    def tolist(self) -> List[List[int]]:
+        """Get the partitions as lists of parts
+
+        Returns:
+            List[List[int]]: partitions
+        """
+        return [row[:length] for row, length in zip(self.parts.tolist(), self.lengths.tolist())]
+
+    def to_integer_partitions(self) -> List[IntegerPartition]:
+        """Get the partitions as sympy IntegerPartition objects
+
+        Returns:
+            List[IntegerPartition]: partitions
+        """
+        from sympy.combinatorics import IntegerPartition
+        return [IntegerPartition(p) for p in self.tolist()]
+
+    def sizes(self) -> numpy.ndarray:
+        """Get the number partitioned by each partition, the sum of its parts
+
+        Returns:
+            numpy.ndarray: shape (k,)
+        """
+        return self.parts.sum(axis=1, dtype=numpy.int64)
+
+    def largest_parts(self) -> numpy.ndarray:
+        """Get the largest part of each partition, zero for the empty partition
+
+        Returns:
+            numpy.ndarray: shape (k,)
+        """
+        return self.parts[:, 0] if self.parts.shape[1] else numpy.zeros(len(self), dtype=self.parts.dtype)
+
+    def multiplicities(self) -> numpy.ndarray:
+        """Get the multiplicity vectors of the partitions, q_i being the number of parts equal to i
+
+        Returns:
+            numpy.ndarray: shape (k, M + 1), where M is the largest part in the batch, column 0 is zero
+        """
+        width = int(self.parts.max(initial=0)) + 1
+        index = numpy.arange(len(self))[:, None] * width + self.parts
+        mult = numpy.bincount(index.ravel(), minlength=len(self) * width).reshape(len(self), width)
+
+        # Column zero counted the padding
+        mult[:, 0] = 0
+        return mult
+
+    def conjugate(self) -> 'PartitionBatch':
+        """Get the conjugate partitions, whose parts are the column lengths of the Young diagrams
+
+        Returns:
+            PartitionBatch
+        """
+        # The j-th part of the conjugate is the number of parts greater than j
+        mult = self.multiplicities()
+        conj = numpy.cumsum(mult[:, ::-1], axis=1)[:, ::-1][:, 1:]
+        return PartitionBatch(conj.astype(int_dtype(self.parts.shape[1])), self.largest_parts().astype(numpy.int64))
+
+    def factorial_product(self, log: bool = False) -> numpy.ndarray:
+        """Get the product of the factorials of the parts, Prod(p_i!)
+
+        Args:
+            log:
+                bool, if True return the natural logarithm as floats, otherwise exact integers
+
+        Returns:
+            numpy.ndarray: shape (k,), dtype float64 if log else object
+        """
+        return _factorial_product(self.parts, log=log)
+
+    def multiplicity_factorial_product(self, log: bool = False) -> numpy.ndarray:
+        """Get the product of the factorials of the multiplicities, Prod(q_i!)
+
+        Args:
+            log:
+                bool, if True return the natural logarithm as floats, otherwise exact integers
+
+        Returns:
+            numpy.ndarray: shape (k,), dtype float64 if log else object
+        """
+        return _factorial_product(self.multiplicities(), log=log)
+
+    def hook_product(self, log: bool = False) -> numpy.ndarray:
+        """Get the product of the hook lengths over the cells of each Young diagram
+
+        Args:
+            log:
+                bool, if True return the natural logarithm as floats, otherwise exact integers
+
+        Returns:
+            numpy.ndarray: shape (k,), dtype float64 if log else object
+        """
+        conj = self.conjugate().parts.astype(numpy.int64)
+        cols = numpy.arange(conj.shape[1])
+        result = numpy.zeros(len(self)) if log else numpy.ones(len(self), dtype=object)
+
+        # One row of cells at a time, hook = arm + leg + 1, restricted to the columns reached by that row
+        for i in range(self.parts.shape[1]):
+            row = self.parts[:, i].astype(numpy.int64)[:, None]
+            width = int(row.max())
+            hooks = numpy.where(cols[:width] < row, row - cols[:width] + conj[:, :width] - i - 1, 1)
+            if log:
+                result += numpy.log(hooks).sum(axis=1)
+            else:
+                result *= numpy.prod(hooks.astype(object), axis=1)
+
+        return result
+
+    def num_standard(self) -> numpy.ndarray:
+        """Get the number of standard Young tableaux of each shape, by the hook length formula
+
+        Returns:
+            numpy.ndarray: shape (k,), dtype object, exact integers
+        """
+        factorials = numpy.array([math.factorial(int(n)) for n in self.sizes()], dtype=object)
+        return factorials // self.hook_product()
+
+    def dimension(self, d: int) -> numpy.ndarray:
+        """Get the dimension of the irreducible representation of GL(d) of each shape, by the hook content formula
+
+        Args:
+            d:
+                int, dimension of the underlying vector space
+
+        Returns:
+            numpy.ndarray: shape (k,), dtype object, exact integers
+        """
+        cols = numpy.arange(int(self.parts.max(initial=0)))
+        numerator = numpy.ones(len(self), dtype=object)
+
+        # One row of cells at a time, the factor of cell (i, j) is d + j - i
+        for i in range(self.parts.shape[1]):
+            row = self.parts[:, i].astype(numpy.int64)[:, None]
+            width = int(row.max())
+            factors = numpy.where(cols[:width] < row, d + cols[:width] - i, 1)
+            numerator *= numpy.prod(factors.astype(object), axis=1)
+
+        return numerator // self.hook_product()
+
+    def dominates(self, other: Union[Sequence[int], 'PartitionBatch']) -> numpy.ndarray:
+        """Check the dominance order, where p dominates q if every partial sum of the parts of p is
+        at least the corresponding partial sum of q. Partitions of the same n are assumed.
+
+        Args:
+            other:
+                Sequence[int] or PartitionBatch, a single partition compared to every partition in
+                the batch, or a batch of the same length compared pairwise
+
+        Returns:
+            numpy.ndarray: shape (k,), bool
+        """
+        theirs = numpy.atleast_2d(other.parts if isinstance(other, PartitionBatch) else numpy.asarray(other, dtype=numpy.int64))
+        width = max(self.parts.shape[1], theirs.shape[1])
+        mine = numpy.cumsum(_pad(self.parts, width), axis=1)
+        theirs = numpy.cumsum(_pad(theirs, width), axis=1)
+        return (mine >= theirs).all(axis=1)
+
+
+def _pad(parts: numpy.ndarray, width: int) -> numpy.ndarray:
+    """Pad a matrix of parts with zero columns up to the given width"""
+    return numpy.pad(parts.astype(numpy.int64), ((0, 0), (0, width - parts.shape[1])))
+
+
+def _factorial_product(values: numpy.ndarray, log: bool = False) -> numpy.ndarray:
+    """Get the product of the factorials along each row of a matrix of non-negative integers
+
+    Args:
+        values:
+            numpy.ndarray, shape (k, m)
+        log:
+            bool, if True return the natural logarithm as floats, otherwise exact integers
+
+    Returns:
+        numpy.ndarray: shape (k,), dtype float64 if log else object
+    """
+    top = int(values.max(initial=0)) + 1
+    if log:
+        table = numpy.array([math.lgamma(i + 1) for i in range(top)])
+        return table[values].sum(axis=1)
+
+    table = numpy.array([math.factorial(i) for i in range(top)], dtype=object)
+    return numpy.prod(table[values], axis=1) if values.shape[1] else numpy.ones(len(values), dtype=object)
+
+
+def batches(n: int, chunk_size: int = 65536, **restrictions) -> Generator[PartitionBatch, None, None]:
+    """Generate the partitions of n in batches of at most chunk_size partitions, in the order of
+    partition.generate_partitions
+
+    Args:
+        n:
+            int, number to partition
+        chunk_size:
+            int, number of partitions per batch
+        **restrictions:
+            max_part, num_parts or min_part, passed to partition.generate_partitions
+
+    Returns:
+        Generator[PartitionBatch]: batches of partitions
+    """
+    dtype = int_dtype(n)
+    parts = numpy.zeros((chunk_size, n), dtype=dtype)
+    lengths = numpy.zeros(chunk_size, dtype=dtype)
+    k = 0
+
+    for p in partition.generate_partitions(n, reuse=True, **restrictions):
+        parts[k, :len(p)] = p
+        lengths[k] = len(p)
+        k += 1
+
+        if k == chunk_size:
+            width = int(lengths.max())
+            yield PartitionBatch(parts[:, :width].copy(), lengths.copy())
+            parts[:] = 0
+            k = 0
+
+    if k:
+        width = int(lengths[:k].max())
+        yield PartitionBatch(parts[:k, :width].copy(), lengths[:k].copy())
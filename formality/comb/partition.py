@@ -4,10 +4,20 @@ References:
 	[1] https://docs.sympy.org/latest/modules/combinatorics/partitions.html#sympy.combinatorics.partitions.IntegerPartition
 """
 
+from __future__ import annotations
+
+import bisect
+import functools
+import operator
+import random
 import re
-from typing import List, Generator
+from typing import TYPE_CHECKING, Iterable, List, Generator, Optional, Sequence
+
+from maths import instrument
 
-from sympy.combinatorics import IntegerPartition
+if TYPE_CHECKING:
+    # Imported when an IntegerPartition is requested, see from_str, as sympy is slow to import
+    from sympy.combinatorics import IntegerPartition
 
 # The pattern below is used to match a valid partition notation
 # A valid partition notation is a string of the form "a1 + a2 + ... + an"
@@ -32,8 +42,8 @@ def is_valid_partition(p: str) -> bool:
     if not PATTERN_PARTITION_NOTATION.match(p):
         return False
 
-    # Check that the partition is in decreasing order
-    parts = p.split("+")
+    # Check that the partition is in decreasing order, comparing the parts as integers
+    parts = [int(part) for part in p.split("+")]
     for i in range(1, len(parts)):
         if parts[i] > parts[i - 1]:
             return False
@@ -59,9 +69,73 @@ def from_str(p: str) -> IntegerPartition:
     parts = [int(part.strip()) for part in parts]
 
     # Create the IntegerPartition object
+    from sympy.combinatorics import IntegerPartition
     return IntegerPartition(parts)
 
 
+def _parse(p: str) -> List[int]:
+    """Parse a string notation partition in a single pass, see parse_many
+
+    Args:
+        p:
+            str, partition notation
+
+    Returns:
+        list: parts of the partition
+    """
+    parts = []
+    prev = None
+    for token in p.split("+"):
+        token = token.strip()
+        if not token.isdigit():
+            raise ValueError(f"Invalid partition notation: {p}")
+        part = int(token)
+        if part < 1 or (prev is not None and part > prev):
+            raise ValueError(f"Invalid partition notation: {p}")
+        parts.append(part)
+        prev = part
+    return parts
+
+
+def _sorted_parts(parts: Sequence[int]) -> List[int]:
+    """Validate a list of parts in any order and sort them in non-increasing order, as the
+    partition of a sympy IntegerPartition but without importing sympy
+
+    Args:
+        parts:
+            Sequence[int], positive integers
+
+    Returns:
+        list: parts of the partition
+    """
+    checked = []
+    for part in parts:
+        try:
+            part = operator.index(part)
+        except TypeError:
+            raise ValueError(f"{part} is not an integer") from None
+        if part < 1:
+            raise ValueError(f"Parts must be positive integers, got {part}")
+        checked.append(part)
+    return sorted(checked, reverse=True)
+
+
+def parse_many(ps: Iterable[str]):
+    """Convert many string notation partitions, e.g. a1 + a2 + ... + an, into a
+    PartitionBatch. Each string is validated and parsed in a single pass; sympy
+    objects are only created on request, see PartitionBatch.to_integer_partitions.
+
+    Args:
+        ps:
+            Iterable[str], partition notations
+
+    Returns:
+        PartitionBatch: padded matrix of parts and number of parts per partition
+    """
+    from maths.comb.batch import PartitionBatch
+    return PartitionBatch.from_lists([_parse(p) for p in ps])
+
+
 def to_str(p: IntegerPartition) -> str:
     """Convert an Integer Partition object into a string notation partition,
     e.g. a1 + a2 + ... + an
@@ -100,25 +174,256 @@ def values(p: IntegerPartition, zero_indexed: bool = False) -> List[List[int]]:
     return equiv_classes
 
 
-def generate_partitions(n: int) -> Generator[List[int], None, None]:
-    """Generate all partitions of n
+def _fill(r: int, num_parts: Optional[int], min_part: int, cap: int) -> Optional[List[int]]:
+    """Get the lexicographically smallest sequence of non-increasing parts summing to r
+
+    Args:
+        r:
+            int, the remainder to be partitioned
+        num_parts:
+            int or None, exact number of parts, or None for any number of parts
+        min_part:
+            int, smallest allowed part
+        cap:
+            int, largest allowed part
+
+    Returns:
+        list or None: the parts, or None if no such sequence exists
+    """
+    if r == 0:
+        return [] if not num_parts else None
+
+    # The smallest leading part is achieved by using as many parts as possible, as evenly as possible
+    t = r // min_part if num_parts is None else num_parts
+    if t == 0:
+        return None
+
+    q, s = divmod(r, t)
+    if q < min_part or q + (s > 0) > cap:
+        return None
+
+    return [q + 1] * s + [q] * (t - s)
+
+
+def generate_partitions(n: int, max_part: Optional[int] = None, num_parts: Optional[int] = None, min_part: Optional[int] = None, *,
+                        reuse: bool = False, start: Optional[List[int]] = None) -> Generator[List[int], None, None]:
+    """Generate all partitions of n, each as a list of non-increasing parts. The partitions
+    are produced in lexicographic order, e.g. [1, 1, 1], [2, 1], [3] for n = 3.
+
+    The generator is iterative and runs in constant amortized time per partition when
+    reuse is True and no min_part or num_parts restriction is given. The restrictions are
+    applied during generation, so no partition is built only to be discarded.
 
     Args:
         n:
             int, number to partition
-        max_parts:
-            int, maximum number of parts in the partition
+        max_part:
+            int, largest allowed part, default None (no restriction)
+        num_parts:
+            int, exact number of parts, default None (no restriction)
+        min_part:
+            int, smallest allowed part, default None (no restriction)
+        reuse:
+            bool, if True the same list is yielded each time and modified in place, so it
+            must be copied by the caller if it is to be kept
+        start:
+            List[int], partition to resume from, e.g. from unrank, default None (the first partition)
 
     Returns:
-        list: list of IntegerPartition
+        Generator[List[int]]: partitions of n
     """
-    # base case of recursion: zero is the sum of the empty list
-    if n == 0:
-        yield []
+    lo = 1 if min_part is None else max(min_part, 1)
+    hi = n if max_part is None else max_part
+
+    a = _fill(n, num_parts, lo, hi) if start is None else list(start)
+    if a is None:
         return
 
-    # modify partitions of n-1 to form partitions of n
-    for p in generate_partitions(n - 1):
-        yield p + [1]
-        if p and (len(p) < 2 or p[-2] > p[-1]):
-            yield p[:-1] + [p[-1] + 1]
+    # Trailing ones are tracked separately when they can be merged two at a time
+    track_ones = lo == 1 and num_parts is None and hi >= 2
+    ones = len(a) - next((i + 1 for i in range(len(a) - 1, -1, -1) if a[i] != 1), 0)
+    enabled = instrument.ENABLED
+
+    while True:
+        yield a if reuse else list(a)
+        if enabled:
+            instrument.count('partitions.generated')
+
+        # Fast path: replace the two last ones by a two, the next partition in lexicographic order
+        if track_ones and ones >= 2:
+            a[len(a) - ones] = 2
+            a.pop()
+            ones -= 2
+            continue
+
+        # General case: find the rightmost part that can be increased, then refill the tail
+        tail_sum = 0
+        j = len(a) - 1
+        while j >= 0:
+            tail_sum += a[j]
+
+            # Increasing a part within a run of equal parts would break the ordering
+            if j > 0 and a[j] == a[j - 1]:
+                j -= 1
+                continue
+
+            bound = min(hi, a[j - 1]) if j > 0 else hi
+            rest = None if num_parts is None else num_parts - j - 1
+            tail = None
+            for v in range(a[j] + 1, min(bound, tail_sum) + 1):
+                if tail_sum - v < (rest or 0) * lo:
+                    break
+                tail = _fill(tail_sum - v, rest, lo, v)
+                if tail is not None:
+                    del a[j:]
+                    a.append(v)
+                    a.extend(tail)
+                    break
+
+            if tail is not None:
+                break
+            j -= 1
+
+        if j < 0:
+            return
+
+        ones = len(tail) if tail and tail[0] == 1 else 0
+
+
+# Memoized recurrence table, _PARTITION_TABLE[n][m] is the number of partitions of n with largest part at most m
+_PARTITION_TABLE: List[List[int]] = [[1]]
+
+
+def _partition_row(n: int) -> List[int]:
+    """Get the row of the partition table for n, extending the table as needed
+
+    Args:
+        n:
+            int, number to partition
+
+    Returns:
+        list: counts of partitions of n with largest part at most m, for m = 0, ..., n
+    """
+    for r in range(len(_PARTITION_TABLE), n + 1):
+        # p(r, m) = p(r, m - 1) + p(r - m, m), where p(r - m, m) is capped by the size of row r - m
+        row = [0]
+        for m in range(1, r + 1):
+            prev = _PARTITION_TABLE[r - m]
+            row.append(row[-1] + prev[min(m, r - m)])
+        _PARTITION_TABLE.append(row)
+
+    return _PARTITION_TABLE[n]
+
+
+@functools.lru_cache(maxsize=None)
+def _count_parts(n: int, num_parts: int, max_part: int) -> int:
+    """Count partitions of n with exactly num_parts parts, each at most max_part
+
+    Args:
+        n:
+            int, number to partition
+        num_parts:
+            int, exact number of parts
+        max_part:
+            int, largest allowed part
+
+    Returns:
+        int: number of partitions
+    """
+    # ways[j][s] counts multisets of j parts with sum s, built up one part size at a time
+    ways = [[0] * (n + 1) for _ in range(num_parts + 1)]
+    ways[0][0] = 1
+    for v in range(1, min(max_part, n) + 1):
+        for j in range(1, num_parts + 1):
+            for s in range(v, n + 1):
+                ways[j][s] += ways[j - 1][s - v]
+
+    return ways[num_parts][n]
+
+
+def count(n: int, max_part: Optional[int] = None, num_parts: Optional[int] = None) -> int:
+    """Count the partitions of n without enumerating them
+
+    Args:
+        n:
+            int, number to partition
+        max_part:
+            int, largest allowed part, default None (no restriction)
+        num_parts:
+            int, exact number of parts, default None (no restriction)
+
+    Returns:
+        int: number of partitions
+    """
+    if n < 0:
+        return 0
+
+    max_part = n if max_part is None else max(min(max_part, n), 0)
+    if num_parts is None:
+        return _partition_row(n)[max_part]
+
+    return _count_parts(n, num_parts, max_part)
+
+
+def rank(p: List[int]) -> int:
+    """Get the index of a partition in the order of generate_partitions
+
+    Args:
+        p:
+            List[int], partition as a list of non-increasing parts
+
+    Returns:
+        int: rank of the partition, from 0 to count(n) - 1
+    """
+    r = sum(p)
+    k = 0
+    for part in p:
+        # All partitions of the remainder with a smaller leading part come first
+        k += _partition_row(r)[part - 1]
+        r -= part
+
+    return k
+
+
+def unrank(n: int, k: int) -> List[int]:
+    """Get the partition of n with the given index in the order of generate_partitions
+
+    Args:
+        n:
+            int, number to partition
+        k:
+            int, rank of the partition, from 0 to count(n) - 1
+
+    Returns:
+        list: partition as a list of non-increasing parts
+    """
+    if not 0 <= k < count(n):
+        raise ValueError(f"Invalid rank {k} for partitions of {n}, must be in [0, {count(n)})")
+
+    p = []
+    r = n
+    while r > 0:
+        # Smallest leading part v such that more than k partitions of r have largest part at most v
+        row = _partition_row(r)
+        v = bisect.bisect_right(row, k)
+        k -= row[v - 1]
+        p.append(v)
+        r -= v
+
+    return p
+
+
+def random_partition(n: int, rng: Optional[random.Random] = None) -> List[int]:
+    """Sample a partition of n uniformly at random
+
+    Args:
+        n:
+            int, number to partition
+        rng:
+            random.Random, source of randomness, default None (the random module)
+
+    Returns:
+        list: partition as a list of non-increasing parts
+    """
+    rng = random if rng is None else rng
+    return unrank(n, rng.randrange(count(n)))
@@ -0,0 +1,232 @@
+"""Robinson-Schensted-Knuth correspondence between permutations and pairs of standard tableaux
+
+A permutation w of 0, ..., n - 1, in array form as in groups.perm, is mapped to a pair (P, Q) of
+standard Young tableaux of the same shape: P, the insertion tableau, is built by inserting
+w[0], w[1], ... into its rows, each value bumping the smallest larger value of a row into the
+next row, and Q, the recording tableau, holds k in the cell added by the insertion of w[k].
+Rows are kept sorted, so each bump is found by bisection, O(log n) per row.
+
+The length of the first row of the shape is the length of a longest increasing subsequence of w,
+and the length of the first column that of a longest decreasing subsequence. Batches of
+permutations, e.g. the array of a perm.ArrayPermutationGroup, are inserted by rsk, which returns
+the tableaux as row words, see standard, or only the shapes, as a PartitionBatch, and counted
+by shape by shape_histogram.
+"""
+
+import bisect
+import collections
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy
+
+from maths.comb.batch import PartitionBatch, int_dtype
+from maths.comb.young import YoungTableau
+
+Tableau = List[List[int]]
+
+
+def _insert(w: Sequence[int], recording: Optional[List[int]] = None) -> Tableau:
+    """Insert a permutation into the rows of its insertion tableau
+
+    Args:
+        w:
+            Sequence[int], permutation in array form
+        recording:
+            List[int], optional, filled with the row of the cell added by the insertion of each w[k]
+
+    Returns:
+        List[List[int]]: rows of the insertion tableau
+    """
+    rows: Tableau = []
+    for k, x in enumerate(w):
+        for i, row in enumerate(rows):
+            j = bisect.bisect_left(row, x)
+            if j == len(row):
+                row.append(x)
+                break
+            row[j], x = x, row[j]
+        else:
+            i = len(rows)
+            rows.append([x])
+        if recording is not None:
+            recording[k] = i
+    return rows
+
+
+def insert(w: Sequence[int]) -> Tuple[Tableau, Tableau]:
+    """Get the pair of tableaux of a permutation
+
+    Args:
+        w:
+            Sequence[int], permutation of 0, ..., n - 1 in array form
+
+    Returns:
+        Tuple[List[List[int]], List[List[int]]]: rows of the insertion tableau P and of the recording
+        tableau Q, both holding 0, ..., n - 1
+    """
+    recording = [0] * len(w)
+    p = _insert(w, recording)
+    q: Tableau = [[] for _ in p]
+    for k, i in enumerate(recording):
+        q[i].append(k)
+    return p, q
+
+
+def shape(w: Sequence[int]) -> Tuple[int, ...]:
+    """Get the shape of the tableaux of a permutation, without recording them
+
+    Args:
+        w:
+            Sequence[int], permutation in array form
+
+    Returns:
+        Tuple[int, ...]: parts in non-increasing order
+    """
+    return tuple(len(row) for row in _insert(w))
+
+
+def longest_increasing_subsequence(w: Sequence[int]) -> int:
+    """Get the length of a longest increasing subsequence of a sequence of distinct values, the first
+    part of its shape, by patience sorting on the first row alone
+
+    Args:
+        w:
+            Sequence[int], distinct values
+
+    Returns:
+        int: length
+    """
+    row: List[int] = []
+    for x in w:
+        j = bisect.bisect_left(row, x)
+        if j == len(row):
+            row.append(x)
+        else:
+            row[j] = x
+    return len(row)
+
+
+def inverse(p: Tableau, q: Tableau) -> List[int]:
+    """Get the permutation of a pair of tableaux, undoing the insertions from the last one
+
+    Args:
+        p:
+            List[List[int]], rows of the insertion tableau
+        q:
+            List[List[int]], rows of the recording tableau, of the same shape
+
+    Returns:
+        List[int]: permutation in array form
+    """
+    if [len(row) for row in p] != [len(row) for row in q]:
+        raise ValueError(f"Tableaux of different shapes {[len(row) for row in p]} and {[len(row) for row in q]}")
+
+    rows = [list(row) for row in p]
+    q = [list(row) for row in q]
+    ends = {row[-1]: i for i, row in enumerate(q) if row}
+    n = sum(len(row) for row in rows)
+    w = [0] * n
+    for k in range(n - 1, -1, -1):
+        # The insertion of w[k] added the cell of k, the last of its row in Q
+        i = ends.pop(k)
+        q[i].pop()
+        if q[i]:
+            ends[q[i][-1]] = i
+        x = rows[i].pop()
+        if not rows[i]:
+            rows.pop()
+
+        # Bump back up, each row giving up its largest value smaller than x
+        for row in reversed(rows[:i]):
+            j = bisect.bisect_left(row, x) - 1
+            row[j], x = x, row[j]
+        w[k] = x
+    return w
+
+
+class RSKBatch(NamedTuple):
+    """Tableaux of a batch of permutations"""
+    shapes: PartitionBatch
+    # Row words of the insertion tableaux, p[m, v] being the row holding value v, None if shape only
+    p: Optional[numpy.ndarray]
+    # Row words of the recording tableaux, q[m, k] being the row of the cell added by w[k], None if shape only
+    q: Optional[numpy.ndarray]
+
+
+def rsk(perms: numpy.ndarray, shape_only: bool = False) -> RSKBatch:
+    """Insert a batch of permutations
+
+    Args:
+        perms:
+            numpy.ndarray, shape (m, n), permutations of 0, ..., n - 1 in array form, one per row
+        shape_only:
+            bool, if True only the shapes are computed, skipping the recording tableaux and the row words
+
+    Returns:
+        RSKBatch: shapes, and the row words of the tableaux unless shape_only. The row words of the
+        m-th pair are standard tableaux of the shape shapes[m], see standard.to_rows
+    """
+    perms = numpy.atleast_2d(numpy.asarray(perms))
+    m, n = perms.shape
+    if shape_only:
+        return RSKBatch(PartitionBatch.from_lists([[len(row) for row in _insert(w)] for w in perms.tolist()]), None, None)
+
+    dtype = int_dtype(max(n - 1, 0))
+    p_words = numpy.empty((m, n), dtype=dtype)
+    q_words = numpy.empty((m, n), dtype=dtype)
+    shapes = []
+    recording = [0] * n
+    for k, w in enumerate(perms.tolist()):
+        rows = _insert(w, recording)
+        word = [0] * n
+        for i, row in enumerate(rows):
+            for x in row:
+                word[x] = i
+        p_words[k] = word
+        q_words[k] = recording
+        shapes.append([len(row) for row in rows])
+    return RSKBatch(PartitionBatch.from_lists(shapes), p_words, q_words)
+
+
+def shape_histogram(perms: numpy.ndarray) -> Dict[YoungTableau, int]:
+    """Count a batch of permutations by the shape of their tableaux, e.g. all of S_n gives the
+    square of the number of standard tableaux of each shape
+
+    Args:
+        perms:
+            numpy.ndarray, shape (m, n), permutations in array form, one per row
+
+    Returns:
+        Dict[YoungTableau, int]: number of permutations of each shape, in order of first occurrence
+    """
+    counts = collections.Counter(shape(w) for w in numpy.atleast_2d(numpy.asarray(perms)).tolist())
+    return {YoungTableau.from_parts(parts): count for parts, count in counts.items()}
+
+
+def _rows(word: List[int]) -> Tableau:
+    """Get the rows of a standard tableau from its row word"""
+    rows: Tableau = []
+    for x, i in enumerate(word):
+        if i == len(rows):
+            rows.append([])
+        rows[i].append(x)
+    return rows
+
+
+def inverse_rsk(p: numpy.ndarray, q: numpy.ndarray) -> numpy.ndarray:
+    """Get the permutations of a batch of pairs of tableaux, the inverse of rsk
+
+    Args:
+        p:
+            numpy.ndarray, shape (m, n), row words of the insertion tableaux
+        q:
+            numpy.ndarray, shape (m, n), row words of the recording tableaux
+
+    Returns:
+        numpy.ndarray: shape (m, n), permutations in array form
+    """
+    p, q = numpy.atleast_2d(p), numpy.atleast_2d(q)
+    perms = numpy.empty(p.shape, dtype=numpy.int64)
+    for k, (p_word, q_word) in enumerate(zip(p.tolist(), q.tolist())):
+        perms[k] = inverse(_rows(p_word), _rows(q_word))
+    return perms
@@ -0,0 +1,261 @@
+"""Enumeration and uniform sampling of standard Young tableaux
+
+A standard Young tableau of a shape with n cells is stored as its row word, an integer
+array w of length n where w[k] is the row (from 0) of the cell holding the k-th smallest
+entry. The rows of a word must be filled in order, a row never longer than the row above,
+and the shape is implied by the YoungTableau, so that many tableaux of one shape are the
+rows of a single small-integer matrix. The filling of the cells is recovered by a stable
+argsort, see fillings, e.g. for shape 3 + 2 the word [0, 0, 1, 0, 1] is the tableau
+
+    1 2 4
+    3 5
+
+Tableaux are enumerated lazily in batches, see words, and sampled uniformly at random by
+the hook walk of Greene, Nijenhuis and Wilf, run for a whole batch of samples at once.
+"""
+
+import functools
+from typing import Generator, List, Tuple, Union
+
+import numpy
+
+from maths.comb.batch import int_dtype
+from maths.comb.young import YoungTableau
+
+# Number of trailing entries of each word taken from a cached table of completions, rather
+# than enumerated one by one; at most 6! = 720 completions per table
+SUFFIX_LENGTH = 6
+
+
+def _dtype(parts: Tuple[int, ...]) -> numpy.dtype:
+    """Get the dtype of the row words of a shape"""
+    return int_dtype(max(len(parts) - 1, 0))
+
+
+@functools.lru_cache(maxsize=4096)
+def _completions(parts: Tuple[int, ...], filled: Tuple[int, ...]) -> numpy.ndarray:
+    """Get all completions of a partially filled shape, as rows of the remaining entries of the
+    words, in lexicographic order
+
+    Args:
+        parts:
+            Tuple[int, ...], shape
+        filled:
+            Tuple[int, ...], number of cells already filled in each row
+
+    Returns:
+        numpy.ndarray: shape (k, sum(parts) - sum(filled)), read-only
+    """
+    remaining = sum(parts) - sum(filled)
+    if remaining == 0:
+        table = numpy.zeros((1, 0), dtype=_dtype(parts))
+    else:
+        tables = []
+        for i, part in enumerate(parts):
+            if filled[i] < part and (i == 0 or filled[i] < filled[i - 1]):
+                rest = _completions(parts, filled[:i] + (filled[i] + 1,) + filled[i + 1:])
+                table = numpy.empty((len(rest), remaining), dtype=rest.dtype)
+                table[:, 0] = i
+                table[:, 1:] = rest
+                tables.append(table)
+        table = numpy.concatenate(tables)
+    table.flags.writeable = False
+    return table
+
+
+def words(yt: YoungTableau, chunk_size: int = 65536) -> Generator[numpy.ndarray, None, None]:
+    """Generate the row words of all standard Young tableaux of a shape, in lexicographic order,
+    in batches of at most chunk_size words. Only one batch is held at a time: the leading entries
+    are enumerated depth first and the last SUFFIX_LENGTH are copied from cached tables.
+
+    Args:
+        yt:
+            YoungTableau, shape
+        chunk_size:
+            int, number of words per batch
+
+    Returns:
+        Generator[numpy.ndarray]: batches of words, each of shape (k, n), yt.num_standard() rows in total
+    """
+    parts = yt.parts()
+    n = sum(parts)
+    depth = max(n - SUFFIX_LENGTH, 0)
+    buffer = numpy.empty((chunk_size, n), dtype=_dtype(parts))
+    k = 0
+
+    # Depth-first search over the leading entries, next_row[d] being the next row to try at depth d
+    prefix = [0] * depth
+    filled = [0] * len(parts)
+    next_row = [0] * (depth + 1)
+    d = 0
+    while d >= 0:
+        if d == depth:
+            suffix = _completions(parts, tuple(filled))
+            pos = 0
+            while pos < len(suffix):
+                take = min(chunk_size - k, len(suffix) - pos)
+                buffer[k:k + take, :depth] = prefix
+                buffer[k:k + take, depth:] = suffix[pos:pos + take]
+                k += take
+                pos += take
+                if k == chunk_size:
+                    yield buffer.copy()
+                    k = 0
+        else:
+            i = next_row[d]
+            while i < len(parts) and not (filled[i] < parts[i] and (i == 0 or filled[i] < filled[i - 1])):
+                i += 1
+            if i < len(parts):
+                prefix[d] = i
+                filled[i] += 1
+                next_row[d] = i + 1
+                d += 1
+                next_row[d] = 0
+                continue
+
+        # Backtrack, removing the entry placed at the previous depth
+        d -= 1
+        if d >= 0:
+            filled[prefix[d]] -= 1
+
+    if k:
+        yield buffer[:k].copy()
+
+
+def fillings(w: numpy.ndarray, yt: YoungTableau) -> numpy.ndarray:
+    """Get the entries of the cells of tableaux from their row words
+
+    Args:
+        w:
+            numpy.ndarray, shape (k, n) or (n,), row words
+        yt:
+            YoungTableau, shape, whose zero_indexed flag sets the smallest entry
+
+    Returns:
+        numpy.ndarray: same shape as w, the entry of each cell with the cells in row-major order,
+        as in yt.rows()
+    """
+    start = 0 if yt.zero_indexed else 1
+    # Sorting the entries by row, stably, lists them in row-major order of their cells
+    return numpy.argsort(w, axis=-1, kind='stable') + start
+
+
+def to_rows(w: numpy.ndarray, yt: YoungTableau) -> List[List[int]]:
+    """Get the rows of a tableau from its row word
+
+    Args:
+        w:
+            numpy.ndarray, shape (n,), row word
+        yt:
+            YoungTableau, shape
+
+    Returns:
+        List[List[int]]: rows, as for yt.rows()
+    """
+    entries = fillings(w, yt).tolist()
+    rows = []
+    start = 0
+    for part in yt.parts():
+        rows.append(entries[start:start + part])
+        start += part
+    return rows
+
+
+def standard_tableaux(yt: YoungTableau, chunk_size: int = 65536) -> Generator[List[List[int]], None, None]:
+    """Generate all standard Young tableaux of a shape, one at a time, in the order of words
+
+    Args:
+        yt:
+            YoungTableau, shape
+        chunk_size:
+            int, number of tableaux enumerated at once, see words
+
+    Returns:
+        Generator[List[List[int]]]: rows of each tableau, as for yt.rows()
+    """
+    for batch in words(yt, chunk_size=chunk_size):
+        for w in batch:
+            yield to_rows(w, yt)
+
+
+def is_standard(w: numpy.ndarray, yt: YoungTableau) -> numpy.ndarray:
+    """Check if row words are those of standard Young tableaux of a shape
+
+    Args:
+        w:
+            numpy.ndarray, shape (k, n), row words
+        yt:
+            YoungTableau, shape
+
+    Returns:
+        numpy.ndarray: shape (k,), bool
+    """
+    parts = numpy.asarray(yt.parts(), dtype=numpy.int64)
+    w = numpy.atleast_2d(w)
+    if w.shape[1] != parts.sum():
+        return numpy.zeros(len(w), dtype=bool)
+    if parts.size == 0:
+        return numpy.ones(len(w), dtype=bool)
+    valid = ((w >= 0) & (w < len(parts))).all(axis=1)
+    counts = numpy.cumsum(numpy.where(valid[:, None], w, 0)[:, :, None] == numpy.arange(len(parts)), axis=1)
+    # Every prefix must fill each row no further than the row above, ending with the shape
+    ordered = (counts[:, :, 1:] <= counts[:, :, :-1]).all(axis=(1, 2))
+    return valid & ordered & (counts[:, -1] == parts).all(axis=1)
+
+
+def sample(yt: YoungTableau, size: int = 1, rng: Union[None, int, numpy.random.Generator] = None) -> numpy.ndarray:
+    """Sample standard Young tableaux of a shape uniformly at random, by the hook walk. The largest
+    remaining entry is placed in a corner reached by a walk from a uniformly chosen cell, each step
+    moving to a uniformly chosen cell of the hook of the current one. The walks of all samples are
+    advanced together, one entry at a time.
+
+    Args:
+        yt:
+            YoungTableau, shape
+        size:
+            int, number of tableaux
+        rng:
+            numpy.random.Generator or int seed, source of randomness, default None (fresh entropy)
+
+    Returns:
+        numpy.ndarray: shape (size, n), row words, see words
+    """
+    rng = numpy.random.default_rng(rng)
+    parts = yt.parts()
+    n = sum(parts)
+    w = numpy.empty((size, n), dtype=_dtype(parts))
+    if not n:
+        return w
+
+    # Row and column lengths of the remaining shape of each sample, flattened for fast indexing
+    num_rows, num_cols = len(parts), parts[0]
+    row_lengths = numpy.tile(numpy.asarray(parts, dtype=numpy.int64), size)
+    col_lengths = numpy.tile(numpy.asarray(yt.conjugate(), dtype=numpy.int64), size)
+    row_base = numpy.arange(size) * num_rows
+    col_base = numpy.arange(size) * num_cols
+
+    for m in range(n, 0, -1):
+        # Uniformly chosen cell among the m remaining, in row-major order
+        u = rng.integers(0, m, size=size)
+        ends = numpy.cumsum(row_lengths.reshape(size, num_rows), axis=1)
+        row = (ends <= u[:, None]).sum(axis=1)
+        col = u - ends.ravel()[row_base + row] + row_lengths[row_base + row]
+
+        # Walk along hooks until every sample reaches a corner
+        walking = numpy.arange(size)
+        while len(walking):
+            r, c = row[walking], col[walking]
+            arm = row_lengths[row_base[walking] + r] - c - 1
+            hook = arm + col_lengths[col_base[walking] + c] - r - 1
+            moving = hook > 0
+            walking, r, c, arm, hook = walking[moving], r[moving], c[moving], arm[moving], hook[moving]
+            step = (rng.random(len(walking)) * hook).astype(numpy.int64)
+            right = step < arm
+            col[walking] = numpy.where(right, c + 1 + step, c)
+            row[walking] = numpy.where(right, r, r + 1 + step - arm)
+
+        w[:, m - 1] = row
+        row_lengths[row_base + row] -= 1
+        col_lengths[col_base + col] -= 1
+
+    return w
@@ -0,0 +1,60 @@
+"""Tests for the mathexp.comb.batch module."""
+
+import math
+
+from maths.comb import batch, partition
+from maths.comb.batch import PartitionBatch
+from maths.comb.young import YoungTableau
+
+
+class TestPartitionBatch:
+    """Test group"""
+
+    def test_from_lists(self):
+        """Test PartitionBatch creation from lists of parts"""
+        b = PartitionBatch.from_lists([[5, 3, 1], [2, 2]])
+        assert b.parts.tolist() == [[5, 3, 1], [2, 2, 0]]
+        assert b.lengths.tolist() == [3, 2]
+        assert b.tolist() == [[5, 3, 1], [2, 2]]
+
+    def test_batches(self):
+        """Test batches are fed from generate_partitions in order"""
+        chunks = list(batch.batches(8, chunk_size=6))
+        assert [len(b) for b in chunks] == [6, 6, 6, 4]
+        assert sum((b.tolist() for b in chunks), []) == list(partition.generate_partitions(8))
+
+    def test_statistics(self):
+        """Test per-partition statistics"""
+        b = PartitionBatch.from_lists([[5, 3, 1], [2, 2], [1, 1, 1, 1]])
+        assert b.sizes().tolist() == [9, 4, 4]
+        assert b.largest_parts().tolist() == [5, 2, 1]
+        assert b.multiplicities().tolist() == [[0, 1, 0, 1, 0, 1], [0, 0, 2, 0, 0, 0], [0, 4, 0, 0, 0, 0]]
+        assert b.conjugate().tolist() == [[3, 2, 2, 1, 1], [2, 2], [4]]
+        assert b.factorial_product().tolist() == [720, 4, 1]
+        assert b.multiplicity_factorial_product().tolist() == [1, 2, 24]
+
+    def test_hook_product(self):
+        """Test hook length products, n! / hook product is the number of standard Young tableaux"""
+        b = PartitionBatch.from_lists([[2, 2], [3, 2, 1], [4]])
+        assert b.hook_product().tolist() == [12, 45, 24]
+        assert b.num_standard().tolist() == [2, 16, 1]
+        assert all(abs(x - math.log(y)) < 1e-12 for x, y in zip(b.hook_product(log=True), [12, 45, 24]))
+
+    def test_dominates(self):
+        """Test dominance comparisons"""
+        b = PartitionBatch.from_lists(list(partition.generate_partitions(6)))
+        assert b.dominates([3, 3]).tolist() == [p[0] >= 3 and sum(p[:2]) == 6 for p in b.tolist()]
+        assert b.dominates(b).all()
+        assert b.dominates([6]).sum() == 1
+
+    def test_num_standard_and_dimension(self):
+        """Test batch hook length and hook content formulas agree with single tableaux"""
+        b = PartitionBatch.from_lists(list(partition.generate_partitions(7)))
+        shapes = [YoungTableau.from_parts(p) for p in b.tolist()]
+        assert b.num_standard().tolist() == [yt.num_standard() for yt in shapes]
+        assert b.dimension(3).tolist() == [yt.dimension(3) for yt in shapes]
+
+        # Sum of squares of irreducible dimensions is the order of the group
+        assert sum(f ** 2 for f in b.num_standard()) == math.factorial(7)
+        # Dimensions of GL(d) irreducibles sum, with multiplicity f, to the dimension of the tensor power
+        assert sum(f * dim for f, dim in zip(b.num_standard(), b.dimension(3))) == 3 ** 7
@@ -1,5 +1,8 @@
 """Tests for the mathexp.comb.partition module."""
 
+import random
+
+import pytest
 from sympy.combinatorics import IntegerPartition
 
 from maths.comb import partition
@@ -78,3 +81,99 @@ class TestPartition:
             [4, 1],
             [5],
         ]
+
+    def test_generate_partitions_restricted(self):
+        """Test partition.generate_partitions method with restrictions on the parts"""
+        parts = list(partition.generate_partitions(7, max_part=3, num_parts=3))
+        assert parts == [
+            [3, 2, 2],
+            [3, 3, 1],
+        ]
+
+        parts = list(partition.generate_partitions(8, min_part=2))
+        assert parts == [
+            [2, 2, 2, 2],
+            [3, 3, 2],
+            [4, 2, 2],
+            [4, 4],
+            [5, 3],
+            [6, 2],
+            [8],
+        ]
+
+        # Restrictions match filtering the unrestricted partitions
+        everything = list(partition.generate_partitions(12))
+        expected = [p for p in everything if p[0] <= 5 and len(p) == 4 and p[-1] >= 2]
+        assert list(partition.generate_partitions(12, max_part=5, num_parts=4, min_part=2)) == expected
+
+        # No partitions satisfy the restrictions
+        assert not list(partition.generate_partitions(5, num_parts=6))
+
+    def test_generate_partitions_reuse(self):
+        """Test partition.generate_partitions method reusing a single buffer"""
+        seen = []
+        buffers = set()
+        for p in partition.generate_partitions(6, reuse=True):
+            seen.append(list(p))
+            buffers.add(id(p))
+        assert seen == list(partition.generate_partitions(6))
+        assert len(buffers) == 1
+
+    def test_generate_partitions_large(self):
+        """Test partition.generate_partitions method does not recurse for large n"""
+        parts = partition.generate_partitions(5000)
+        assert next(parts) == [1] * 5000
+        assert next(parts) == [2] + [1] * 4998
+
+    def test_count(self):
+        """Test partition.count method"""
+        assert partition.count(5) == 7
+        assert partition.count(100) == 190569292
+        assert partition.count(5, max_part=2) == 3
+        assert partition.count(7, max_part=3, num_parts=3) == 2
+        assert partition.count(12, num_parts=4) == len(list(partition.generate_partitions(12, num_parts=4)))
+
+    def test_rank_unrank(self):
+        """Test partition.rank and partition.unrank methods agree with generate_partitions"""
+        for k, p in enumerate(partition.generate_partitions(10)):
+            assert partition.rank(p) == k
+            assert partition.unrank(10, k) == p
+
+        # Resume generation from a known rank
+        start = partition.unrank(10, 20)
+        assert list(partition.generate_partitions(10, start=start)) == list(partition.generate_partitions(10))[20:]
+
+        # Out of range
+        with pytest.raises(ValueError):
+            partition.unrank(5, 7)
+
+    def test_random_partition(self):
+        """Test partition.random_partition method"""
+        rng = random.Random(0)
+        for _ in range(10):
+            p = partition.random_partition(50, rng=rng)
+            assert sum(p) == 50
+            assert p == sorted(p, reverse=True)
+
+    def test_is_valid_partition_multi_digit(self):
+        """Test partition.is_valid_partition compares parts as integers"""
+        assert partition.is_valid_partition("10 + 9")
+        assert not partition.is_valid_partition("9 + 10")
+
+    def test_parse_many(self):
+        """Test partition.parse_many method"""
+        batch = partition.parse_many(["5 + 3 + 1", "10+9", "2"])
+        assert len(batch) == 3
+        assert batch.parts.tolist() == [
+            [5, 3, 1],
+            [10, 9, 0],
+            [2, 0, 0],
+        ]
+        assert batch.lengths.tolist() == [3, 2, 1]
+        assert batch[1] == [10, 9]
+        assert batch.to_integer_partitions()[0] == IntegerPartition([5, 3, 1])
+
+        # Invalid notations
+        for p in ["9 + 10", "5 + 4 +", "5 + a", "3 + 0"]:
+            with pytest.raises(ValueError):
+                partition.parse_many(["2 + 1", p])
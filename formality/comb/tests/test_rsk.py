@@ -0,0 +1,63 @@
+"""Tests for the mathexp.comb.rsk module."""
+
+import itertools
+
+import numpy
+import pytest
+
+from maths.comb import rsk, standard
+from maths.comb.young import YoungTableau
+from maths.groups import young
+
+
+def _permutations(n: int) -> numpy.ndarray:
+    """All permutations of n points in array form, one per row"""
+    return numpy.array(list(itertools.permutations(range(n))), dtype=numpy.int64).reshape(-1, n)
+
+
+class TestRSK:
+    """Test group"""
+
+    def test_insert(self):
+        """Test rsk.insert and rsk.inverse on a single permutation"""
+        p, q = rsk.insert([3, 1, 4, 0, 2])
+        assert p == [[0, 2], [1, 4], [3]]
+        assert q == [[0, 2], [1, 4], [3]]
+        assert rsk.inverse(p, q) == [3, 1, 4, 0, 2]
+        assert rsk.shape([3, 1, 4, 0, 2]) == (2, 2, 1)
+        assert rsk.longest_increasing_subsequence([3, 1, 4, 0, 2]) == 2
+
+        with pytest.raises(ValueError):
+            rsk.inverse([[0, 1]], [[0], [1]])
+
+    def test_bijection(self):
+        """Test rsk.rsk is a bijection onto pairs of standard tableaux of the same shape, inverted by rsk.inverse_rsk"""
+        for n in range(1, 7):
+            perms = _permutations(n)
+            result = rsk.rsk(perms)
+            pairs = set()
+            for k, w in enumerate(perms.tolist()):
+                yt = YoungTableau.from_parts(tuple(result.shapes[k]), zero_indexed=True)
+                assert standard.is_standard(numpy.stack([result.p[k], result.q[k]]), yt).all()
+                assert (standard.to_rows(result.p[k], yt), standard.to_rows(result.q[k], yt)) == rsk.insert(w)
+                assert result.shapes[k][0] == rsk.longest_increasing_subsequence(w)
+                pairs.add((tuple(result.p[k]), tuple(result.q[k])))
+            assert len(pairs) == len(perms)
+            assert (rsk.inverse_rsk(result.p, result.q) == perms).all()
+
+    def test_shape_only(self):
+        """Test rsk.rsk shape only mode"""
+        perms = numpy.argsort(numpy.random.default_rng(0).random((200, 30)), axis=1)
+        result = rsk.rsk(perms, shape_only=True)
+        assert result.p is None and result.q is None
+        assert result.shapes.tolist() == rsk.rsk(perms).shapes.tolist()
+        assert (result.shapes.sizes() == 30).all()
+
+    def test_shape_histogram(self):
+        """Test rsk.shape_histogram over all of S_6, and over a Young group"""
+        histogram = rsk.shape_histogram(_permutations(6))
+        assert len(histogram) == 11
+        assert all(count == yt.num_standard() ** 2 for yt, count in histogram.items())
+
+        G = young.group(YoungTableau("2 + 1", zero_indexed=True), include_cols=False, backend='numpy')
+        assert rsk.shape_histogram(G.array) == {YoungTableau("2"): 1, YoungTableau("1 + 1"): 1}
@@ -0,0 +1,87 @@
+"""Tests for the mathexp.comb.standard module."""
+
+import collections
+import itertools
+
+import numpy
+
+from maths.comb import partition, standard
+from maths.comb.young import YoungTableau
+
+
+def _brute_force(yt: YoungTableau) -> list:
+    """Row words of the standard tableaux of a shape, by filtering all fillings of its cells"""
+    rows = YoungTableau.from_parts(yt.parts(), zero_indexed=True).rows()
+    words = []
+    for entries in itertools.permutations(range(sum(yt.parts()))):
+        filled = [[entries[cell] for cell in row] for row in rows]
+        if all(a < b for row in filled for a, b in zip(row, row[1:])) and \
+                all(filled[i + 1][j] > filled[i][j] for i in range(len(filled) - 1) for j in range(len(filled[i + 1]))):
+            word = [0] * len(entries)
+            for i, row in enumerate(filled):
+                for entry in row:
+                    word[entry] = i
+            words.append(word)
+    return sorted(words)
+
+
+class TestStandard:
+    """Test group"""
+
+    def test_words(self):
+        """Test standard.words enumerates the standard tableaux in lexicographic order"""
+        yt = YoungTableau("3 + 2")
+        chunks = list(standard.words(yt, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert numpy.concatenate(chunks).tolist() == [
+            [0, 0, 0, 1, 1],
+            [0, 0, 1, 0, 1],
+            [0, 0, 1, 1, 0],
+            [0, 1, 0, 0, 1],
+            [0, 1, 0, 1, 0],
+        ]
+
+    def test_words_exhaustive(self):
+        """Test standard.words against a brute force enumeration, for every shape of up to 7 boxes"""
+        for n in range(8):
+            for p in partition.generate_partitions(n):
+                yt = YoungTableau.from_parts(tuple(p))
+                words = numpy.concatenate(list(standard.words(yt, chunk_size=5)))
+                assert len(words) == yt.num_standard()
+                assert words.tolist() == _brute_force(yt)
+
+    def test_words_lazy(self):
+        """Test standard.words does not enumerate beyond the batches requested"""
+        yt = YoungTableau("10 + 9 + 8 + 7 + 6 + 5")
+        first = next(standard.words(yt, chunk_size=1000))
+        assert first.shape == (1000, 45)
+        assert standard.is_standard(first, yt).all()
+
+    def test_tableaux(self):
+        """Test standard.standard_tableaux rows and standard.fillings"""
+        yt = YoungTableau("2 + 1")
+        assert list(standard.standard_tableaux(yt)) == [[[1, 2], [3]], [[1, 3], [2]]]
+        assert next(standard.standard_tableaux(YoungTableau("5 + 3 + 1"))) == YoungTableau("5 + 3 + 1").rows()
+        assert standard.fillings(numpy.array([0, 0, 1, 0, 1]), YoungTableau("3 + 2", zero_indexed=True)).tolist() == [0, 1, 3, 2, 4]
+
+    def test_is_standard(self):
+        """Test standard.is_standard"""
+        yt = YoungTableau("2 + 2")
+        assert standard.is_standard(numpy.array([[0, 0, 1, 1], [0, 1, 0, 1], [0, 1, 1, 0], [1, 0, 0, 1], [0, 0, 0, 1], [0, 0, 2, 1]]), yt).tolist() == [
+            True, True, False, False, False, False]
+
+    def test_sample(self):
+        """Test standard.sample draws standard tableaux uniformly"""
+        yt = YoungTableau("3 + 2 + 1")
+        samples = standard.sample(yt, 32000, rng=0)
+        assert samples.shape == (32000, 6)
+        assert standard.is_standard(samples, yt).all()
+
+        counts = collections.Counter(map(tuple, samples.tolist()))
+        assert len(counts) == yt.num_standard() == 16
+        assert all(abs(c - 2000) < 250 for c in counts.values())
+
+        # Large shapes, far beyond enumeration
+        yt = YoungTableau("30 + 20 + 10 + 5")
+        assert standard.is_standard(standard.sample(yt, 100, rng=1), yt).all()
+        assert (standard.sample(yt, 3, rng=2) == standard.sample(yt, 3, rng=2)).all()
@@ -1,5 +1,9 @@
 """Tests for the mathexp.comb.young module."""
 
+import pickle
+
+import pytest
+
 from maths.comb.young import YoungTableau
 
 
@@ -41,3 +45,49 @@ class TestYoung:
             [4],
             [5],
         ]
+
+    def test_from_parts(self):
+        """Test YoungTableau creation from a tuple of parts"""
+        yt = YoungTableau.from_parts((5, 3, 1))
+        assert yt == YoungTableau("5 + 3 + 1")
+        assert yt.rows() == YoungTableau("5 + 3 + 1").rows()
+
+    def test_conjugate(self):
+        """Test YoungTableau conjugate partition"""
+        yt = YoungTableau("5 + 3 + 1")
+        assert yt.parts() == (5, 3, 1)
+        assert yt.conjugate() == (3, 2, 2, 1, 1)
+
+    def test_value_type(self):
+        """Test YoungTableau is an immutable, hashable and ordered value"""
+        yt = YoungTableau("2 + 2")
+        assert hash(yt) == hash(YoungTableau([2, 2]))
+        assert {yt: 1}[YoungTableau([2, 2])] == 1
+        assert yt != YoungTableau("2 + 2", zero_indexed=True)
+        assert YoungTableau("2 + 1 + 1") < yt < YoungTableau("3 + 1")
+        assert pickle.loads(pickle.dumps(yt)) == yt
+
+        with pytest.raises(AttributeError):
+            yt.zero_indexed = True
+
+    def test_hook_lengths(self):
+        """Test YoungTableau hook lengths"""
+        yt = YoungTableau("3 + 2")
+        assert yt.hook_lengths() == [[4, 3, 1], [2, 1]]
+        assert yt.hook_product() == 24
+
+    def test_num_standard(self):
+        """Test YoungTableau number of standard tableaux, by the hook length formula"""
+        assert YoungTableau("2 + 2").num_standard() == 2
+        assert YoungTableau("3 + 2").num_standard() == 5
+        assert YoungTableau("5 + 3 + 1").num_standard() == 162
+        assert YoungTableau([1] * 300).num_standard() == 1
+
+    def test_dimension(self):
+        """Test YoungTableau GL(d) dimension, by the hook content formula"""
+        # Independent components of the Riemann tensor in four dimensions
+        assert YoungTableau("2 + 2").dimension(4) == 20
+        # Symmetric and antisymmetric tensors
+        assert YoungTableau("2").dimension(4) == 10
+        assert YoungTableau("1 + 1").dimension(4) == 6
+        assert YoungTableau("1 + 1 + 1").dimension(2) == 0
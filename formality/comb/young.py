@@ -1,15 +1,35 @@
 """Utilities for working with Young Tableaus and partitions
 """
 
-from typing import Union, List
+from __future__ import annotations
 
-from sympy.combinatorics import IntegerPartition
+import functools
+import math
+from typing import TYPE_CHECKING, Union, List, Optional, Tuple
 
+from maths import instrument
 from maths.comb import partition
 
+if TYPE_CHECKING:
+    from sympy.combinatorics import IntegerPartition
 
+
+@functools.total_ordering
 class YoungTableau:
-    """Class for Young Tableau"""
+    """Class for Young Tableau
+
+    Young Tableaus are immutable values: they are hashable, may be used as dict keys, and are
+    ordered by their partition, consistent with partition.generate_partitions. The rows, columns
+    and conjugate partition are computed once, on first use.
+    """
+    __slots__ = ('_parts', 'zero_indexed', '_rows', '_cols', '_conjugate', '_hook_product')
+    # Types of the slots, set through object.__setattr__ as __setattr__ is disabled
+    _parts: Tuple[int, ...]
+    zero_indexed: bool
+    _rows: Optional[Tuple[Tuple[int, ...], ...]]
+    _cols: Optional[Tuple[Tuple[int, ...], ...]]
+    _conjugate: Optional[Tuple[int, ...]]
+    _hook_product: Optional[int]
 
     def __init__(self, p: Union[str, List[int]], zero_indexed: bool = False):
         """Create a Young Tableau
@@ -21,16 +41,108 @@ class YoungTableau:
                 bool, if True, the values are zero-indexed
         """
         if isinstance(p, str):
-            self._p = partition.from_str(p)
+            parts = partition._parse(p)
         elif isinstance(p, list):
-            self._p = IntegerPartition(p)
+            parts = partition._sorted_parts(p)
         else:
             raise ValueError("Invalid input type")
-        self.zero_indexed = zero_indexed
+        self._init(tuple(parts), zero_indexed)
+
+    def _init(self, parts: Tuple[int, ...], zero_indexed: bool):
+        """Set the attributes of a new Young Tableau, clearing the lazily computed ones"""
+        if instrument.ENABLED:
+            instrument.count('young_tableau.created')
+        object.__setattr__(self, '_parts', parts)
+        object.__setattr__(self, 'zero_indexed', zero_indexed)
+        object.__setattr__(self, '_rows', None)
+        object.__setattr__(self, '_cols', None)
+        object.__setattr__(self, '_conjugate', None)
+        object.__setattr__(self, '_hook_product', None)
+
+    @classmethod
+    def from_parts(cls, parts: Tuple[int, ...], zero_indexed: bool = False) -> 'YoungTableau':
+        """Create a Young Tableau from a tuple of parts without validation, e.g. the output of
+        partition.generate_partitions, skipping the construction of an IntegerPartition
+
+        Args:
+            parts:
+                Tuple[int, ...], positive integers in non-increasing order
+            zero_indexed:
+                bool, if True, the values are zero-indexed
+
+        Returns:
+            YoungTableau
+        """
+        yt = cls.__new__(cls)
+        yt._init(tuple(parts), zero_indexed)
+        return yt
+
+    def __setattr__(self, name, value):
+        """Young Tableaus are immutable"""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        """Pickle support, needed since attributes cannot be set"""
+        return type(self).from_parts, (self._parts, self.zero_indexed)
+
+    def _key(self):
+        """Key for equality, hashing and ordering"""
+        return self._parts, self.zero_indexed
+
+    def __eq__(self, other):
+        """Equality, by partition and indexing"""
+        if not isinstance(other, YoungTableau):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other):
+        """Ordering, by partition and then indexing"""
+        if not isinstance(other, YoungTableau):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self):
+        """Hash, by partition and indexing"""
+        return hash(self._key())
 
     def __str__(self):
         """String representation"""
-        return f'YT({partition.to_str(self._p)})'
+        return f'YT({" + ".join(str(part) for part in self._parts)})'
+
+    def __repr__(self):
+        """Representation"""
+        return f'YoungTableau.from_parts({self._parts!r}, zero_indexed={self.zero_indexed!r})'
+
+    def parts(self) -> Tuple[int, ...]:
+        """Get the parts of the partition, the row lengths
+
+        Returns:
+            Tuple[int, ...]: parts in non-increasing order
+        """
+        return self._parts
+
+    def conjugate(self) -> Tuple[int, ...]:
+        """Get the parts of the conjugate partition, the column lengths
+
+        Returns:
+            Tuple[int, ...]: parts in non-increasing order
+        """
+        if self._conjugate is None:
+            conj = [0] * (self._parts[0] if self._parts else 0)
+            for part in self._parts:
+                for j in range(part):
+                    conj[j] += 1
+            object.__setattr__(self, '_conjugate', tuple(conj))
+        return self._conjugate
+
+    def integer_partition(self) -> IntegerPartition:
+        """Get the partition as a sympy IntegerPartition
+
+        Returns:
+            IntegerPartition
+        """
+        from sympy.combinatorics import IntegerPartition
+        return IntegerPartition(list(self._parts))
 
     def rows(self) -> List[List[int]]:
         """Get the rows of the Young Tableau
@@ -38,7 +150,14 @@ class YoungTableau:
         Returns:
             List[List[int]]: list of rows
         """
-        return partition.values(self._p, zero_indexed=self.zero_indexed)
+        if self._rows is None:
+            start = 0 if self.zero_indexed else 1
+            rows = []
+            for part in self._parts:
+                rows.append(tuple(range(start, start + part)))
+                start += part
+            object.__setattr__(self, '_rows', tuple(rows))
+        return [list(row) for row in self._rows]
 
     def columns(self) -> List[List[int]]:
         """Get the columns of the Young Tableau
@@ -46,12 +165,63 @@ class YoungTableau:
         Returns:
             List[List[int]]: list of columns
         """
-        rows = self.rows()
-        cols = []
-        for i in range(len(rows[0])):
-            col = []
-            for row in rows:
-                if i < len(row):
-                    col.append(row[i])
-            cols.append(col)
-        return cols
+        if self._cols is None:
+            self.rows()
+            cols = [[] for _ in self.conjugate()]
+            for row in self._rows:
+                for col, value in zip(cols, row):
+                    col.append(value)
+            object.__setattr__(self, '_cols', tuple(tuple(col) for col in cols))
+        return [list(col) for col in self._cols]
+
+    def hook_lengths(self) -> List[List[int]]:
+        """Get the hook length of each cell, the number of cells to its right or below it, plus one
+
+        Returns:
+            List[List[int]]: hook lengths, in the shape of the rows
+        """
+        conj = self.conjugate()
+        return [[part - j + conj[j] - i - 1 for j in range(part)] for i, part in enumerate(self._parts)]
+
+    def hook_product(self) -> int:
+        """Get the product of the hook lengths over all cells
+
+        Returns:
+            int: product of hook lengths
+        """
+        if self._hook_product is None:
+            product = 1
+            for row in self.hook_lengths():
+                for hook in row:
+                    product *= hook
+            object.__setattr__(self, '_hook_product', product)
+        return self._hook_product
+
+    def num_standard(self) -> int:
+        """Get the number of standard Young tableaux of this shape, by the hook length formula
+        f = n! / Prod(hook lengths). This is also the dimension of the irreducible representation
+        of the symmetric group S_n corresponding to the partition.
+
+        Returns:
+            int: number of standard Young tableaux
+        """
+        return math.factorial(sum(self._parts)) // self.hook_product()
+
+    def dimension(self, d: int) -> int:
+        """Get the dimension of the irreducible representation of GL(d) corresponding to the partition,
+        by the hook content formula Prod((d + content) / hook length), where the content of the cell in
+        row i and column j is j - i. For example, shape 2 + 2 with d = 4 gives the 20 independent
+        components of the Riemann tensor.
+
+        Args:
+            d:
+                int, dimension of the underlying vector space
+
+        Returns:
+            int: dimension of the representation, zero if the partition has more than d parts
+        """
+        numerator = 1
+        for i, part in enumerate(self._parts):
+            for j in range(part):
+                numerator *= d + j - i
+        return numerator // self.hook_product()
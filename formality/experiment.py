@@ -0,0 +1,156 @@
+"""Declarative sweeps over the groups of Young Tableaux
+
+A sweep is described by its parameters: a family of partitions, a range of n, the
+generator flags of the groups, see groups.young.group, and the groups to compare with.
+It expands into one row per combination, each computed by compute and persisted in a
+store.ResultStore keyed by a hash of its parameters, so that only missing rows are
+computed when a sweep is rerun or extended.
+"""
+
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
+
+from maths import sweep
+from maths.comb import partition
+from maths.comb.young import YoungTableau
+from maths.groups import iso, young
+from maths.store import ResultStore
+
+# Version of the computation of a row, part of its key, to be increased when compute changes
+VERSION = 1
+
+
+def _rectangular(n: int) -> Generator[List[int], None, None]:
+    """Partitions of n with all parts equal"""
+    for part in range(n, 0, -1):
+        if n % part == 0:
+            yield [part] * (n // part)
+
+
+def _hook(n: int) -> Generator[List[int], None, None]:
+    """Partitions of n with at most one part larger than 1"""
+    for part in range(n, 0, -1):
+        yield [part] + [1] * (n - part)
+
+
+# Families of partitions, each a function of n generating partitions
+FAMILIES: Dict[str, Callable[[int], Iterable[List[int]]]] = {
+    'all': partition.generate_partitions,
+    'rectangular': _rectangular,
+    'hook': _hook,
+    'two_row': lambda n: partition.generate_partitions(n, num_parts=2),
+}
+
+# Groups to compare with, each the name of a sympy.combinatorics function of the number of boxes n,
+# imported only when a row is computed, as sympy is slow to import
+COMPARISONS: Dict[str, str] = {
+    'symmetric': 'SymmetricGroup',
+    'alternating': 'AlternatingGroup',
+    'dihedral': 'DihedralGroup',
+    'cyclic': 'CyclicGroup',
+}
+
+# Short names of the generator flags of groups.young.group
+FLAGS = {
+    'rows': 'include_rows',
+    'cols': 'include_cols',
+    'fused_rows': 'include_fused_rows',
+    'fused_cols': 'include_fused_cols',
+}
+
+
+def parse_flags(spec: str) -> Dict[str, bool]:
+    """Parse generator flags from a comma separated list of short names, e.g. 'rows,fused_rows'
+
+    Args:
+        spec:
+            str, short names of the included generators, see FLAGS
+
+    Returns:
+        dict: keyword arguments of groups.young.group
+    """
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    unknown = set(names) - set(FLAGS)
+    if unknown:
+        raise ValueError(f"Unknown generator flags {sorted(unknown)}, expected some of {list(FLAGS)}")
+    return {kwarg: name in names for name, kwarg in FLAGS.items()}
+
+
+def params(family: str, n_values: Iterable[int], flags: Sequence[Dict[str, bool]], compare: Sequence[Optional[str]] = (None,)) -> List[Dict[str, Any]]:
+    """Expand the description of a sweep into the parameters of its rows
+
+    Args:
+        family:
+            str, family of partitions, see FAMILIES
+        n_values:
+            Iterable[int], numbers of boxes
+        flags:
+            Sequence[dict], generator flags of each group, see parse_flags
+        compare:
+            Sequence[str], groups to compare with, see COMPARISONS, None for no comparison
+
+    Returns:
+        List[dict]: parameters of each row
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown family {family}, expected one of {list(FAMILIES)}")
+    for name in compare:
+        if name is not None and name not in COMPARISONS:
+            raise ValueError(f"Unknown comparison group {name}, expected one of {list(COMPARISONS)}")
+
+    return [{'version': VERSION, 'partition': list(p), 'flags': dict(f), 'compare': name}
+            for n in n_values for p in FAMILIES[family](n) for f in flags for name in compare]
+
+
+def compute(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute a row: the order and element orders of the group of a Young Tableau, and whether it may be
+    isomorphic to the comparison group on the same number of boxes
+
+    Args:
+        row:
+            dict, parameters of the row, see params
+
+    Returns:
+        dict: JSON-serialisable results
+    """
+    yt = YoungTableau.from_parts(tuple(row['partition']))
+    flags = row['flags']
+    result = {
+        'order': young.group_order(yt, **flags),
+        'element_orders': [list(pair) for pair in young.element_order_histogram(yt, **flags).items()],
+    }
+
+    if row['compare'] is not None:
+        import sympy.combinatorics
+        G = getattr(sympy.combinatorics, COMPARISONS[row['compare']])(sum(yt.parts()))
+        result['compare_order'] = int(G.order())
+        result['iso_possible'] = result['order'] == result['compare_order'] and iso.is_iso_possible(young.group(yt, **flags), G)
+
+    return result
+
+
+def run(store: ResultStore, rows: Sequence[Dict[str, Any]], workers: Optional[int] = 0, chunk_size: int = 16) -> Generator[Tuple[Dict[str, Any], Any, bool], None, None]:
+    """Run a sweep, computing only the rows missing from the store and saving each as it is produced
+
+    Args:
+        store:
+            ResultStore
+        rows:
+            Sequence[dict], parameters of each row, see params
+        workers:
+            int, number of worker processes, 0 to run in the current process, None for one per CPU
+        chunk_size:
+            int, number of rows sent to a worker at once
+
+    Returns:
+        Generator[Tuple[dict, Any, bool]]: parameters, result and whether it was computed in this run, for
+        newly computed rows as they are saved, then for the rows already in the store
+    """
+    missing = store.missing(rows)
+    for row, result in sweep.imap(compute, missing, workers=workers, chunk_size=chunk_size):
+        store.put(row, result)
+        yield row, result, True
+
+    computed = {store.key(row) for row in missing}
+    for row in rows:
+        if store.key(row) not in computed:
+            yield row, store.get(row), False
@@ -0,0 +1,184 @@
+"""Caches for Young Tableau groups and their invariants
+
+Two levels of caching are provided:
+
+    - group: a bounded in-memory LRU cache around young.group, keyed by tableau and flags
+    - InvariantStore: a persistent SQLite store of expensive group invariants, so that
+      rerunning a sweep skips invariants computed in previous runs
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Tuple
+
+from maths.comb.young import YoungTableau
+from maths.groups import young
+from maths.store import SQLiteStore
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import PermutationGroup
+
+# Maximum number of groups kept in memory by the LRU cache
+GROUP_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=GROUP_CACHE_SIZE)
+def _group(yt: YoungTableau, include_rows: bool, include_cols: bool, include_fused_rows: bool, include_fused_cols: bool) -> PermutationGroup:
+    """Cached young.group, with positional flags so that equivalent calls share a key"""
+    return young.group(yt, include_rows=include_rows, include_cols=include_cols, include_fused_rows=include_fused_rows, include_fused_cols=include_fused_cols)
+
+
+def group(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> PermutationGroup:
+    """Get the group generated by the Young Tableau, see young.group. Groups are cached in memory, so
+    repeated calls with the same tableau and flags return the same PermutationGroup object, and
+    invariants computed by sympy (e.g. the order) are reused.
+
+    Args:
+        yt:
+            YoungTableau
+        include_rows:
+            bool, include row generators
+        include_cols:
+            bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+
+    Returns:
+        PermutationGroup
+    """
+    return _group(yt, include_rows, include_cols, include_fused_rows, include_fused_cols)
+
+
+def info():
+    """Get the hit and miss counters of the group cache
+
+    Returns:
+        CacheInfo: named tuple of hits, misses, maxsize and currsize
+    """
+    return _group.cache_info()  # pylint: disable=no-value-for-parameter  # pylint takes the lru_cache wrapper for _group itself
+
+
+def clear():
+    """Clear the group cache and its counters"""
+    _group.cache_clear()
+
+
+def _order(yt: YoungTableau, flags: Dict[str, bool]) -> int:
+    """Order of the group, from the shape of the tableau where possible, see young.group_order"""
+    return int(young.group_order(yt, **flags))
+
+
+def _element_orders(yt: YoungTableau, flags: Dict[str, bool]) -> list:
+    """Histogram of element orders, as sorted [order, count] pairs, see young.element_order_histogram"""
+    return sorted([int(k), int(v)] for k, v in young.element_order_histogram(yt, **flags).items())
+
+
+def _is_abelian(yt: YoungTableau, flags: Dict[str, bool]) -> bool:
+    """Whether the group is abelian"""
+    return bool(group(yt, **flags).is_abelian)
+
+
+def _strong_gens(yt: YoungTableau, flags: Dict[str, bool]) -> list:
+    """Strong generating set of the group, as array forms"""
+    return [list(g.array_form) for g in group(yt, **flags).strong_gens]
+
+
+# Invariants supported by the store, each computed from a tableau and its generator flags as a
+# JSON-serialisable value. The order and element orders follow from the shape of the tableau, the
+# others build the group through the LRU cache.
+INVARIANTS: Dict[str, Callable[[YoungTableau, Dict[str, bool]], Any]] = {
+    'order': _order,
+    'element_orders': _element_orders,
+    'is_abelian': _is_abelian,
+    'strong_gens': _strong_gens,
+}
+
+
+class InvariantStore(SQLiteStore):
+    """Persistent store of group invariants, backed by an SQLite database
+
+    Invariants are computed on first request and saved, so that later requests, including
+    those from later processes, read them from disk. The group itself is only built, through
+    the LRU cache, when a missing invariant has no closed form, see INVARIANTS.
+    """
+
+    TABLE = 'invariants'
+    COLUMNS = 'key TEXT, name TEXT, value TEXT, PRIMARY KEY (key, name)'
+
+    def __init__(self, path: str = ':memory:'):
+        """Open (or create) a store
+
+        Args:
+            path:
+                str, path to the SQLite database file, default ':memory:' (not persistent)
+        """
+        super().__init__(path)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> str:
+        """Get the key of a group in the store
+
+        Args:
+            yt:
+                YoungTableau
+            include_rows:
+                bool, include row generators
+            include_cols:
+                bool, include column generators
+            include_fused_rows:
+                bool, include fused row generators
+            include_fused_cols:
+                bool, include fused column generators
+
+        Returns:
+            str: key
+        """
+        return json.dumps([list(yt.parts()), yt.zero_indexed, [include_rows, include_cols, include_fused_rows, include_fused_cols]])
+
+    def get(self, name: str, yt: YoungTableau, **flags) -> Any:
+        """Get an invariant of the group generated by a Young Tableau, computing and saving it if missing
+
+        Args:
+            name:
+                str, name of the invariant, one of INVARIANTS
+            yt:
+                YoungTableau
+            **flags:
+                include_rows, include_cols, include_fused_rows or include_fused_cols, see young.group
+
+        Returns:
+            Any: value of the invariant
+        """
+        if name not in INVARIANTS:
+            raise ValueError(f"Invalid invariant: {name}, options are: {', '.join(INVARIANTS)}")
+
+        key = self.key(yt, **flags)
+        value = self._value('key = ? AND name = ?', key, name)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = INVARIANTS[name](yt, flags)
+        self._upsert(key, name, json.dumps(value))
+        return value
+
+    def put(self, name: str, values: Iterable[Tuple[YoungTableau, Dict[str, bool], Any]]):
+        """Save invariants computed elsewhere, e.g. gathered from the workers of a sweep, in one transaction
+
+        Args:
+            name:
+                str, name of the invariant, one of INVARIANTS
+            values:
+                Iterable[Tuple[YoungTableau, Dict[str, bool], Any]], tableau, generator flags (see get)
+                and JSON-serialisable value of each group
+        """
+        if name not in INVARIANTS:
+            raise ValueError(f"Invalid invariant: {name}, options are: {', '.join(INVARIANTS)}")
+        self._upsert_many((self.key(yt, **flags), name, json.dumps(value)) for yt, flags, value in values)
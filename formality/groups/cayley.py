@@ -0,0 +1,154 @@
+"""Integer-indexed Cayley tables of finite permutation groups
+
+The elements of a group are indexed 0, ..., |G| - 1 once, with the identity at
+index 0, and the multiplication table is stored as a compact integer array. A
+map between two groups is then an index array f, and checking that it is a
+homomorphism is a single vectorized comparison of T_B[f[a], f[b]] with f[T_A[a, b]].
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Dict, List
+
+import numpy
+
+from maths import instrument
+from maths.groups.perm import ArrayPermutationGroup, index_dtype
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
+
+
+def is_iso_table(table_a: numpy.ndarray, table_b: numpy.ndarray, f: numpy.ndarray, block_size: int = 64) -> bool:
+    """Check if an index map is an isomorphism between groups given by their multiplication tables
+
+    Args:
+        table_a:
+            numpy.ndarray, shape (|A|, |A|), multiplication table of the domain
+        table_b:
+            numpy.ndarray, shape (|B|, |B|), multiplication table of the codomain
+        f:
+            numpy.ndarray, shape (|A|,), f[i] is the index in B of the image of element i of A
+        block_size:
+            int, number of rows of the table compared at once, stopping at the first failing block
+
+    Returns:
+        bool: True if f is an isomorphism, False otherwise
+    """
+    f = numpy.asarray(f)
+    order = len(table_a)
+    if instrument.ENABLED:
+        instrument.count('cayley.candidates')
+    if order != len(table_b) or len(numpy.unique(f)) != order:
+        return False
+
+    # f(a * b) == f(a) * f(b), one block of rows a at a time
+    for start in range(0, order, block_size):
+        rows = slice(start, start + block_size)
+        if instrument.ENABLED:
+            instrument.count('cayley.products', len(table_a[rows]) * order)
+        if not numpy.array_equal(table_b[f[rows, None], f[None, :]], f[table_a[rows]]):
+            return False
+
+    return True
+
+
+class CayleyTable:
+    """Multiplication table of a finite permutation group, over element indices"""
+
+    @instrument.timed('cayley.table')
+    def __init__(self, G: PermutationGroup):
+        """Create the Cayley table of a group
+
+        Args:
+            G:
+                PermutationGroup
+        """
+        self.group = G
+        if isinstance(G, ArrayPermutationGroup):
+            # Elements are already enumerated as arrays, identity first, and indexed by sorted keys
+            self.elements: List[Permutation] = G.permutations()
+            arrays = G.array
+            lookup = G.index
+        else:
+            identity = G.identity
+            self.elements = [identity] + [g for g in G.elements if g != identity]
+            arrays = numpy.array([g.array_form for g in self.elements], dtype=numpy.int64).reshape(len(self.elements), G.degree)
+            keys = {row.tobytes(): i for i, row in enumerate(arrays)}
+
+            def lookup(products: numpy.ndarray) -> List[int]:
+                return [keys[row.tobytes()] for row in products]
+
+        self.index: Dict[Permutation, int] = {g: i for i, g in enumerate(self.elements)}
+        self.order = len(self.elements)
+        self.dtype = index_dtype(self.order)
+
+        # Rows of images, the product a * b of sympy applies a first, then b
+        self.table = numpy.empty((self.order, self.order), dtype=self.dtype)
+        for i in range(self.order):
+            products = arrays[:, arrays[i]]
+            self.table[i] = lookup(products)
+
+    def __len__(self) -> int:
+        """Order of the group"""
+        return self.order
+
+    def element_orders(self) -> numpy.ndarray:
+        """Get the order of each element, by index
+
+        Returns:
+            numpy.ndarray: shape (|G|,)
+        """
+        orders = numpy.zeros(self.order, dtype=numpy.int64)
+        power = numpy.arange(self.order)
+        k = 1
+        while (orders == 0).any():
+            orders[(power == 0) & (orders == 0)] = k
+            power = self.table[power, numpy.arange(self.order)]
+            k += 1
+        return orders
+
+    def is_iso(self, f: numpy.ndarray, other: 'CayleyTable', block_size: int = 64) -> bool:
+        """Check if an index map is an isomorphism from this group to another
+
+        Args:
+            f:
+                numpy.ndarray, shape (|G|,), f[i] is the index in other of the image of element i
+            other:
+                CayleyTable, the codomain
+            block_size:
+                int, number of rows of the table compared at once, stopping at the first failing block
+
+        Returns:
+            bool: True if f is an isomorphism, False otherwise
+        """
+        return is_iso_table(self.table, other.table, f, block_size=block_size)
+
+    def to_dict(self, f: numpy.ndarray, other: 'CayleyTable') -> Dict[Permutation, Permutation]:
+        """Convert an index map to a map of elements
+
+        Args:
+            f:
+                numpy.ndarray, shape (|G|,), f[i] is the index in other of the image of element i
+            other:
+                CayleyTable, the codomain
+
+        Returns:
+            Dict[Permutation, Permutation]: map of elements
+        """
+        return {a: other.elements[j] for a, j in zip(self.elements, f.tolist())}
+
+
+@functools.lru_cache(maxsize=32)
+def cayley_table(G: PermutationGroup) -> CayleyTable:
+    """Get the Cayley table of a group, cached for the most recently used groups
+
+    Args:
+        G:
+            PermutationGroup
+
+    Returns:
+        CayleyTable
+    """
+    return CayleyTable(G)
@@ -0,0 +1,214 @@
+"""Isomorphism invariants of permutation groups, computed lazily and cached per group
+
+Invariants are listed from cheapest to most expensive, so that comparisons between
+groups can stop at the first invariant that differs. Invariants provided in closed form,
+or already known, are compared before those still to be computed. Each invariant is computed at
+most once per group, however many groups it is compared against.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import numpy
+
+from maths import instrument
+from maths.groups.perm import ArrayPermutationGroup
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
+
+# Invariant names, from cheapest to most expensive to compute
+INVARIANTS = (
+    'order',
+    'is_abelian',
+    'center_order',
+    'element_orders',
+    'class_sizes',
+    'derived_series_orders',
+)
+
+# Maximum number of groups whose invariants are kept in memory
+INVARIANTS_CACHE_SIZE = 128
+
+# Providers of invariants by id of their group, kept for as long as the group rather than its cached
+# invariants. Keys are identities, as equal sympy groups built apart do not live equally long
+_providers: Dict[int, Dict[str, Callable[[], Any]]] = {}
+
+
+def _register(G: PermutationGroup, name: str, func: Callable[[], Any]):
+    """Keep a provider of an invariant for as long as its group"""
+    if id(G) not in _providers:
+        _providers[id(G)] = {}
+        weakref.finalize(G, _providers.pop, id(G), None)
+    _providers[id(G)][name] = func
+
+
+def provide(G: PermutationGroup, name: str, func: Callable[[], Any]):
+    """Provide a cheaper way to compute an invariant of a group, see GroupInvariants.provide. The
+    provider is kept with G itself, even if its cached invariants are those of an equal group
+
+    Args:
+        G:
+            PermutationGroup
+        name:
+            str, name of the invariant
+        func:
+            Callable, computes the invariant, in the same form as the property
+    """
+    _register(G, name, func)
+    invariants(G).provide(name, func)
+
+
+class GroupInvariants:
+    """Lazily evaluated isomorphism invariants of a permutation group"""
+
+    def __init__(self, G: PermutationGroup):
+        """Create the invariants of a group, nothing is computed until requested
+
+        Args:
+            G:
+                PermutationGroup
+        """
+        self.group = G
+        self._values = {}
+        self._providers = dict(_providers.get(id(G), {}))
+
+    def provide(self, name: str, func: Callable[[], Any]):
+        """Provide a cheaper way to compute an invariant, e.g. a closed form known from how the group
+        was built, used instead of the default computation if the invariant is not yet known. Providers
+        are kept with the group, so they outlive the eviction of its invariants from the cache
+
+        Args:
+            name:
+                str, name of the invariant
+            func:
+                Callable, computes the invariant, in the same form as the property
+        """
+        _register(self.group, name, func)
+        self._providers[name] = func
+
+    def _get(self, name: str, func) -> Any:
+        """Get a cached value, computing it on first request"""
+        if name not in self._values:
+            with instrument.timer(f'invariants.{name}'):
+                self._values[name] = self._providers.get(name, func)()
+        return self._values[name]
+
+    @property
+    def degree(self) -> int:
+        """Degree of the group, the size of the set it acts on"""
+        return self.group.degree
+
+    @property
+    def order(self) -> int:
+        """Order of the group"""
+        return self._get('order', lambda: int(self.group.order()))
+
+    @property
+    def is_abelian(self) -> bool:
+        """True if the group is commutative"""
+        return self._get('is_abelian', lambda: bool(self.group.is_abelian))
+
+    @property
+    def center_order(self) -> int:
+        """Order of the centre of the group"""
+        return self._get('center_order', lambda: int(self.group.center().order()))
+
+    @property
+    def elements(self) -> List[Permutation]:
+        """Elements of the group, materialised once"""
+        def compute():
+            elements = list(self.group.elements)
+            instrument.count('elements.enumerated', len(elements))
+            return elements
+        return self._get('elements', compute)
+
+    @property
+    def elements_by_order(self) -> Dict[int, List[Permutation]]:
+        """Elements of the group, grouped by element order"""
+        def compute():
+            classes = collections.defaultdict(list)
+            if isinstance(self.group, ArrayPermutationGroup):
+                for g, order in zip(self.group.permutations(), self.group.element_orders().tolist()):
+                    classes[order].append(g)
+            else:
+                for g in self.elements:
+                    classes[int(g.order())].append(g)
+            return dict(sorted(classes.items()))
+        return self._get('elements_by_order', compute)
+
+    @property
+    def element_orders(self) -> Tuple[Tuple[int, int], ...]:
+        """Histogram of element orders, as sorted (order, count) pairs"""
+        def compute():
+            if isinstance(self.group, ArrayPermutationGroup):
+                orders, counts = numpy.unique(self.group.element_orders(), return_counts=True)
+                return tuple(zip(orders.tolist(), counts.tolist()))
+            return tuple((k, len(v)) for k, v in self.elements_by_order.items())
+        return self._get('element_orders', compute)
+
+    @property
+    def class_sizes(self) -> Tuple[int, ...]:
+        """Sorted sizes of the conjugacy classes"""
+        return self._get('class_sizes', lambda: tuple(sorted(len(c) for c in self.group.conjugacy_classes())))
+
+    @property
+    def derived_series_orders(self) -> Tuple[int, ...]:
+        """Orders of the terms of the derived series, ending when the series stabilises"""
+        return self._get('derived_series_orders', lambda: tuple(int(H.order()) for H in self.group.derived_series()))
+
+    @property
+    def derived_length(self) -> int:
+        """Derived length, the number of steps for the derived series to stabilise, which is at the
+        trivial group if and only if the group is solvable"""
+        return len(self.derived_series_orders) - 1
+
+    def _known(self, name: str) -> bool:
+        """True if an invariant is already computed or provided in closed form"""
+        return name in self._values or name in self._providers
+
+    def differs(self, other: 'GroupInvariants', include_degree: bool = False) -> str:
+        """Find the first invariant that differs between two groups, comparing those known for both
+        groups first, then those known for one, then the others from cheapest to most expensive
+
+        Args:
+            other:
+                GroupInvariants
+            include_degree:
+                bool, also compare the degrees of the groups
+
+        Returns:
+            str: name of the first invariant that differs, or the empty string if all agree
+        """
+        names = sorted(INVARIANTS, key=lambda name: -self._known(name) - other._known(name))
+        for name in (['degree'] if include_degree else []) + names:
+            if getattr(self, name) != getattr(other, name):
+                return name
+        return ''
+
+    def fingerprint(self) -> Tuple:
+        """Get a hashable summary of the invariants, equal for isomorphic groups
+
+        Returns:
+            tuple: values of the invariants, in the order of INVARIANTS
+        """
+        return tuple(getattr(self, name) for name in INVARIANTS)
+
+
+@functools.lru_cache(maxsize=INVARIANTS_CACHE_SIZE)
+def invariants(G: PermutationGroup) -> GroupInvariants:
+    """Get the invariants of a group, shared by every call for the same group while it
+    remains among the most recently used
+
+    Args:
+        G:
+            PermutationGroup
+
+    Returns:
+        GroupInvariants
+    """
+    return GroupInvariants(G)
@@ -1,11 +1,22 @@
 """Utilities for permutation groups, mostly algorithms for seeking isomorphisms
 """
 
+from __future__ import annotations
+
+import collections
 import enum
 import itertools
-from typing import Dict, Callable
+import operator
+from typing import TYPE_CHECKING, Dict, Callable, List, Optional, Sequence, Tuple
+
+import numpy
 
-from sympy.combinatorics import Permutation, PermutationGroup
+from maths import instrument
+from maths.groups.cayley import cayley_table
+from maths.groups.invariants import invariants
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
 
 
 class IsoMethod(str, enum.Enum):
@@ -13,39 +24,28 @@ class IsoMethod(str, enum.Enum):
     """
     BruteForce = "brute_force"
     ElementOrders = "element_orders"
+    Backtrack = "backtrack"
 
 
 def is_iso_possible(A: PermutationGroup, B: PermutationGroup, include_degree: bool = False) -> bool:
     """Check if isomorphism between permutation groups A and B is possible.
+    Invariants are compared from cheapest to most expensive, stopping at the
+    first difference, and are cached per group, see invariants.GroupInvariants.
+    For groups built by young.group, the order and element orders are derived from
+    the shape of the tableau, without enumerating the group, and compared first.
 
     Args:
         A:
             PermutationGroup
         B:
             PermutationGroup
+        include_degree:
+            bool, also require the groups to have the same degree
 
     Returns:
         bool: True if isomorphism is possible, False otherwise
     """
-    # Check if the groups have the same order
-    if A.order() != B.order():
-        return False
-
-    # Check if the groups have the same degree
-    if include_degree and A.degree != B.degree:
-        return False
-
-    # Check if the group elements have the same orders and order-multiplicities
-    a_elem_orders = list(sorted(a.order() for a in A.elements))
-    b_elem_orders = list(sorted(b.order() for b in B.elements))
-    if a_elem_orders != b_elem_orders:
-        return False
-
-    # Check if groups are alike in commutativity
-    if A.is_abelian != B.is_abelian:
-        return False
-
-    return True
+    return not invariants(A).differs(invariants(B), include_degree=include_degree)
 
 
 def is_iso(f: Callable, A: PermutationGroup, B: PermutationGroup) -> bool:
@@ -62,6 +62,9 @@ def is_iso(f: Callable, A: PermutationGroup, B: PermutationGroup) -> bool:
     Returns:
         bool: True if f is an isomorphism, False otherwise
     """
+    if instrument.ENABLED:
+        instrument.count('iso.candidates')
+
     # Check f is onto
     f_range = set(f(a) for a in A.elements)
     if f_range != B.elements:
@@ -73,14 +76,16 @@ def is_iso(f: Callable, A: PermutationGroup, B: PermutationGroup) -> bool:
         return False
 
     # Check f preserves group operation
-    for a, b in itertools.product(A.elements, A.elements):
+    for k, (a, b) in enumerate(itertools.product(A.elements, A.elements)):
         if f(a * b) != f(a) * f(b):
+            instrument.count('iso.products', k + 1)
             return False
 
+    instrument.count('iso.products', len(f_domain) ** 2)
     return True
 
 
-def find_iso_by_element_orders(A: PermutationGroup, B: PermutationGroup) -> Dict[Permutation, Permutation]:
+def find_iso_by_element_orders(A: PermutationGroup, B: PermutationGroup, table: bool = False) -> Dict[Permutation, Permutation]:
     """Find an isomorphism between permutation groups A and B.
 
     Args:
@@ -88,14 +93,15 @@ def find_iso_by_element_orders(A: PermutationGroup, B: PermutationGroup) -> Dict
             PermutationGroup
         B:
             PermutationGroup
+        table:
+            bool, if True check candidates with vectorized Cayley table lookups, see cayley.CayleyTable
     """
-    # Get all element orders
-    a_elem_orders = {a: a.order() for a in A.elements}
-    b_elem_orders = {b: b.order() for b in B.elements}
+    if table:
+        return _find_iso_by_element_orders_table(A, B)
 
     # Partition the elements of A and B by their orders
-    a_elem_orders = {order: [a for a, a_order in a_elem_orders.items() if a_order == order] for order in set(a_elem_orders.values())}
-    b_elem_orders = {order: [b for b, b_order in b_elem_orders.items() if b_order == order] for order in set(b_elem_orders.values())}
+    a_elem_orders = invariants(A).elements_by_order
+    b_elem_orders = invariants(B).elements_by_order
 
     # Construct permutations for each order equivalence-class
     order_perms = {order: itertools.permutations(b_elem_orders[order]) for order in b_elem_orders.keys()}
@@ -110,7 +116,36 @@ def find_iso_by_element_orders(A: PermutationGroup, B: PermutationGroup) -> Dict
             return iso
 
 
-def find_iso_by_brute_force(A: PermutationGroup, B: PermutationGroup) -> Dict[Permutation, Permutation]:
+def _find_iso_by_element_orders_table(A: PermutationGroup, B: PermutationGroup) -> Dict[Permutation, Permutation]:
+    """Find an isomorphism between permutation groups A and B by element orders, on Cayley tables
+
+    Args:
+        A:
+            PermutationGroup
+        B:
+            PermutationGroup
+
+    Returns:
+        Dict[Permutation, Permutation] or None: isomorphism or None if not found
+    """
+    ta, tb = cayley_table(A), cayley_table(B)
+    a_orders, b_orders = ta.element_orders(), tb.element_orders()
+    orders = sorted(set(a_orders.tolist()))
+    if orders != sorted(set(b_orders.tolist())):
+        return None
+
+    # Candidates permute the indices of B within each order equivalence-class
+    domain = numpy.concatenate([numpy.flatnonzero(a_orders == order) for order in orders])
+    order_perms = [itertools.permutations(numpy.flatnonzero(b_orders == order).tolist()) for order in orders]
+
+    f = numpy.empty(len(ta), dtype=numpy.int64)
+    for perm in itertools.product(*order_perms):
+        f[domain] = list(itertools.chain(*perm))
+        if ta.is_iso(f, tb):
+            return ta.to_dict(f, tb)
+
+
+def find_iso_by_brute_force(A: PermutationGroup, B: PermutationGroup, table: bool = False) -> Dict[Permutation, Permutation]:
     """Find an isomorphism between permutation groups A and B.
 
     Args:
@@ -118,10 +153,20 @@ def find_iso_by_brute_force(A: PermutationGroup, B: PermutationGroup) -> Dict[Pe
             PermutationGroup
         B:
             PermutationGroup
+        table:
+            bool, if True check candidates with vectorized Cayley table lookups, see cayley.CayleyTable
 
     Returns:
         Dict[Permutation, Permutation] or None: isomorphism or None if not found
     """
+    if table:
+        ta, tb = cayley_table(A), cayley_table(B)
+        for perm in itertools.permutations(range(len(tb))):
+            f = numpy.array(perm)
+            if ta.is_iso(f, tb):
+                return ta.to_dict(f, tb)
+        return None
+
     a_elements = list(A.elements)
     b_elements = list(B.elements)
 
@@ -132,7 +177,135 @@ def find_iso_by_brute_force(A: PermutationGroup, B: PermutationGroup) -> Dict[Pe
             return iso
 
 
-def find_iso(A: PermutationGroup, B: PermutationGroup, method: IsoMethod) -> Dict[Permutation, Permutation]:
+def _extend(gens: list, images: list, identity, image_identity, *, mul: Callable = operator.mul, image_mul: Callable = operator.mul) -> Optional[dict]:
+    """Extend an assignment of images to generators as an injective homomorphism of the
+    subgroup they generate, by walking its Cayley graph.
+
+    Args:
+        gens:
+            list, generators of the subgroup
+        images:
+            list, candidate images of the generators
+        identity:
+            identity of the domain
+        image_identity:
+            identity of the codomain
+        mul:
+            Callable, group operation of the domain, default operator.mul on Permutations
+        image_mul:
+            Callable, group operation of the codomain, default operator.mul on Permutations
+
+    Returns:
+        dict or None: the homomorphism, or None if a relation
+        between the generators is not satisfied by the images or the map is not injective
+    """
+    if instrument.ENABLED:
+        instrument.count('iso.extensions')
+
+    f = {identity: image_identity}
+    used = {image_identity}
+    queue = collections.deque([identity])
+    while queue:
+        h = queue.popleft()
+        fh = f[h]
+        for g, fg in zip(gens, images):
+            x = mul(h, g)
+            y = image_mul(fh, fg)
+            if x in f:
+                # A relation of the domain must hold for the images
+                if f[x] != y:
+                    return None
+            elif y in used:
+                return None
+            else:
+                f[x] = y
+                used.add(y)
+                queue.append(x)
+    return f
+
+
+def _table_mul(rows: List[List[int]]) -> Callable[[int, int], int]:
+    """Get the group operation over element indices of the rows of a Cayley table"""
+    def mul(i: int, j: int) -> int:
+        return rows[i][j]
+    return mul
+
+
+def _generating_subset(A: PermutationGroup, key: Callable) -> List[Permutation]:
+    """Select a small subset of the generators of A that still generates A
+
+    Args:
+        A:
+            PermutationGroup
+        key:
+            Callable, sort key for the generators, preferred generators first
+
+    Returns:
+        List[Permutation]: generators
+    """
+    identity = A.identity
+    gens = []
+    closure = {identity}
+    for g in sorted(A.generators, key=key):
+        if g in closure:
+            continue
+        gens.append(g)
+        closure = set(_extend(gens, gens, identity, identity))
+    return gens
+
+
+def find_iso_by_backtracking(A: PermutationGroup, B: PermutationGroup, table: bool = False) -> Dict[Permutation, Permutation]:
+    """Find an isomorphism between permutation groups A and B. Images are chosen for a small
+    generating set of A, one generator at a time, among the elements of B of the same order.
+    Each partial choice is extended as a homomorphism, and abandoned as soon as a relation
+    fails, so the search space depends on the number of generators rather than on |A|.
+
+    Args:
+        A:
+            PermutationGroup
+        B:
+            PermutationGroup
+        table:
+            bool, if True multiply element indices with Cayley table lookups, see cayley.CayleyTable
+
+    Returns:
+        Dict[Permutation, Permutation] or None: isomorphism or None if not found
+    """
+    b_elem_orders = invariants(B).elements_by_order
+
+    # Generators with the fewest candidate images first, to prune early
+    gens = _generating_subset(A, key=lambda g: len(b_elem_orders.get(g.order(), ())))
+    candidates = [b_elem_orders.get(g.order(), []) for g in gens]
+    identity, image_identity, mul, image_mul = A.identity, B.identity, operator.mul, operator.mul
+
+    if table:
+        ta, tb = cayley_table(A), cayley_table(B)
+        rows_a, rows_b = ta.table.tolist(), tb.table.tolist()
+        gens = [ta.index[g] for g in gens]
+        candidates = [[tb.index[c] for c in cands] for cands in candidates]
+        identity, image_identity = 0, 0
+        mul, image_mul = _table_mul(rows_a), _table_mul(rows_b)
+
+    def search(images: list) -> Optional[dict]:
+        f = _extend(gens[:len(images)], images, identity, image_identity, mul=mul, image_mul=image_mul)
+        if f is None:
+            return None
+        if len(images) == len(gens):
+            return f if len(f) == len(invariants(B).elements) else None
+        for image in candidates[len(images)]:
+            result = search(images + [image])
+            if result is not None:
+                return result
+        return None
+
+    f = search([])
+    if f is None or not table:
+        return f
+    return {ta.elements[i]: tb.elements[j] for i, j in f.items()}
+
+
+def find_iso(A: PermutationGroup, B: PermutationGroup, method: IsoMethod, *, table: bool = False, workers: Optional[int] = None,
+             progress: Optional[Callable] = None, time_budget: Optional[float] = None, cursor=None) -> Dict[Permutation, Permutation]:
     """Find an isomorphism between permutation groups A and B.
 
     Args:
@@ -142,19 +315,89 @@ def find_iso(A: PermutationGroup, B: PermutationGroup, method: IsoMethod) -> Dic
             PermutationGroup
         method:
             IsoMethod, method to use for finding isomorphism
+        table:
+            bool, if True run the method on Cayley tables of the groups, see cayley.CayleyTable
+        workers:
+            int, if given, search disjoint slices of the candidate space in this many worker
+            processes, on Cayley tables, see search.find_iso_parallel
+        progress:
+            Callable, optional, called periodically with a search.SearchProgress of candidates
+            tried, candidates per second and remaining candidates, see search.find_iso_resumable
+        time_budget:
+            float, optional, seconds after which the search stops and returns a search.Undecided
+            result, whose cursor can be saved and passed back to resume the search
+        cursor:
+            search.SearchCursor, optional, position to resume a search from
 
     Returns:
-        Dict[Permutation, Permutation]: isomorphism
+        Dict[Permutation, Permutation]: isomorphism, or None if not found, or search.Undecided
+        if the time budget ran out first
     """
     if not is_iso_possible(A, B):
         raise ValueError("Isomorphism is not possible")
 
     method_func = {
         IsoMethod.BruteForce: find_iso_by_brute_force,
-        IsoMethod.ElementOrders: find_iso_by_element_orders
+        IsoMethod.ElementOrders: find_iso_by_element_orders,
+        IsoMethod.Backtrack: find_iso_by_backtracking,
     }.get(method, None)
 
     if method_func is None:
         raise ValueError(f"Invalid method: {method}, options are: {', '.join(IsoMethod.__members__)}")
 
-    return method_func(A, B)
+    if workers:
+        if progress is not None or time_budget is not None or cursor is not None:
+            raise ValueError("Progress, time budget and cursor are not supported with workers")
+        from maths.groups import search
+        return search.find_iso_parallel(A, B, method, workers=workers)
+
+    if progress is not None or time_budget is not None or cursor is not None:
+        from maths.groups import search
+        return search.find_iso_resumable(A, B, method, progress=progress, time_budget=time_budget, cursor=cursor)
+
+    return method_func(A, B, table=table)
+
+
+def classify(groups: Sequence[PermutationGroup], method: IsoMethod = IsoMethod.Backtrack, table: bool = False) -> List[List[Tuple[int, Optional[Dict[Permutation, Permutation]]]]]:
+    """Partition permutation groups into isomorphism classes. Groups are first bucketed by a
+    fingerprint of their invariants, see invariants.GroupInvariants.fingerprint, so that
+    isomorphisms are only searched for between groups in the same bucket.
+
+    Args:
+        groups:
+            Sequence[PermutationGroup], groups to classify
+        method:
+            IsoMethod, method to use for finding isomorphisms within a bucket
+        table:
+            bool, if True run the method on Cayley tables of the groups, see cayley.CayleyTable
+
+    Returns:
+        List[List[Tuple[int, Dict[Permutation, Permutation]]]]: isomorphism classes, each a list of
+        pairs of the index of a group and an isomorphism to it from the first group of the class,
+        which is paired with None
+    """
+    method_func = {
+        IsoMethod.BruteForce: find_iso_by_brute_force,
+        IsoMethod.ElementOrders: find_iso_by_element_orders,
+        IsoMethod.Backtrack: find_iso_by_backtracking,
+    }[method]
+
+    buckets = collections.defaultdict(list)
+    for i, G in enumerate(groups):
+        buckets[invariants(G).fingerprint()].append(i)
+
+    classes = []
+    for indices in buckets.values():
+        bucket_classes = []
+        for i in indices:
+            # Compare against the first group of each class found so far in this bucket
+            for cls in bucket_classes:
+                f = method_func(groups[cls[0][0]], groups[i], table=table)
+                if f is not None:
+                    cls.append((i, f))
+                    break
+            else:
+                bucket_classes.append([(i, None)])
+        classes.extend(bucket_classes)
+
+    return sorted(classes, key=lambda cls: cls[0][0])
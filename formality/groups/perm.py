@@ -0,0 +1,542 @@
+"""Array backend for permutation groups
+
+Permutations of n points are stored as rows of an integer array in array form,
+p[i] being the image of point i, so that composition, inversion, cycle types and
+orders are computed for thousands of permutations at once. Products follow sympy:
+p * q applies p first, then q, so (p * q)[i] = q[p[i]].
+
+ArrayPermutationGroup enumerates a group from its generators by a vectorized
+breadth-first closure, and provides the parts of the sympy PermutationGroup
+interface used by the iso and invariants modules.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Set, Union
+
+import numpy
+
+from maths import instrument
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
+
+# Largest degree whose permutations pack into exact uint64 keys, one byte per point up to 8 points
+# and one nibble per point up to 16
+MAX_INT_KEY_DEGREE = 16
+
+# Maximum number of products formed at once by closure, bounding its working memory
+CLOSURE_CHUNK_SIZE = 2 ** 20
+
+
+def index_dtype(size: int) -> numpy.dtype:
+    """Get the smallest unsigned integer dtype that can index size items, e.g. the points of a
+    permutation or the elements of a group
+
+    Args:
+        size:
+            int, number of items
+
+    Returns:
+        numpy.dtype
+    """
+    for dtype in (numpy.uint8, numpy.uint16, numpy.uint32):
+        if size - 1 <= numpy.iinfo(dtype).max:
+            return numpy.dtype(dtype)
+    return numpy.dtype(numpy.uint64)
+
+
+def as_array(perms: Sequence[Permutation], degree: Optional[int] = None) -> numpy.ndarray:
+    """Convert permutations to an array of array forms, extending each to the same degree
+
+    Args:
+        perms:
+            Sequence[Permutation], permutations
+        degree:
+            int, optional, number of points, default the largest size of the permutations
+
+    Returns:
+        numpy.ndarray: shape (k, degree)
+    """
+    if degree is None:
+        degree = max((p.size for p in perms), default=0)
+    result = numpy.tile(numpy.arange(degree, dtype=index_dtype(degree)), (len(perms), 1))
+    for row, p in zip(result, perms):
+        row[:p.size] = p.array_form
+    return result
+
+
+def compose(p: numpy.ndarray, q: numpy.ndarray) -> numpy.ndarray:
+    """Compose permutations, applying p first, then q, broadcasting over leading axes
+
+    Args:
+        p:
+            numpy.ndarray, shape (..., n)
+        q:
+            numpy.ndarray, shape (..., n)
+
+    Returns:
+        numpy.ndarray: (p * q)[..., i] = q[..., p[..., i]]
+    """
+    p, q = numpy.broadcast_arrays(p, q)
+    return numpy.take_along_axis(q, p.astype(numpy.intp), axis=-1)
+
+
+def inverse(p: numpy.ndarray) -> numpy.ndarray:
+    """Invert permutations
+
+    Args:
+        p:
+            numpy.ndarray, shape (..., n)
+
+    Returns:
+        numpy.ndarray: shape (..., n)
+    """
+    result = numpy.empty_like(p)
+    points = numpy.broadcast_to(numpy.arange(p.shape[-1], dtype=p.dtype), p.shape)
+    numpy.put_along_axis(result, p.astype(numpy.intp), points, axis=-1)
+    return result
+
+
+def cycle_lengths(p: numpy.ndarray) -> numpy.ndarray:
+    """Get the length of the cycle through each point
+
+    Args:
+        p:
+            numpy.ndarray, shape (..., n)
+
+    Returns:
+        numpy.ndarray: shape (..., n), int64
+    """
+    points = numpy.arange(p.shape[-1])
+    lengths = numpy.zeros(p.shape, dtype=numpy.int64)
+    power = p
+    k = 1
+
+    # A point has cycle length k once the k-th power first maps it to itself
+    while True:
+        lengths[(power == points) & (lengths == 0)] = k
+        if lengths.all():
+            return lengths
+        power = compose(power, p)
+        k += 1
+
+
+def cycle_types(p: numpy.ndarray) -> numpy.ndarray:
+    """Get the cycle type of each permutation, the number of cycles of each length
+
+    Args:
+        p:
+            numpy.ndarray, shape (k, n)
+
+    Returns:
+        numpy.ndarray: shape (k, n + 1), entry [j, m] is the number of cycles of length m of p[j]
+    """
+    k, n = p.shape
+    lengths = cycle_lengths(p)
+    index = numpy.arange(k)[:, None] * (n + 1) + lengths
+    points = numpy.bincount(index.ravel(), minlength=k * (n + 1)).reshape(k, n + 1)
+
+    # Each cycle of length m contains m points
+    points[:, 1:] //= numpy.arange(1, n + 1)
+    return points
+
+
+def orders(p: numpy.ndarray) -> numpy.ndarray:
+    """Get the order of each permutation, the least common multiple of its cycle lengths
+
+    Args:
+        p:
+            numpy.ndarray, shape (..., n)
+
+    Returns:
+        numpy.ndarray: shape (...,), int64
+    """
+    return numpy.lcm.reduce(cycle_lengths(p), axis=-1, initial=1)
+
+
+def keys(p: numpy.ndarray) -> numpy.ndarray:
+    """Get sortable keys identifying permutations, the array forms packed into uint64 for degrees up to
+    MAX_INT_KEY_DEGREE and their raw bytes otherwise. Keys are converted back by from_keys
+
+    Args:
+        p:
+            numpy.ndarray, shape (k, n)
+
+    Returns:
+        numpy.ndarray: shape (k,)
+    """
+    n = p.shape[-1]
+    if n > MAX_INT_KEY_DEGREE:
+        p = p.astype(index_dtype(n), copy=False)
+        return numpy.ascontiguousarray(p).view(numpy.dtype((numpy.void, p.itemsize * n))).ravel()
+
+    if n <= 8:
+        packed = numpy.zeros((len(p), 8), dtype=numpy.uint8)
+        packed[:, :n] = p
+    else:
+        points = numpy.zeros((len(p), 16), dtype=numpy.uint8)
+        points[:, :n] = p
+        packed = points[:, 0::2] | (points[:, 1::2] << 4)
+    return packed.view(numpy.uint64).ravel()
+
+
+def from_keys(k: numpy.ndarray, n: int) -> numpy.ndarray:
+    """Get the permutations of keys, see keys
+
+    Args:
+        k:
+            numpy.ndarray, shape (k,), keys
+        n:
+            int, degree of the permutations
+
+    Returns:
+        numpy.ndarray: shape (k, n), of dtype index_dtype(n)
+    """
+    if n > MAX_INT_KEY_DEGREE:
+        return k.view(index_dtype(n)).reshape(len(k), n)
+
+    packed = numpy.ascontiguousarray(k, dtype=numpy.uint64).view(numpy.uint8).reshape(len(k), 8)
+    if n <= 8:
+        return packed[:, :n].copy()
+    points = numpy.empty((len(k), 16), dtype=numpy.uint8)
+    points[:, 0::2] = packed & 15
+    points[:, 1::2] = packed >> 4
+    return points[:, :n].copy()
+
+
+def _unique(k: numpy.ndarray) -> numpy.ndarray:
+    """Get the distinct keys, sorted"""
+    k = numpy.sort(k)
+    return k[numpy.concatenate([[True], k[1:] != k[:-1]])] if len(k) else k
+
+
+def _contains(sorted_keys: numpy.ndarray, values: numpy.ndarray) -> numpy.ndarray:
+    """Check membership of keys in a sorted array of keys"""
+    if sorted_keys.size == 0:
+        return numpy.zeros(len(values), dtype=bool)
+    index = numpy.minimum(numpy.searchsorted(sorted_keys, values), len(sorted_keys) - 1)
+    return sorted_keys[index] == values
+
+
+def _prune_transpositions(gens: numpy.ndarray) -> numpy.ndarray:
+    """Drop the transpositions among generators joining points already joined by the others,
+    the transpositions of a spanning forest generating the same symmetric groups on its trees"""
+    moved = gens != numpy.arange(gens.shape[1])
+    parent = list(range(gens.shape[1]))
+
+    def root(a: int) -> int:
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    keep = numpy.ones(len(gens), dtype=bool)
+    for i in numpy.flatnonzero(moved.sum(axis=1) == 2).tolist():
+        a, b = (root(x) for x in numpy.flatnonzero(moved[i]).tolist())
+        if a == b:
+            keep[i] = False
+        else:
+            parent[a] = b
+    return gens[keep]
+
+
+class _OrbitKeys:
+    """Keys of the elements of a group packed into uint64, one nibble per point holding the index of its
+    image in their common orbit. The last point of each orbit is left out, as its image is the one
+    left over, so a group fits if its orbits have at most 16 points and 16 points are kept overall.
+    Products by the generators are then looked up one byte, two points, at a time, without forming
+    the permutations. Other groups are keyed by keys, over the products formed as arrays."""
+
+    def __init__(self, gens: numpy.ndarray):
+        """Lay out the keys of the group generated by permutations
+
+        Args:
+            gens:
+                numpy.ndarray, shape (g, n), generators, closed under inversion
+        """
+        self.gens = gens
+        self.degree = n = gens.shape[1]
+
+        # Each point is labelled by the smallest point of its orbit
+        labels = numpy.arange(n)
+        while True:
+            smallest = numpy.minimum(labels, labels[gens].min(axis=0))
+            if (smallest == labels).all():
+                break
+            labels = smallest
+        self.orbits = [numpy.flatnonzero(labels == label) for label in numpy.unique(labels)]
+        self.kept = numpy.concatenate([orbit[:-1] for orbit in self.orbits])
+        self.packed = len(self.kept) <= 16 and max(len(orbit) for orbit in self.orbits) <= 16
+        if not self.packed:
+            return
+
+        self.local = numpy.empty(n, dtype=numpy.uint8)
+        members = [None] * n
+        for orbit in self.orbits:
+            self.local[orbit] = numpy.arange(len(orbit))
+            for point in orbit:
+                members[point] = orbit
+
+        # Byte b of a key holds the images of kept points 2b and 2b + 1, as low and high nibbles
+        values = numpy.arange(256)
+        self.tables = numpy.zeros((len(gens), 8, 256), dtype=numpy.uint8)
+        for j, point in enumerate(self.kept):
+            orbit = members[point]
+            nibble = values & 15 if j % 2 == 0 else values >> 4
+            images = gens[:, orbit[numpy.minimum(nibble, len(orbit) - 1)]]
+            self.tables[:, j // 2] |= self.local[images] << (4 * (j % 2))
+        self.tables = self.tables.reshape(len(gens), 8 * 256)
+        self.offsets = numpy.arange(0, 8 * 256, 256, dtype=numpy.uint16)
+
+    def keys(self, perms: numpy.ndarray) -> numpy.ndarray:
+        """Get the keys of elements of the group
+
+        Args:
+            perms:
+                numpy.ndarray, shape (k, n), elements
+
+        Returns:
+            numpy.ndarray: shape (k,)
+        """
+        if not self.packed:
+            return keys(perms)
+        nibbles = numpy.zeros((len(perms), 16), dtype=numpy.uint8)
+        nibbles[:, :len(self.kept)] = self.local[perms[:, self.kept]]
+        packed = nibbles[:, 0::2] | (nibbles[:, 1::2] << 4)
+        return packed.view(numpy.uint64).ravel()
+
+    def perms(self, k: numpy.ndarray) -> numpy.ndarray:
+        """Get the elements of keys, see keys
+
+        Args:
+            k:
+                numpy.ndarray, shape (k,), keys
+
+        Returns:
+            numpy.ndarray: shape (k, n), of dtype index_dtype(n)
+        """
+        if not self.packed:
+            return from_keys(k, self.degree)
+        packed = k.view(numpy.uint8).reshape(len(k), 8)
+        nibbles = numpy.empty((len(k), 16), dtype=numpy.uint8)
+        nibbles[:, 0::2] = packed & 15
+        nibbles[:, 1::2] = packed >> 4
+
+        # The image of the last point of an orbit is the index left over, 0 + 1 + ... + m less the others
+        result = numpy.empty((len(k), self.degree), dtype=index_dtype(self.degree))
+        local = numpy.empty((len(k), max(len(orbit) for orbit in self.orbits)), dtype=numpy.uint8)
+        j = 0
+        for orbit in self.orbits:
+            m = len(orbit) - 1
+            local[:, :m] = nibbles[:, j:j + m]
+            local[:, m] = m * (m + 1) // 2 - nibbles[:, j:j + m].sum(axis=1, dtype=numpy.int64)
+            result[:, orbit] = orbit[local[:, :m + 1]]
+            j += m
+        return result
+
+    def products(self, k: numpy.ndarray) -> numpy.ndarray:
+        """Get the keys of the products of elements by every generator, applying each element first,
+        then a generator, see compose
+
+        Args:
+            k:
+                numpy.ndarray, shape (k,), keys of the elements
+
+        Returns:
+            numpy.ndarray: shape (g * k,), keys of the products
+        """
+        if not self.packed:
+            return keys(self.gens[:, self.perms(k)].reshape(-1, self.degree))
+        index = k.view(numpy.uint8).reshape(len(k), 8) + self.offsets
+        return numpy.take(self.tables, index, axis=1).view(numpy.uint64).ravel()
+
+
+@instrument.timed('perm.closure')
+def closure(gens: numpy.ndarray, degree: Optional[int] = None) -> numpy.ndarray:
+    """Enumerate the group generated by permutations, by a breadth-first search multiplying the
+    frontier by every generator at once, in chunks of at most CLOSURE_CHUNK_SIZE products
+
+    The generators are closed under inversion, so that the Cayley graph is undirected and the
+    products of one level of the search can only fall in that level, the previous one or the next.
+    Only the keys of the last two levels are kept for deduplication, rather than of every element.
+    Redundant transpositions are dropped from the generators first, see _prune_transpositions.
+    Levels are held as sorted keys, see _OrbitKeys, converted to permutations once the search is over.
+
+    Args:
+        gens:
+            numpy.ndarray, shape (g, n), generators
+        degree:
+            int, optional, number of points, required if there are no generators
+
+    Returns:
+        numpy.ndarray: shape (|G|, n), elements in breadth-first order, the identity first
+    """
+    if len(gens) == 0:
+        return numpy.arange(degree, dtype=index_dtype(degree))[None]
+
+    n = gens.shape[1]
+    gens = gens.astype(index_dtype(n), copy=False)
+    gens = _prune_transpositions(from_keys(_unique(keys(numpy.concatenate([gens, inverse(gens)]))), n))
+    layout = _OrbitKeys(gens)
+    chunk = max(1, CLOSURE_CHUNK_SIZE // len(gens))
+
+    frontier = layout.keys(numpy.arange(n, dtype=gens.dtype)[None])
+    blocks = [frontier]
+    previous = frontier[:0]
+
+    while len(frontier):
+        known = numpy.sort(numpy.concatenate([previous, frontier]))
+
+        # Keys new to the level are merged whenever those pending outnumber those merged
+        found, pending = frontier[:0], []
+        for start in range(0, len(frontier), chunk):
+            new_keys = _unique(layout.products(frontier[start:start + chunk]))
+            pending.append(new_keys[~_contains(known, new_keys)])
+            if sum(len(k) for k in pending) > len(found):
+                found, pending = _unique(numpy.concatenate([found] + pending)), []
+
+        previous, frontier = frontier, _unique(numpy.concatenate([found] + pending))
+        blocks.append(frontier)
+
+    elements = numpy.empty((sum(len(block) for block in blocks), n), dtype=gens.dtype)
+    start = 0
+    for block in blocks:
+        elements[start:start + len(block)] = layout.perms(block)
+        start += len(block)
+    instrument.count('perm.elements', len(elements))
+    return elements
+
+
+class ArrayPermutationGroup:
+    """Permutation group whose elements are enumerated as rows of an integer array
+
+    Accepted wherever the iso and invariants modules take a sympy PermutationGroup. The group
+    operations they use directly (order, elements, element orders, abelian check) are computed on
+    the array; the remaining invariants are delegated to the equivalent sympy group.
+    """
+
+    def __init__(self, gens: Union[Sequence[Permutation], numpy.ndarray], degree: Optional[int] = None):
+        """Create a group from its generators, nothing is enumerated until requested
+
+        Args:
+            gens:
+                Sequence[Permutation] or numpy.ndarray of shape (g, n), generators
+            degree:
+                int, optional, number of points, default the largest size of the generators as for
+                sympy, or 0 without generators
+        """
+        if isinstance(gens, numpy.ndarray):
+            self.gens_array = gens
+        else:
+            self.gens_array = as_array(gens, degree)
+        self.degree = self.gens_array.shape[1] if degree is None or len(gens) else degree
+        self._array = None
+        self._keys = None
+        self._permutations = None
+        self._generators = None
+        self._sympy = None
+
+    def __repr__(self):
+        return f'ArrayPermutationGroup({self.generators!r}, degree={self.degree!r})'
+
+    @property
+    def generators(self) -> List[Permutation]:
+        """Generators as sympy Permutations, resized to the degree of the group as by sympy"""
+        if self._generators is None:
+            from sympy.combinatorics import Permutation
+            self._generators = [Permutation._af_new(row) for row in self.gens_array.tolist()]
+        return self._generators
+
+    @property
+    def array(self) -> numpy.ndarray:
+        """Elements of the group as rows of array forms, the identity first"""
+        if self._array is None:
+            self._array = closure(self.gens_array, self.degree)
+        return self._array
+
+    @property
+    def identity(self) -> Permutation:
+        """Identity element"""
+        from sympy.combinatorics import Permutation
+        return Permutation._af_new(list(range(self.degree)))
+
+    def order(self) -> int:
+        """Order of the group"""
+        return len(self.array)
+
+    def permutations(self) -> List[Permutation]:
+        """Get the elements as sympy Permutations, in the order of the rows of array
+
+        Returns:
+            List[Permutation]
+        """
+        if self._permutations is None:
+            from sympy.combinatorics import Permutation
+            self._permutations = [Permutation._af_new(row) for row in self.array.tolist()]
+        return self._permutations
+
+    @property
+    def elements(self) -> Set[Permutation]:
+        """Elements of the group as a set of sympy Permutations, as for PermutationGroup"""
+        return set(self.permutations())
+
+    def index(self, perms: numpy.ndarray) -> numpy.ndarray:
+        """Get the row indices in array of group elements
+
+        Args:
+            perms:
+                numpy.ndarray, shape (k, n), elements of the group
+
+        Returns:
+            numpy.ndarray: shape (k,), int64
+        """
+        if self._keys is None:
+            element_keys = keys(self.array)
+            order = numpy.argsort(element_keys)
+            self._keys = (element_keys[order], order)
+        sorted_keys, order = self._keys
+        return order[numpy.searchsorted(sorted_keys, keys(perms))]
+
+    def element_orders(self) -> numpy.ndarray:
+        """Get the order of each element, in the order of the rows of array
+
+        Returns:
+            numpy.ndarray: shape (|G|,), int64
+        """
+        return orders(self.array)
+
+    def cycle_types(self) -> numpy.ndarray:
+        """Get the cycle type of each element, see cycle_types
+
+        Returns:
+            numpy.ndarray: shape (|G|, degree + 1)
+        """
+        return cycle_types(self.array)
+
+    @property
+    def is_abelian(self) -> bool:
+        """True if the generators, and so all elements, commute"""
+        a = self.gens_array[:, None, :]
+        b = self.gens_array[None, :, :]
+        return bool((compose(a, b) == compose(b, a)).all())
+
+    @property
+    def sympy(self) -> PermutationGroup:
+        """Equivalent sympy PermutationGroup"""
+        if self._sympy is None:
+            from sympy.combinatorics import PermutationGroup
+            self._sympy = PermutationGroup(self.generators)
+        return self._sympy
+
+    def center(self) -> PermutationGroup:
+        """Centre of the group, by sympy"""
+        return self.sympy.center()
+
+    def conjugacy_classes(self) -> list:
+        """Conjugacy classes of the group, by sympy"""
+        return self.sympy.conjugacy_classes()
+
+    def derived_series(self) -> list:
+        """Derived series of the group, by sympy"""
+        return self.sympy.derived_series()
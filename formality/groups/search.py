@@ -0,0 +1,506 @@
+"""Parallel and resumable isomorphism search over disjoint slices of the candidate space
+
+The candidate isomorphisms of a search method, see iso.IsoMethod, are split into
+disjoint slices. For the enumeration methods a slice fixes the images of the first
+few elements of the largest class of domain elements; for backtracking it fixes
+the image of the first generator. Slices are searched on Cayley tables, either by a
+pool of worker processes, all of which stop as soon as one finds an isomorphism
+(find_iso_parallel), or in order in the current process with progress reports, a
+time budget and a serialisable cursor to resume from (find_iso_resumable).
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import itertools
+import json
+import math
+import multiprocessing
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy
+
+from maths.groups import iso
+from maths.groups.cayley import cayley_table, is_iso_table
+from maths.groups.iso import IsoMethod
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
+
+# Seconds a worker searches between looks at the stop signal, the clock being read at every candidate
+# so that slow candidates, e.g. of large groups, do not delay the stop
+CHECK_INTERVAL = 0.05
+
+
+class SearchSpace:
+    """Candidate isomorphisms between two groups, over element indices of their Cayley tables"""
+
+    def __init__(self, A: PermutationGroup, B: PermutationGroup, method: IsoMethod):
+        """Create the search space of a method
+
+        Args:
+            A:
+                PermutationGroup, domain
+            B:
+                PermutationGroup, codomain
+            method:
+                IsoMethod, method whose candidates are searched
+        """
+        ta, tb = cayley_table(A), cayley_table(B)
+        self.method = IsoMethod(method)
+        self.table_a = ta.table
+        self.table_b = tb.table
+        # Rows of the tables, for the group operations of the backtracking search, see iso._table_mul
+        self.rows_a: List[List[int]] = ta.table.tolist() if self.method == IsoMethod.Backtrack else []
+        self.rows_b: List[List[int]] = tb.table.tolist() if self.method == IsoMethod.Backtrack else []
+        self.classes: List[Tuple[List[int], List[int]]] = []
+        self.split = 0
+        self.gens: List[int] = []
+        self.candidates: List[List[int]] = []
+
+        a_orders, b_orders = ta.element_orders(), tb.element_orders()
+        if self.method == IsoMethod.Backtrack:
+            b_by_order = {order: numpy.flatnonzero(b_orders == order).tolist() for order in set(b_orders.tolist())}
+            gens = iso._generating_subset(A, key=lambda g: len(b_by_order.get(g.order(), ())))
+            self.gens = [ta.index[g] for g in gens]
+            self.candidates = [b_by_order.get(int(a_orders[g]), []) for g in self.gens]
+            return
+
+        if self.method == IsoMethod.BruteForce:
+            self.classes = [(list(range(len(ta))), list(range(len(tb))))]
+        else:
+            orders = sorted(set(a_orders.tolist()) | set(b_orders.tolist()))
+            self.classes = [(numpy.flatnonzero(a_orders == order).tolist(), numpy.flatnonzero(b_orders == order).tolist()) for order in orders]
+
+        # Slice the largest class, which has the most candidate images
+        self.split = max(range(len(self.classes)), key=lambda c: len(self.classes[c][0]))
+
+    def size(self, depth: int = 1) -> int:
+        """Get the number of candidates in each slice of an enumeration method, or the number of
+        complete assignments of images to generators when backtracking
+
+        Args:
+            depth:
+                int, number of images fixed by each slice of an enumeration method
+
+        Returns:
+            int: number of candidates
+        """
+        if self.method == IsoMethod.Backtrack:
+            return _product(len(c) for c in self.candidates[1:])
+
+        sizes = [math.factorial(len(dom)) for dom, _ in self.classes]
+        m = len(self.classes[self.split][0])
+        sizes[self.split] = math.factorial(m - min(depth, m))
+        return _product(sizes)
+
+    def slices(self, depth: int = 1) -> List[Tuple[int, ...]]:
+        """Get the disjoint slices covering the search space
+
+        Args:
+            depth:
+                int, number of images fixed by each slice of an enumeration method
+
+        Returns:
+            List[Tuple[int, ...]]: slices, each a tuple of fixed image indices
+        """
+        if self.method == IsoMethod.Backtrack:
+            return [(c,) for c in self.candidates[0]] if self.gens else [()]
+
+        if any(len(dom) != len(cod) for dom, cod in self.classes):
+            return []
+
+        codomain = self.classes[self.split][1]
+        return list(itertools.permutations(codomain, min(depth, len(codomain))))
+
+    def candidates_in(self, prefix: Tuple[int, ...]) -> Iterator[numpy.ndarray]:
+        """Generate the candidate index maps of an enumeration method within a slice
+
+        Args:
+            prefix:
+                Tuple[int, ...], slice, see slices
+
+        Returns:
+            Iterator[numpy.ndarray]: candidate maps, f[i] is the index of the image of element i.
+            The same array is modified in place between candidates.
+        """
+        domain = list(itertools.chain(*[dom for dom, _ in self.classes]))
+        perms = []
+        for c, (_, cod) in enumerate(self.classes):
+            if c == self.split:
+                rest = [x for x in cod if x not in prefix]
+                perms.append(tuple(prefix) + p for p in itertools.permutations(rest))
+            else:
+                perms.append(itertools.permutations(cod))
+
+        f = numpy.empty(len(domain), dtype=numpy.int64)
+        for combo in itertools.product(*perms):
+            f[domain] = list(itertools.chain(*combo))
+            yield f
+
+    def search(self, prefix: Tuple[int, ...], stop=None) -> Optional[List[int]]:
+        """Search a slice for an isomorphism
+
+        Args:
+            prefix:
+                Tuple[int, ...], slice, see slices
+            stop:
+                Event, optional, the search is abandoned once it is set
+
+        Returns:
+            List[int] or None: index map of an isomorphism, or None if the slice has none
+        """
+        if self.method == IsoMethod.Backtrack:
+            return self._backtrack(list(prefix), stop)
+
+        next_check = time.monotonic()
+        for f in self.candidates_in(prefix):
+            if stop is not None and time.monotonic() >= next_check:
+                if stop.is_set():
+                    return None
+                next_check = time.monotonic() + CHECK_INTERVAL
+            if is_iso_table(self.table_a, self.table_b, f):
+                return f.tolist()
+        return None
+
+    def _backtrack(self, images: List[int], stop=None) -> Optional[List[int]]:
+        """Backtracking search below a partial assignment of images to generators, see iso.find_iso_by_backtracking"""
+        if stop is not None and stop.is_set():
+            return None
+
+        f = iso._extend(self.gens[:len(images)], images, 0, 0, mul=iso._table_mul(self.rows_a), image_mul=iso._table_mul(self.rows_b))
+        if f is None:
+            return None
+        if len(images) == len(self.gens):
+            return [int(f[i]) for i in range(len(f))] if len(f) == len(self.rows_b) else None
+
+        for image in self.candidates[len(images)]:
+            result = self._backtrack(images + [image], stop)
+            if result is not None:
+                return result
+        return None
+
+
+# State of a worker process, set once by _init_worker
+_SPACE: Optional[SearchSpace] = None
+_STOP = None
+
+
+def _init_worker(space: SearchSpace, stop):
+    """Store the search space and stop signal in a freshly started worker process"""
+    global _SPACE, _STOP  # pylint: disable=global-statement
+    _SPACE = space
+    _STOP = stop
+
+
+def _search_slice(prefix: Tuple[int, ...]) -> Optional[List[int]]:
+    """Search a slice in a worker process"""
+    return _SPACE.search(prefix, stop=_STOP)
+
+
+def find_iso_parallel(A: PermutationGroup, B: PermutationGroup, method: IsoMethod, workers: int, *, depth: int = 1,
+                      max_pending: Optional[int] = None) -> Dict[Permutation, Permutation]:
+    """Find an isomorphism between permutation groups A and B, searching disjoint slices of the
+    candidate space in a pool of worker processes
+
+    Args:
+        A:
+            PermutationGroup
+        B:
+            PermutationGroup
+        method:
+            IsoMethod, method to use for finding isomorphism
+        workers:
+            int, number of worker processes
+        depth:
+            int, number of images fixed by each slice of an enumeration method
+        max_pending:
+            int, maximum number of slices in flight, default None (four per worker)
+
+    Returns:
+        Dict[Permutation, Permutation] or None: isomorphism, or None if no slice contains one
+    """
+    space = SearchSpace(A, B, method)
+    slices = iter(space.slices(depth))
+    max_pending = max_pending or 4 * workers
+
+    ctx = multiprocessing.get_context()
+    stop = ctx.Event()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(space, stop)) as executor:
+        pending = {executor.submit(_search_slice, prefix) for prefix in itertools.islice(slices, max_pending)}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    # Stop running workers and drop queued slices
+                    stop.set()
+                    for other in pending:
+                        other.cancel()
+                    ta, tb = cayley_table(A), cayley_table(B)
+                    return ta.to_dict(numpy.array(result), tb)
+
+            pending |= {executor.submit(_search_slice, prefix) for prefix in itertools.islice(slices, max_pending - len(pending))}
+
+    return None
+
+
+def _product(values) -> int:
+    """Product of integers, 1 if empty"""
+    result = 1
+    for v in values:
+        result *= v
+    return result
+
+
+class SearchProgress(NamedTuple):
+    """Progress of a resumable search, see find_iso_resumable"""
+    tried: int
+    rate: float
+    remaining: int
+    elapsed: float
+
+
+class SearchCursor:
+    """Position in the candidate space of a search, which can be saved to disk and resumed from in a
+    later process. For the enumeration methods the position is the slice index and the number of
+    candidates already tried in that slice; for backtracking it is the index of the candidate image
+    of each generator on the current path of the search tree.
+    """
+
+    def __init__(self, method: IsoMethod, position: List[int], depth: int = 1, tried: int = 0):
+        """Create a cursor
+
+        Args:
+            method:
+                IsoMethod, method of the search
+            position:
+                List[int], position of the next candidate to try
+            depth:
+                int, number of images fixed by each slice of an enumeration method
+            tried:
+                int, number of candidates tried before reaching the position, over all runs
+        """
+        self.method = IsoMethod(method)
+        self.position = list(position)
+        self.depth = depth
+        self.tried = tried
+
+    def __eq__(self, other):
+        if not isinstance(other, SearchCursor):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f'SearchCursor({self.method.value!r}, {self.position!r}, depth={self.depth!r}, tried={self.tried!r})'
+
+    def to_dict(self) -> dict:
+        """Convert the cursor to a JSON-serialisable dict
+
+        Returns:
+            dict
+        """
+        return {'method': self.method.value, 'position': self.position, 'depth': self.depth, 'tried': self.tried}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SearchCursor':
+        """Create a cursor from a dict, see to_dict
+
+        Args:
+            data:
+                dict
+
+        Returns:
+            SearchCursor
+        """
+        return cls(data['method'], data['position'], depth=data['depth'], tried=data['tried'])
+
+    def save(self, path: str):
+        """Save the cursor as JSON
+
+        Args:
+            path:
+                str, path of the file
+        """
+        with open(path, 'w') as fid:
+            json.dump(self.to_dict(), fid)
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchCursor':
+        """Load a cursor saved as JSON, see save
+
+        Args:
+            path:
+                str, path of the file
+
+        Returns:
+            SearchCursor
+        """
+        with open(path) as fid:
+            return cls.from_dict(json.load(fid))
+
+
+class Undecided:
+    """Result of a search stopped by its time budget before it could decide whether an isomorphism
+    exists. It is falsy, and holds the cursor to resume the search from."""
+
+    def __init__(self, cursor: SearchCursor):
+        """Create an undecided result
+
+        Args:
+            cursor:
+                SearchCursor, position to resume the search from
+        """
+        self.cursor = cursor
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f'Undecided({self.cursor!r})'
+
+
+class _Monitor:
+    """Tracks candidates tried, reports progress and enforces a time budget"""
+
+    def __init__(self, tried: int, total: int, progress: Optional[Callable[[SearchProgress], None]], time_budget: Optional[float], interval: float):
+        self.start = time.monotonic()
+        self.initial = tried
+        self.tried = tried
+        self.total = total
+        self.progress = progress
+        self.deadline = None if time_budget is None else self.start + time_budget
+        self.interval = interval
+        self.last_report = self.start
+
+    def report(self, done: int):
+        """Report progress, done being the number of candidates of the space already covered"""
+        now = time.monotonic()
+        elapsed = now - self.start
+        rate = (self.tried - self.initial) / elapsed if elapsed > 0 else 0.0
+        self.progress(SearchProgress(self.tried, rate, max(self.total - done, 0), elapsed))
+        self.last_report = now
+
+    def step(self, done: int) -> bool:
+        """Count one candidate, returning True if the time budget is exhausted. The clock is read at
+        every candidate, as a fixed number of candidates between reads may take arbitrarily long"""
+        self.tried += 1
+        now = time.monotonic()
+        if self.progress is not None and now - self.last_report >= self.interval:
+            self.report(done)
+        return self.deadline is not None and now >= self.deadline
+
+
+def find_iso_resumable(A: PermutationGroup, B: PermutationGroup, method: IsoMethod, *, progress: Optional[Callable[[SearchProgress], None]] = None,
+                       time_budget: Optional[float] = None, cursor: Optional[SearchCursor] = None, depth: int = 1,
+                       progress_interval: float = 1.0) -> Union[Dict[Permutation, Permutation], Undecided, None]:
+    """Find an isomorphism between permutation groups A and B on Cayley tables, in a fixed order
+    that can be interrupted and resumed
+
+    Args:
+        A:
+            PermutationGroup
+        B:
+            PermutationGroup
+        method:
+            IsoMethod, method to use for finding isomorphism
+        progress:
+            Callable, optional, called with a SearchProgress at most every progress_interval seconds
+        time_budget:
+            float, optional, seconds after which the search stops with an Undecided result
+        cursor:
+            SearchCursor, optional, position to resume from, e.g. from a previous Undecided result
+        depth:
+            int, number of images fixed by each slice of an enumeration method, ignored when resuming
+        progress_interval:
+            float, minimum number of seconds between progress reports
+
+    Returns:
+        Dict[Permutation, Permutation], Undecided or None: isomorphism, Undecided if the time budget
+        ran out first, or None if there is no isomorphism
+    """
+    method = IsoMethod(method)
+    if cursor is not None:
+        if cursor.method != method:
+            raise ValueError(f"Cursor is for method {cursor.method.value}, not {method.value}")
+        depth = cursor.depth
+
+    space = SearchSpace(A, B, method)
+    if method == IsoMethod.Backtrack:
+        result = _backtrack_resumable(space, progress, time_budget, cursor, progress_interval)
+    else:
+        result = _enumerate_resumable(space, depth, progress=progress, time_budget=time_budget, cursor=cursor, interval=progress_interval)
+
+    if result is None or isinstance(result, Undecided):
+        return result
+    ta, tb = cayley_table(A), cayley_table(B)
+    return ta.to_dict(numpy.array(result), tb)
+
+
+def _enumerate_resumable(space: SearchSpace, depth: int, *, progress, time_budget, cursor, interval) -> Union[List[int], Undecided, None]:
+    """Resumable search for the enumeration methods, see find_iso_resumable"""
+    slices = space.slices(depth)
+    per_slice = space.size(depth)
+    first, offset = cursor.position if cursor is not None else (0, 0)
+    monitor = _Monitor(cursor.tried if cursor is not None else 0, len(slices) * per_slice, progress, time_budget, interval)
+
+    for index in range(first, len(slices)):
+        for f in itertools.islice(space.candidates_in(slices[index]), offset, None):
+            if is_iso_table(space.table_a, space.table_b, f):
+                return f.tolist()
+            offset += 1
+            if monitor.step(index * per_slice + offset):
+                return Undecided(SearchCursor(space.method, [index, offset], depth=depth, tried=monitor.tried))
+        offset = 0
+
+    if progress is not None:
+        monitor.report(monitor.total)
+    return None
+
+
+def _backtrack_resumable(space: SearchSpace, progress, time_budget, cursor, interval) -> Union[List[int], Undecided, None]:
+    """Resumable backtracking search, an iterative depth-first walk whose path is the cursor, see find_iso_resumable"""
+    gens, candidates = space.gens, space.candidates
+    mul, image_mul = iso._table_mul(space.rows_a), iso._table_mul(space.rows_b)
+    order = len(space.rows_b)
+    total = _product(len(c) for c in candidates)
+    monitor = _Monitor(cursor.tried if cursor is not None else 0, total, progress, time_budget, interval)
+
+    if not gens:
+        return [0] if order == 1 else None
+
+    def done(path: List[int]) -> int:
+        """Number of complete assignments before the path, in mixed radix"""
+        rank = 0
+        for d, c in enumerate(candidates):
+            rank = rank * len(c) + (path[d] if d < len(path) else 0)
+        return rank
+
+    path = list(cursor.position) if cursor is not None else [0]
+    while path:
+        level = len(path) - 1
+        if path[level] >= len(candidates[level]):
+            path.pop()
+            if path:
+                path[-1] += 1
+            continue
+
+        images = [candidates[d][i] for d, i in enumerate(path)]
+        f = iso._extend(gens[:len(images)], images, 0, 0, mul=mul, image_mul=image_mul)
+        if f is not None and len(path) == len(gens):
+            if len(f) == order:
+                return [int(f[i]) for i in range(order)]
+            f = None
+
+        if f is None:
+            path[-1] += 1
+        else:
+            path.append(0)
+
+        if monitor.step(done(path)):
+            return Undecided(SearchCursor(space.method, path, tried=monitor.tried))
+
+    if progress is not None:
+        monitor.report(total)
+    return None
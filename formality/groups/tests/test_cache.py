@@ -0,0 +1,67 @@
+"""Tests for the mathexp.groups.cache module."""
+
+import math
+
+import pytest
+
+from maths.comb.young import YoungTableau
+from maths.groups import cache
+
+
+class TestGroupCache:
+    """Test group"""
+
+    def test_group(self):
+        """Test cached group is shared between equivalent calls"""
+        cache.clear()
+        G = cache.group(YoungTableau("2 + 2"), include_cols=False)
+        assert cache.group(YoungTableau([2, 2]), include_rows=True, include_cols=False) is G
+        assert G.order() == 4
+
+        info = cache.info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_invariant_store(self, tmp_path):
+        """Test invariants persist between store instances"""
+        path = str(tmp_path / "invariants.sqlite")
+        yt = YoungTableau("2 + 2", zero_indexed=True)
+
+        with cache.InvariantStore(path) as store:
+            assert store.get('order', yt, include_fused_rows=True, include_cols=False) == 8
+            assert store.get('element_orders', yt, include_fused_rows=True, include_cols=False) == [[1, 1], [2, 5], [4, 2]]
+            assert store.get('order', yt, include_fused_rows=True, include_cols=False) == 8
+            assert (store.hits, store.misses) == (1, 2)
+
+        with cache.InvariantStore(path) as store:
+            assert not store.get('is_abelian', yt, include_fused_rows=True, include_cols=False)
+            assert store.get('order', yt, include_fused_rows=True, include_cols=False) == 8
+            assert (store.hits, store.misses) == (1, 1)
+
+    def test_invariant_store_closed_form(self):
+        """Test the order and element orders are stored without building the group"""
+        cache.clear()
+        yt = YoungTableau("5 + 5 + 4 + 3")
+        with cache.InvariantStore() as store:
+            assert store.get('order', yt) == math.factorial(17)
+            assert sum(count for _, count in store.get('element_orders', yt, include_cols=False)) == 2073600
+        assert cache.info().misses == 0
+
+    def test_invariant_store_put(self, tmp_path):
+        """Test invariants saved by put are read back without being computed"""
+        path = str(tmp_path / 'invariants.sqlite')
+        yt = YoungTableau("2 + 2")
+        with cache.InvariantStore(path) as store:
+            store.put('order', [(yt, {}, 24), (yt, {'include_cols': False}, 4)])
+        with cache.InvariantStore(path) as store:
+            assert store.get('order', yt) == 24
+            assert store.get('order', yt, include_cols=False) == 4
+            assert (store.hits, store.misses) == (2, 0)
+
+    def test_invariant_store_invalid(self):
+        """Test unknown invariant names are rejected"""
+        with cache.InvariantStore() as store:
+            with pytest.raises(ValueError):
+                store.get('color', YoungTableau("2 + 2"))
+            with pytest.raises(ValueError):
+                store.put('color', [])
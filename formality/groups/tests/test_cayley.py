@@ -0,0 +1,47 @@
+"""Tests for the mathexp.groups.cayley module."""
+
+import numpy
+from sympy.combinatorics import DihedralGroup, SymmetricGroup
+
+from maths.groups import iso
+from maths.groups.cayley import CayleyTable, cayley_table
+
+
+class TestCayleyTable:
+    """Test group"""
+
+    def test_table(self):
+        """Test the table agrees with products of elements"""
+        T = CayleyTable(DihedralGroup(4))
+        assert len(T) == 8
+        assert T.table.dtype == numpy.uint8
+        assert T.elements[0] == DihedralGroup(4).identity
+        for i, a in enumerate(T.elements):
+            for j, b in enumerate(T.elements):
+                assert T.elements[T.table[i, j]] == a * b
+
+    def test_element_orders(self):
+        """Test element orders computed from the table"""
+        T = cayley_table(SymmetricGroup(4))
+        assert T.element_orders().tolist() == [g.order() for g in T.elements]
+
+    def test_is_iso(self):
+        """Test vectorized isomorphism check on index maps"""
+        ta = cayley_table(SymmetricGroup(3))
+        tb = cayley_table(DihedralGroup(3))
+        f = iso.find_iso_by_element_orders(SymmetricGroup(3), DihedralGroup(3), table=True)
+        index = numpy.array([tb.index[f[a]] for a in ta.elements])
+        assert ta.is_iso(index, tb)
+        assert iso.is_iso(ta.to_dict(index, tb).get, SymmetricGroup(3), DihedralGroup(3))
+
+        # Not a bijection, and not a homomorphism
+        assert not ta.is_iso(numpy.zeros(6, dtype=int), tb)
+        assert not ta.is_iso(numpy.array([1, 0, 2, 3, 4, 5]), ta)
+
+    def test_find_iso_table(self):
+        """Test find_iso methods running on Cayley tables"""
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        for method in iso.IsoMethod:
+            f = iso.find_iso(A, B, method, table=True)
+            assert iso.is_iso(f.get, A, B)
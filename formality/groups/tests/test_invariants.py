@@ -0,0 +1,83 @@
+"""Tests for the mathexp.groups.invariants module."""
+
+from sympy.combinatorics import CyclicGroup, DihedralGroup, Permutation, PermutationGroup, SymmetricGroup
+
+from maths import instrument
+from maths.groups.invariants import GroupInvariants, invariants, provide
+
+
+class TestGroupInvariants:
+    """Test group"""
+
+    def test_values(self):
+        """Test invariant values for a known group"""
+        inv = GroupInvariants(DihedralGroup(4))
+        assert inv.order == 8
+        assert not inv.is_abelian
+        assert inv.center_order == 2
+        assert inv.element_orders == ((1, 1), (2, 5), (4, 2))
+        assert inv.class_sizes == (1, 1, 2, 2, 2)
+        assert inv.derived_series_orders == (8, 2, 1)
+        assert inv.derived_length == 2
+
+    def test_cached(self):
+        """Test invariants are shared per group and computed once"""
+        G = SymmetricGroup(4)
+        assert invariants(G) is invariants(G)
+        assert invariants(G).elements is invariants(G).elements
+
+    def test_differs(self):
+        """Test the first differing invariant is reported, cheapest first"""
+        assert invariants(SymmetricGroup(3)).differs(invariants(DihedralGroup(3))) == ''
+        assert invariants(SymmetricGroup(3)).differs(invariants(CyclicGroup(6))) == 'is_abelian'
+        assert invariants(SymmetricGroup(3)).differs(invariants(DihedralGroup(4))) == 'order'
+        assert invariants(SymmetricGroup(3)).differs(invariants(DihedralGroup(3)), include_degree=True) == ''
+
+    def test_computed_once(self):
+        """Test each invariant of a group is computed once, however many groups it is compared against"""
+        A = GroupInvariants(DihedralGroup(4))
+        with instrument.collect() as report:
+            for other in (SymmetricGroup(3), CyclicGroup(8), DihedralGroup(4)):
+                A.differs(GroupInvariants(other))
+            A.fingerprint()
+        # Once for A and once for each of the two other groups compared past the order
+        assert report.timers['invariants.order']['calls'] == 4
+        assert report.timers['invariants.is_abelian']['calls'] == 3
+        assert report.timers['invariants.class_sizes']['calls'] == 2
+
+    def test_differs_stops_early(self):
+        """Test comparison stops at the first, cheapest, invariant that differs"""
+        with instrument.collect() as report:
+            assert GroupInvariants(SymmetricGroup(3)).differs(GroupInvariants(DihedralGroup(4))) == 'order'
+        assert list(report.timers) == ['invariants.order']
+
+    def test_differs_provided_first(self):
+        """Test invariants provided in closed form are compared before those to compute"""
+        A = GroupInvariants(SymmetricGroup(3))
+        A.provide('element_orders', lambda: ((1, 1), (2, 3), (3, 2)))
+        with instrument.collect() as report:
+            assert A.differs(GroupInvariants(PermutationGroup([Permutation(0, 1, 2, 3, 4, 5)]))) == 'element_orders'
+        assert 'invariants.is_abelian' not in report.timers
+        assert 'invariants.center_order' not in report.timers
+
+    def test_provided_after_eviction(self):
+        """Test providers outlive the eviction of the invariants of their group from the cache"""
+        invariants.cache_clear()
+        equal, G = SymmetricGroup(4), SymmetricGroup(4)
+        assert invariants(equal).group is equal
+        calls = []
+        provide(G, 'order', lambda: calls.append(G) or 24)
+
+        # The provider is kept with G, not with the equal group whose invariants were cached
+        del equal
+        invariants.cache_clear()
+        assert invariants(G).group is G
+        assert invariants(G).order == 24
+        assert calls == [G]
+
+    def test_differs_degree(self):
+        """Test the degree is compared first, only if requested"""
+        A = PermutationGroup([Permutation(0, 1)])
+        B = PermutationGroup([Permutation(0, 1)(2, 3)])
+        assert invariants(A).differs(invariants(B)) == ''
+        assert invariants(A).differs(invariants(B), include_degree=True) == 'degree'
@@ -2,9 +2,11 @@
 
 import enum
 
-from sympy.combinatorics import SymmetricGroup, DihedralGroup
+from sympy.combinatorics import CyclicGroup, SymmetricGroup, DihedralGroup
 
-from maths.groups import iso
+from maths.comb.young import YoungTableau
+from maths.groups import iso, young
+from maths.groups.invariants import invariants
 from maths.groups.iso import IsoMethod
 
 
@@ -16,6 +18,7 @@ class TestIsomorphismMethods:
         assert issubclass(IsoMethod, enum.Enum)
         assert IsoMethod.BruteForce.value == "brute_force"
         assert IsoMethod.ElementOrders.value == "element_orders"
+        assert IsoMethod.Backtrack.value == "backtrack"
 
     def test_is_iso_case_pos(self):
         """Test is_iso method, known case where iso exists"""
@@ -49,3 +52,50 @@ class TestIsomorphismMethods:
         B = DihedralGroup(3)
         f = iso.find_iso(A, B, IsoMethod.ElementOrders)
         assert f is not None
+
+    def test_is_iso_case_neg_invariants(self):
+        """Test is_iso_possible method, same order but different element orders"""
+        # Y(2+2)_RO is the Klein four-group, abelian of order 4 like the cyclic group C4
+        A = young.group(YoungTableau("2 + 2", zero_indexed=True), include_cols=False)
+        B = CyclicGroup(4)
+        assert iso.is_iso_possible(A, A)
+        assert not iso.is_iso_possible(A, B)
+        assert invariants(A).differs(invariants(B)) == 'element_orders'
+
+    def test_find_iso_by_backtracking(self):
+        """Test find iso by backtracking method"""
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        f = iso.find_iso_by_backtracking(A, B)
+        assert f is not None
+        assert iso.is_iso(f.get, A, B)
+
+        # Y(2+2)_R is the dihedral group D8
+        A = young.group(YoungTableau("2 + 2", zero_indexed=True), include_fused_rows=True, include_cols=False)
+        B = DihedralGroup(4)
+        f = iso.find_iso(A, B, IsoMethod.Backtrack)
+        assert iso.is_iso(f.get, A, B)
+
+    def test_find_iso_by_backtracking_none(self):
+        """Test find iso by backtracking method, groups of the same order that are not isomorphic"""
+        # Y(2+2+2)_R and D24 both have order 48
+        A = young.group(YoungTableau("2 + 2 + 2", zero_indexed=True), include_fused_rows=True, include_cols=False)
+        B = DihedralGroup(24)
+        assert iso.find_iso_by_backtracking(A, B) is None
+
+    def test_classify(self):
+        """Test classify method, isomorphism classes with witnessing maps"""
+        groups = [
+            SymmetricGroup(3),
+            young.group(YoungTableau("2 + 2", zero_indexed=True), include_fused_rows=True, include_cols=False),
+            DihedralGroup(3),
+            CyclicGroup(6),
+            DihedralGroup(4),
+        ]
+        classes = iso.classify(groups)
+        assert [[i for i, _ in cls] for cls in classes] == [[0, 2], [1, 4], [3]]
+        for cls in classes:
+            first = groups[cls[0][0]]
+            assert cls[0][1] is None
+            for i, f in cls[1:]:
+                assert iso.is_iso(f.get, first, groups[i])
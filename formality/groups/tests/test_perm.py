@@ -0,0 +1,129 @@
+"""Tests for the mathexp.groups.perm module."""
+
+import collections
+
+import numpy
+import pytest
+from sympy.combinatorics import DihedralGroup, Permutation, SymmetricGroup
+
+from maths.comb.young import YoungTableau
+from maths.groups import invariants, iso, perm, young
+from maths.groups.iso import IsoMethod
+
+
+class TestPerm:
+    """Test group"""
+
+    def test_compose_inverse(self):
+        """Test batched composition and inversion agree with sympy"""
+        perms = list(SymmetricGroup(4).elements)
+        arrays = perm.as_array(perms)
+        products = perm.compose(arrays[:, None, :], arrays[None, :, :])
+        for i, p in enumerate(perms):
+            for j, q in enumerate(perms):
+                assert products[i, j].tolist() == (p * q).array_form
+        assert perm.inverse(arrays).tolist() == [(~p).array_form for p in perms]
+
+    def test_cycle_types_orders(self):
+        """Test cycle types and orders of a batch of permutations"""
+        p = numpy.array([[1, 2, 0, 4, 3, 5], [0, 1, 2, 3, 4, 5]])
+        assert perm.cycle_types(p).tolist() == [[0, 1, 1, 1, 0, 0, 0], [0, 6, 0, 0, 0, 0, 0]]
+        assert perm.orders(p).tolist() == [6, 1]
+
+        perms = list(SymmetricGroup(5).elements)
+        assert perm.orders(perm.as_array(perms)).tolist() == [p.order() for p in perms]
+
+    def test_closure(self):
+        """Test the closure of generators enumerates each element once, identity first"""
+        elements = perm.closure(perm.as_array(DihedralGroup(6).generators))
+        assert len(elements) == 12
+        assert len(set(map(tuple, elements.tolist()))) == 12
+        assert elements[0].tolist() == list(range(6))
+
+    @pytest.mark.parametrize('n', [3, 8, 9, 16, 17, 20])
+    def test_keys(self, n):
+        """Test perm.from_keys inverts perm.keys, and keys compare as their permutations"""
+        p = numpy.argsort(numpy.random.default_rng(n).random((100, n)), axis=1).astype(perm.index_dtype(n))
+        k = perm.keys(p)
+        assert (perm.from_keys(k, n) == p).all()
+        assert len(numpy.unique(k)) == len(set(map(tuple, p.tolist())))
+        assert (perm.keys(p[:1]) == k[:1]).all()
+
+    @pytest.mark.parametrize('G, degree', [
+        # Orbits with fixed points
+        (SymmetricGroup(4), 7),
+        (DihedralGroup(5) * SymmetricGroup(3), 10),
+        # Orbits beyond 16 kept points, held as byte keys
+        (DihedralGroup(17), 17),
+        (SymmetricGroup(3) * DihedralGroup(16), 20),
+    ])
+    def test_closure_orbits(self, G, degree):
+        """Test the closure of groups whose orbits do and do not fit packed keys"""
+        elements = perm.closure(perm.as_array(G.generators, degree))
+        assert elements.shape == (G.order(), degree)
+        assert elements[0].tolist() == list(range(degree))
+        assert set(map(tuple, elements.tolist())) == {tuple(p.array_form + list(range(p.size, degree))) for p in G.elements}
+
+    def test_closure_transpositions(self):
+        """Test the closure of redundant transpositions, two of them joining distinct orbits"""
+        gens = perm.as_array([Permutation(a, b) for a in range(4) for b in range(a + 1, 4)] +
+                             [Permutation(4, 5), Permutation(5, 6), Permutation(4, 6), Permutation(0, 1)(4, 5)], 8)
+        elements = perm.closure(gens)
+        assert len(elements) == len(set(map(tuple, elements.tolist()))) == 24 * 6
+        assert (elements[:, 7] == 7).all()
+
+    def test_closure_chunks(self, monkeypatch):
+        """Test the closure is unchanged when products are formed in small chunks"""
+        gens = perm.as_array(SymmetricGroup(6).generators)
+        expected = perm.closure(gens)
+        monkeypatch.setattr(perm, 'CLOSURE_CHUNK_SIZE', 7)
+        elements = perm.closure(gens)
+        assert len(elements) == 720
+        assert elements.tolist() == expected.tolist()
+
+    @pytest.mark.parametrize('flags', [
+        {},
+        {'include_cols': False},
+        {'include_cols': False, 'include_fused_rows': True},
+        {'include_rows': False, 'include_cols': False, 'include_fused_rows': True, 'include_fused_cols': True},
+    ])
+    def test_young_group(self, flags):
+        """Test the numpy backend of young.group matches sympy"""
+        for shape in ('1', '2 + 2', '2 + 2 + 2', '3 + 2 + 1'):
+            yt = YoungTableau(shape)
+            A = young.group(yt, **flags)
+            B = young.group(yt, backend='numpy', **flags)
+            assert B.order() == A.order()
+            assert B.elements == A.elements
+            assert B.is_abelian == A.is_abelian
+            assert invariants.GroupInvariants(B).fingerprint() == invariants.GroupInvariants(A).fingerprint()
+
+    def test_young_group_backend(self):
+        """Test an unknown backend is rejected"""
+        with pytest.raises(ValueError):
+            young.group(YoungTableau('2 + 2'), backend='gap')
+
+    def test_index(self):
+        """Test elements are found by their row index"""
+        G = young.group(YoungTableau('3 + 2'), backend='numpy')
+        assert G.index(G.array[::-1]).tolist() == list(range(G.order()))[::-1]
+
+    def test_iso(self):
+        """Test iso functions accept the numpy backend, Y(2+2)_R is isomorphic to D8"""
+        A = young.group(YoungTableau('2 + 2'), include_cols=False, include_fused_rows=True, backend='numpy')
+        B = DihedralGroup(4)
+        assert iso.is_iso_possible(A, B)
+        for method in IsoMethod:
+            for table in (False, True):
+                f = iso.find_iso(A, B, method, table=table)
+                assert iso.is_iso(f.get, A, B)
+
+    def test_element_orders(self):
+        """Test element orders of a large group, without enumerating it in sympy"""
+        G = young.group(YoungTableau('3 + 3 + 1'), backend='numpy')
+        assert G.order() == 5040
+        counts = collections.Counter(G.element_orders().tolist())
+        assert counts[1] == 1
+        assert counts[2] == 231
+        assert counts[7] == 720
+        assert G.generators[0] == Permutation(1, 2, size=G.degree)
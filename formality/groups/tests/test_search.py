@@ -0,0 +1,96 @@
+"""Tests for the mathexp.groups.search module."""
+
+import math
+import time
+
+import pytest
+from sympy.combinatorics import AbelianGroup, CyclicGroup, DihedralGroup, SymmetricGroup
+
+from maths.groups import iso, search
+from maths.groups.iso import IsoMethod
+
+
+class TestSearch:
+    """Test group"""
+
+    def test_slices_cover_space(self):
+        """Test slices are disjoint and cover the candidate space"""
+        space = search.SearchSpace(SymmetricGroup(3), DihedralGroup(3), IsoMethod.BruteForce)
+        candidates = [tuple(f) for prefix in space.slices(depth=2) for f in space.candidates_in(prefix)]
+        assert len(candidates) == len(set(candidates)) == math.factorial(6)
+
+    def test_find_iso_parallel(self):
+        """Test find_iso with worker processes, for each method"""
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        for method in IsoMethod:
+            f = iso.find_iso(A, B, method, workers=2)
+            assert iso.is_iso(f.get, A, B)
+
+    def test_find_iso_parallel_none(self):
+        """Test parallel search returns None once every slice is exhausted"""
+        assert search.find_iso_parallel(CyclicGroup(4), AbelianGroup(2, 2), IsoMethod.BruteForce, workers=2) is None
+        assert search.find_iso_parallel(CyclicGroup(4), AbelianGroup(2, 2), IsoMethod.Backtrack, workers=2) is None
+
+    def test_find_iso_resumable(self):
+        """Test the resumable search finds an isomorphism, or None, for each method"""
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        for method in IsoMethod:
+            f = search.find_iso_resumable(A, B, method)
+            assert iso.is_iso(f.get, A, B)
+            assert search.find_iso_resumable(CyclicGroup(4), AbelianGroup(2, 2), method) is None
+
+    def test_progress(self):
+        """Test progress reports count candidates down to an exhausted space"""
+        reports = []
+        assert search.find_iso_resumable(CyclicGroup(4), AbelianGroup(2, 2), IsoMethod.BruteForce, progress=reports.append, progress_interval=0) is None
+        assert [r.tried for r in reports[:-1]] == list(range(1, 25))
+        assert reports[-1].tried == 24
+        assert reports[-1].remaining == 0
+
+    def test_time_budget_resume(self, tmp_path):
+        """Test a search stopped by its time budget is undecided, and resumes from a saved cursor"""
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        path = str(tmp_path / 'cursor.json')
+        runs = 0
+        for method in IsoMethod:
+            result = iso.find_iso(A, B, method, time_budget=0)
+            while isinstance(result, search.Undecided):
+                assert not result
+                result.cursor.save(path)
+                cursor = search.SearchCursor.load(path)
+                assert cursor == result.cursor
+                result = iso.find_iso(A, B, method, time_budget=0, cursor=cursor)
+                runs += 1
+            assert iso.is_iso(result.get, A, B)
+        assert runs > 0
+
+    def test_time_budget_slow_candidates(self, monkeypatch):
+        """Test a search of slow candidates stops within its time budget and resumes to a decision"""
+        def slow_is_iso_table(*args):
+            time.sleep(0.01)
+            return False
+
+        A = SymmetricGroup(3)
+        B = DihedralGroup(3)
+        for method in (IsoMethod.BruteForce, IsoMethod.ElementOrders):
+            monkeypatch.setattr(search, 'is_iso_table', slow_is_iso_table)
+            start = time.monotonic()
+            result = search.find_iso_resumable(A, B, method, time_budget=0.1)
+            # Generous bound, the budget is checked on every candidate rather than every few thousand
+            assert time.monotonic() - start < 2.0
+            assert isinstance(result, search.Undecided)
+            assert 0 < result.cursor.tried < math.factorial(6)
+
+            monkeypatch.undo()
+            result = search.find_iso_resumable(A, B, method, cursor=result.cursor)
+            assert not isinstance(result, search.Undecided)
+            assert result is None or iso.is_iso(result.get, A, B)
+
+    def test_cursor_method_mismatch(self):
+        """Test a cursor can only resume a search of the same method"""
+        cursor = search.SearchCursor(IsoMethod.Backtrack, [0])
+        with pytest.raises(ValueError):
+            iso.find_iso(SymmetricGroup(3), DihedralGroup(3), IsoMethod.BruteForce, cursor=cursor)
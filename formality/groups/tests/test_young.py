@@ -1,7 +1,14 @@
 """Tests for the mathexp.groups.young module."""
 
+import collections
+import itertools
+import math
+
+import numpy
+import pytest
+
 from maths.comb.young import YoungTableau
-from maths.groups import young
+from maths.groups import invariants, young
 
 
 class TestYoungGroups:
@@ -12,3 +19,106 @@ class TestYoungGroups:
         yt = YoungTableau("2 + 2")
         gens = young.fused_row_generators(yt)
         assert gens == [young.Permutation(1, 3)(2, 4)]
+
+    def test_group_order(self):
+        """Test group_order method against the order of the generated group"""
+        flags = ['include_rows', 'include_cols', 'include_fused_rows', 'include_fused_cols']
+        for p in ["3 + 2 + 1", "2 + 2 + 2", "3 + 3 + 1 + 1"]:
+            yt = YoungTableau(p)
+            for values in itertools.product([False, True], repeat=len(flags)):
+                kwargs = dict(zip(flags, values))
+                assert young.group_order(yt, **kwargs) == young.group(yt, **kwargs).order()
+
+    def test_group_order_closed_form(self):
+        """Test group_order method for a large tableau, known closed forms"""
+        yt = YoungTableau([5, 5, 3, 3, 3, 1])
+        assert young.group_order(yt) == math.factorial(20)
+        assert young.group_order(yt, include_cols=False) == 120 ** 2 * 6 ** 3
+        assert young.group_order(yt, include_cols=False, include_fused_rows=True) == 120 ** 2 * 6 ** 3 * 2 * 6
+
+    def test_histograms(self):
+        """Test cycle type and element order histograms against the elements of the generated group"""
+        flags = ['include_rows', 'include_cols', 'include_fused_rows', 'include_fused_cols']
+        for p in ["3 + 2 + 1", "2 + 2 + 2", "2 + 2 + 1 + 1"]:
+            yt = YoungTableau(p)
+            for values in itertools.product([False, True], repeat=len(flags)):
+                kwargs = dict(zip(flags, values))
+                elements = young.group(yt, **kwargs).elements
+                cycle_types = collections.Counter()
+                for g in elements:
+                    # Cycles on the boxes, padded with fixed points
+                    cycles = sorted((len(c) for c in g.cyclic_form), reverse=True)
+                    cycle_types[tuple(cycles + [1] * (sum(yt.parts()) - sum(cycles)))] += 1
+                assert young.cycle_type_histogram(yt, **kwargs) == cycle_types
+                assert young.element_order_histogram(yt, **kwargs) == collections.Counter(g.order() for g in elements)
+
+    def test_histograms_closed_form(self):
+        """Test histograms of a large tableau, known closed forms"""
+        yt = YoungTableau([5, 5, 3, 3, 3, 1])
+        orders = young.element_order_histogram(yt, include_cols=False, include_fused_rows=True)
+        assert sum(orders.values()) == young.group_order(yt, include_cols=False, include_fused_rows=True)
+        assert young.cycle_type_histogram(yt)[(20,)] == math.factorial(19)
+        assert young.cycle_type_histogram(yt, include_rows=False, include_cols=False, include_fused_rows=True)[(2,) * 8 + (1,) * 4] == 3
+
+    def test_group_invariants(self):
+        """Test groups from tableaux get their element orders from the histogram"""
+        yt = YoungTableau("3 + 2 + 1")
+        G = young.group(yt, include_cols=False)
+        assert invariants.invariants(G).element_orders == tuple(young.element_order_histogram(yt, include_cols=False).items())
+        assert 'elements' not in invariants.invariants(G)._values
+
+    def test_minimal_generators(self):
+        """Test minimal generators generate the same group with fewer generators"""
+        flags = ['include_rows', 'include_cols', 'include_fused_rows', 'include_fused_cols']
+        for p in ["3 + 2 + 1", "2 + 2 + 2", "3 + 3 + 1 + 1"]:
+            yt = YoungTableau(p)
+            for values in itertools.product([False, True], repeat=len(flags)):
+                kwargs = dict(zip(flags, values))
+                full = young.generators(yt, **kwargs)
+                gens, dropped = young.generators(yt, minimal=True, return_dropped=True, **kwargs)
+                assert len(gens) == len(set(gens)) == len(full) - dropped
+                G = young.group(yt, minimal=True, **kwargs)
+                assert G.order() == young.group_order(yt, **kwargs)
+                assert all(G.contains(g, strict=False) for g in full)
+
+    def test_minimal_generators_count(self):
+        """Test minimal generators are linear in the row length"""
+        gens, dropped = young.generators(YoungTableau([20]), include_cols=False, minimal=True, return_dropped=True)
+        assert gens == [young.Permutation(i, i + 1) for i in range(1, 20)]
+        assert dropped == 190 - 19
+
+        # Swaps of rows of length 1 are also column transpositions
+        gens, dropped = young.generators(YoungTableau([1, 1, 1]), include_fused_rows=True, minimal=True, return_dropped=True)
+        assert gens == [young.Permutation(1, 2), young.Permutation(2, 3)]
+        assert dropped == 4
+
+    def test_symmetrize(self):
+        """Test row symmetrizer and column antisymmetrizer against sums over the group elements"""
+        yt = YoungTableau("3 + 1")
+        tensor = numpy.random.default_rng(0).standard_normal((3,) * 4)
+        for kwargs, sign in (({'include_cols': False}, lambda g: 1), ({'include_rows': False}, lambda g: g.signature())):
+            G = young.group(yt, **kwargs)
+            axes = lambda g: [g(i + 1) - 1 if i + 1 < g.size else i for i in range(4)]
+            expected = sum(sign(g) * tensor.transpose(axes(g)) for g in G.elements) / G.order()
+            assert numpy.allclose(young.symmetrize(tensor, yt, **kwargs), expected)
+
+    def test_young_projector(self):
+        """Test the Young projector of shape 2 + 2 is idempotent, with the symmetries of the Riemann tensor"""
+        yt = YoungTableau("2 + 2")
+        d = 4
+        tensor = numpy.random.default_rng(0).standard_normal((d,) * 4)
+        riemann = young.symmetrize(tensor, yt)
+        assert numpy.allclose(young.symmetrize(riemann, yt), riemann)
+
+        # Antisymmetric in the columns (1, 3) and (2, 4)
+        assert numpy.allclose(riemann, -riemann.transpose(2, 1, 0, 3))
+        assert numpy.allclose(riemann, -riemann.transpose(0, 3, 2, 1))
+
+        # The image has the dimension of the GL(d) representation
+        projector = numpy.array([young.symmetrize(e.reshape((d,) * 4), yt).ravel() for e in numpy.eye(d ** 4)])
+        assert numpy.linalg.matrix_rank(projector) == yt.dimension(d) == 20
+
+    def test_symmetrize_rank(self):
+        """Test the rank of the tensor must match the number of boxes"""
+        with pytest.raises(ValueError):
+            young.symmetrize(numpy.zeros((2, 2, 2)), YoungTableau("2 + 2"))
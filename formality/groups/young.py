@@ -1,28 +1,59 @@
 """Utilities for generating groups based on Young Tableau symmetries"""
+
+from __future__ import annotations
+
+import collections
 import functools
 import itertools
+import math
 import operator
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, Union
 
-from sympy.combinatorics import Permutation, PermutationGroup
+import numpy
 
+from maths import instrument
+from maths.comb import partition
 from maths.comb.young import YoungTableau
+from maths.groups import perm
+from maths.groups.invariants import provide
+from maths.groups.perm import ArrayPermutationGroup
+
+if TYPE_CHECKING:
+    from sympy.combinatorics import Permutation, PermutationGroup
+
 
+def __getattr__(name: str):
+    """Import the sympy classes of the generators and groups on first access, see PEP 562"""
+    if name in ('Permutation', 'PermutationGroup'):
+        import sympy.combinatorics
+        return getattr(sympy.combinatorics, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def row_generators(yt: YoungTableau) -> List[Permutation]:
+
+# Histogram of cycle types, each a tuple of cycle lengths in non-increasing order, to number of elements
+CycleTypes = Dict[Tuple[int, ...], int]
+
+
+def row_generators(yt: YoungTableau, minimal: bool = False) -> List[Permutation]:
     """Get row generators for the Young Tableau
 
     Args:
         yt:
             YoungTableau
+        minimal:
+            bool, if True only the k - 1 adjacent transpositions of each row of length k, which
+            generate the same symmetric group as all of its transpositions
 
     Returns:
         list: list of Permutation
     """
+    from sympy.combinatorics import Permutation
+
     rows = yt.rows()
     gens = []
     for row in rows:
-        for r1, r2 in itertools.combinations(row, 2):
+        pairs = zip(row, row[1:]) if minimal else itertools.combinations(row, 2)
+        for r1, r2 in pairs:
             # Sort the pair
             if r1 > r2:
                 r1, r2 = r2, r1
@@ -32,64 +63,75 @@ def row_generators(yt: YoungTableau) -> List[Permutation]:
     return gens
 
 
-def fused_row_generators(yt: YoungTableau) -> List[Permutation]:
+def _fused_generators(segments: List[List[int]], minimal: bool = False) -> List[Permutation]:
+    """Get the permutations swapping pairs of entire segments (rows or columns) of the same length. Segments
+    of the same length are adjacent, so when minimal only neighbouring segments are swapped, q - 1 swaps for
+    q segments of a length, which generate the same block permutations as all pairs."""
+    from sympy.combinatorics import Permutation
+
+    gens = []
+    for i in range(len(segments) - 1):
+        last = i + 2 if minimal else len(segments)
+        for j in range(i + 1, last):
+            if len(segments[i]) == len(segments[j]):
+                element_pair_perms = [Permutation(ai, bi) for ai, bi in zip(segments[i], segments[j])]
+                single_perm = functools.reduce(operator.mul, element_pair_perms)
+                gens.append(single_perm)
+
+    return gens
+
+
+def fused_row_generators(yt: YoungTableau, minimal: bool = False) -> List[Permutation]:
     """Get "fused" row generators for the Young Tableau. A fused row generator is a permutation that swaps two pairs of
     entire rows. Note that the rows must have the same length.
 
     Args:
         yt:
+            YoungTableau
+        minimal:
+            bool, if True only swap neighbouring rows of the same length
 
     Returns:
-
+        list: list of Permutation
     """
-    rows = yt.rows()
-    gens = []
-    for i in range(len(rows) - 1):
-        for j in range(i + 1, len(rows)):
-            if len(rows[i]) == len(rows[j]):
-                element_pair_perms = [Permutation(ai, bi) for ai, bi in zip(rows[i], rows[j])]
-                single_perm = functools.reduce(operator.mul, element_pair_perms)
-                gens.append(single_perm)
+    return _fused_generators(yt.rows(), minimal=minimal)
 
-    return gens
 
-
-def fused_col_generators(yt: YoungTableau) -> List[Permutation]:
+def fused_col_generators(yt: YoungTableau, minimal: bool = False) -> List[Permutation]:
     """Get "fused" column generators for the Young Tableau. A fused column generator is a permutation that swaps two pairs of
     entire columns. Note that the columns must have the same length.
 
     Args:
         yt:
+            YoungTableau
+        minimal:
+            bool, if True only swap neighbouring columns of the same length
 
     Returns:
-
+        list: list of Permutation
     """
-    cols = yt.columns()
-    gens = []
-    for i in range(len(cols) - 1):
-        for j in range(i + 1, len(cols)):
-            if len(cols[i]) == len(cols[j]):
-                element_pair_perms = [Permutation(ai, bi) for ai, bi in zip(cols[i], cols[j])]
-                single_perm = functools.reduce(operator.mul, element_pair_perms)
-                gens.append(single_perm)
-
-    return gens
+    return _fused_generators(yt.columns(), minimal=minimal)
 
 
-def col_generators(yt: YoungTableau) -> List[Permutation]:
+def col_generators(yt: YoungTableau, minimal: bool = False) -> List[Permutation]:
     """Get column generators for the Young Tableau
 
     Args:
         yt:
             YoungTableau
+        minimal:
+            bool, if True only the k - 1 adjacent transpositions of each column of length k
 
     Returns:
         list: list of Permutation
     """
+    from sympy.combinatorics import Permutation
+
     cols = yt.columns()
     gens = []
     for col in cols:
-        for c1, c2 in itertools.combinations(col, 2):
+        pairs = zip(col, col[1:]) if minimal else itertools.combinations(col, 2)
+        for c1, c2 in pairs:
             # Sort the pair
             if c1 > c2:
                 c1, c2 = c2, c1
@@ -99,7 +141,21 @@ def col_generators(yt: YoungTableau) -> List[Permutation]:
     return gens
 
 
-def generators(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> List[Permutation]:
+def _num_generators(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> int:
+    """Number of generators emitted by generators when not minimal, C(k, 2) per row or column of length k
+    and C(q, 2) fused swaps per q rows or columns of the same length"""
+    count = 0
+    for include, include_fused, lengths in ((include_rows, include_fused_rows, yt.parts()), (include_cols, include_fused_cols, yt.conjugate())):
+        if include:
+            count += sum(k * (k - 1) // 2 for k in lengths)
+        if include_fused:
+            count += sum(q * (q - 1) // 2 for q in collections.Counter(lengths).values())
+    return count
+
+
+@instrument.timed('young.generators')
+def generators(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False, *,
+               minimal: bool = False, return_dropped: bool = False) -> Union[List[Permutation], Tuple[List[Permutation], int]]:
     """Get generators for the Young Tableau
 
     Args:
@@ -109,28 +165,47 @@ def generators(yt: YoungTableau, include_rows: bool = True, include_cols: bool =
             bool, include row generators
         include_cols:
             bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+        minimal:
+            bool, if True emit an equivalent generating set, with adjacent transpositions within rows
+            and columns, swaps of neighbouring rows and columns only, and no duplicates (e.g. the swap
+            of two rows of length 1 is also a column transposition)
+        return_dropped:
+            bool, if True also return the number of generators dropped relative to minimal=False
 
     Returns:
-        list: list of Permutation
+        list: list of Permutation, or a tuple of the list and the number of dropped generators if return_dropped
     """
     perms = []
 
     if include_rows:
-        perms += row_generators(yt)
+        perms += row_generators(yt, minimal=minimal)
 
     if include_fused_rows:
-        perms += fused_row_generators(yt)
+        perms += fused_row_generators(yt, minimal=minimal)
 
     if include_cols:
-        perms += col_generators(yt)
+        perms += col_generators(yt, minimal=minimal)
 
     if include_fused_cols:
-        perms += fused_col_generators(yt)
+        perms += fused_col_generators(yt, minimal=minimal)
+
+    if minimal:
+        perms = list(dict.fromkeys(perms))
+    instrument.count('young.generators.built', len(perms))
 
+    if return_dropped:
+        flags = {'include_rows': include_rows, 'include_cols': include_cols, 'include_fused_rows': include_fused_rows, 'include_fused_cols': include_fused_cols}
+        return perms, _num_generators(yt, **flags) - len(perms)
     return perms
 
 
-def group(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> List[Permutation]:
+@instrument.timed('young.group')
+def group(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False, *,
+          backend: str = 'sympy', minimal: bool = False) -> PermutationGroup:
     """Get the group generated by the Young Tableau
 
     Args:
@@ -140,8 +215,337 @@ def group(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True
             bool, include row generators
         include_cols:
             bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+        backend:
+            str, 'sympy' for a sympy PermutationGroup, or 'numpy' for a perm.ArrayPermutationGroup,
+            whose elements are enumerated as integer arrays, accepted by the iso functions
+        minimal:
+            bool, if True generate the same group from fewer generators, see generators
 
     Returns:
-        list: list of Permutation
+        PermutationGroup or ArrayPermutationGroup
+    """
+    flags = {'include_rows': include_rows, 'include_cols': include_cols, 'include_fused_rows': include_fused_rows, 'include_fused_cols': include_fused_cols}
+    gens = generators(yt, minimal=minimal, **flags)
+    if backend == 'numpy':
+        G = ArrayPermutationGroup(gens)
+    elif backend == 'sympy':
+        from sympy.combinatorics import PermutationGroup
+        G = PermutationGroup(gens)
+    else:
+        raise ValueError(f"Unknown backend {backend}, expected 'sympy' or 'numpy'")
+    instrument.count('groups.built')
+
+    # The order and element orders follow from the shape, without enumerating the group
+    provide(G, 'order', lambda: group_order(yt, **flags))
+    provide(G, 'element_orders', lambda: tuple(element_order_histogram(yt, **flags).items()))
+    return G
+
+
+def _product(values) -> int:
+    """Product of integers, 1 if empty"""
+    return functools.reduce(operator.mul, values, 1)
+
+
+def _fused_order(lengths: Sequence[int], include_segments: bool = True) -> int:
+    """Get the order of the group permuting segments (rows or columns) of the given lengths, where segments
+    of equal length may be swapped as blocks. This is the product over lengths i of the wreath products
+    S_i wr S_{q_i}, or of S_{q_i} alone if the elements within a segment are not permuted.
+
+    Args:
+        lengths:
+            Sequence[int], lengths of the segments
+        include_segments:
+            bool, include the symmetric groups permuting elements within each segment
+
+    Returns:
+        int: group order
+    """
+    multiplicities = collections.Counter(lengths)
+    order = _product(math.factorial(q) for q in multiplicities.values())
+    if include_segments:
+        order *= _product(math.factorial(length) for length in lengths)
+    return order
+
+
+def group_order(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False, include_fused_cols: bool = False) -> int:
+    """Get the order of the group generated by the Young Tableau, see group. The order is computed
+    from the shape of the tableau where a closed form is known, with N = sum(p):
+
+        - rows and columns: |Y(p)| = N!
+        - rows: |Y(p)_RO| = Prod(p_i!), or |Y(p)_R| = |Y(p)_RO| * Prod(q_i!) with fused rows, where q_i
+          is the number of rows with length i. Fused columns swap elements within rows, so add nothing.
+        - columns: as for rows, with the conjugate partition
+        - fused rows (or fused columns) only: Prod(q_i!)
+
+    Only the group generated by fused rows and fused columns together falls back to Schreier-Sims.
+
+    Args:
+        yt:
+            YoungTableau
+        include_rows:
+            bool, include row generators
+        include_cols:
+            bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+
+    Returns:
+        int: order of the group
+    """
+    row_lengths = yt.parts()
+    col_lengths = yt.conjugate()
+
+    # Row and column transpositions connect every box, generating the full symmetric group
+    if include_rows and include_cols:
+        return math.factorial(sum(row_lengths))
+
+    if include_rows:
+        return _fused_order(row_lengths) if include_fused_rows else _product(math.factorial(length) for length in row_lengths)
+
+    if include_cols:
+        return _fused_order(col_lengths) if include_fused_cols else _product(math.factorial(length) for length in col_lengths)
+
+    if include_fused_rows and include_fused_cols:
+        with instrument.timer('young.group_order.schreier_sims'):
+            return group(yt, include_rows=False, include_cols=False, include_fused_rows=True, include_fused_cols=True).order()
+
+    if include_fused_rows:
+        return _fused_order(row_lengths, include_segments=False)
+
+    if include_fused_cols:
+        return _fused_order(col_lengths, include_segments=False)
+
+    return 1
+
+
+def _add(hist: CycleTypes, other: CycleTypes) -> CycleTypes:
+    """Sum of two cycle type histograms"""
+    result = dict(hist)
+    for cycle_type, count in other.items():
+        result[cycle_type] = result.get(cycle_type, 0) + count
+    return result
+
+
+def _convolve(hist: CycleTypes, other: CycleTypes) -> CycleTypes:
+    """Cycle type histogram of the direct product of two groups acting on disjoint points"""
+    result = {}
+    for a, m in hist.items():
+        for b, n in other.items():
+            cycle_type = tuple(sorted(a + b, reverse=True))
+            result[cycle_type] = result.get(cycle_type, 0) + m * n
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _symmetric_cycle_types(n: int) -> CycleTypes:
+    """Cycle type histogram of the symmetric group S_n, with n! / z(p) elements of cycle type p,
+    where z(p) = Prod(i^q_i q_i!) and q_i is the number of cycles of length i"""
+    result = {}
+    for p in partition.generate_partitions(n):
+        z = _product(i ** q * math.factorial(q) for i, q in collections.Counter(p).items())
+        result[tuple(p)] = math.factorial(n) // z
+    return result
+
+
+def _wreath_cycle_types(length: int, multiplicity: int, include_segments: bool = True) -> CycleTypes:
+    """Cycle type histogram of the group permuting multiplicity segments of the given length as blocks,
+    S_length wr S_multiplicity, or S_multiplicity alone if the elements within a segment are not permuted.
+
+    A cycle of length c of the block permutation, with product h in S_length of the segment permutations
+    along it, contributes a cycle of length c * m for each cycle of length m of h. Each h arises from
+    length!^(c - 1) choices of the segment permutations.
+    """
+    segment = _symmetric_cycle_types(length)
+    result = {}
+    for blocks, count in _symmetric_cycle_types(multiplicity).items():
+        if not include_segments:
+            cycle_type = tuple(c for c in blocks for _ in range(length))
+            result = _add(result, {cycle_type: count})
+            continue
+
+        hist = {(): count}
+        for c in blocks:
+            weight = math.factorial(length) ** (c - 1)
+            hist = _convolve(hist, {tuple(c * m for m in h): n * weight for h, n in segment.items()})
+        result = _add(result, hist)
+    return result
+
+
+def _fused_cycle_types(lengths: Sequence[int], include_segments: bool = True) -> CycleTypes:
+    """Cycle type histogram of the group of _fused_order, a direct product of wreath products"""
+    result = {(): 1}
+    for length, multiplicity in collections.Counter(lengths).items():
+        result = _convolve(result, _wreath_cycle_types(length, multiplicity, include_segments=include_segments))
+    return result
+
+
+def _enumerated_cycle_types(yt: YoungTableau, **flags) -> CycleTypes:
+    """Cycle type histogram on the boxes of a tableau, by enumerating the group with the array backend"""
+    G = group(yt, backend='numpy', **flags)
+    start = 0 if yt.zero_indexed else 1
+    n = sum(yt.parts())
+
+    # Restrict the array forms to the boxes, which may extend past the degree of the group
+    arrays = numpy.tile(numpy.arange(start + n), (G.order(), 1))
+    arrays[:, :G.degree] = G.array
+    types, counts = numpy.unique(perm.cycle_types(arrays[:, start:] - start), axis=0, return_counts=True)
+    return {tuple(m for m in range(len(t) - 1, 0, -1) for _ in range(t[m])): int(c) for t, c in zip(types.tolist(), counts.tolist())}
+
+
+def cycle_type_histogram(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False,
+                         include_fused_cols: bool = False) -> CycleTypes:
+    """Get the number of elements of each cycle type in the group generated by the Young Tableau, see group.
+    Cycle types are of the action on the N = sum(p) boxes of the tableau, as partitions of N. As for
+    group_order, the histogram is derived from the shape, the group being a direct product of symmetric
+    groups, or of wreath products S_i wr S_{q_i} with fused rows or columns. Only the group generated by
+    fused rows and fused columns together is enumerated.
+
+    Args:
+        yt:
+            YoungTableau
+        include_rows:
+            bool, include row generators
+        include_cols:
+            bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+
+    Returns:
+        Dict[Tuple[int, ...], int]: number of elements of each cycle type, cycle lengths in non-increasing order
+    """
+    row_lengths = yt.parts()
+    col_lengths = yt.conjugate()
+
+    if include_rows and include_cols:
+        hist = _symmetric_cycle_types(sum(row_lengths))
+    elif include_rows:
+        hist = _fused_cycle_types(row_lengths) if include_fused_rows else functools.reduce(_convolve, map(_symmetric_cycle_types, row_lengths), {(): 1})
+    elif include_cols:
+        hist = _fused_cycle_types(col_lengths) if include_fused_cols else functools.reduce(_convolve, map(_symmetric_cycle_types, col_lengths), {(): 1})
+    elif include_fused_rows and include_fused_cols:
+        hist = _enumerated_cycle_types(yt, include_rows=False, include_cols=False, include_fused_rows=True, include_fused_cols=True)
+    elif include_fused_rows:
+        hist = _fused_cycle_types(row_lengths, include_segments=False)
+    elif include_fused_cols:
+        hist = _fused_cycle_types(col_lengths, include_segments=False)
+    else:
+        hist = {(1,) * sum(row_lengths): 1}
+
+    return dict(sorted(hist.items()))
+
+
+def element_order_histogram(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, include_fused_rows: bool = False,
+                            include_fused_cols: bool = False) -> Dict[int, int]:
+    """Get the number of elements of each order in the group generated by the Young Tableau, see group.
+    The order of an element is the least common multiple of its cycle lengths, see cycle_type_histogram.
+
+    Args:
+        yt:
+            YoungTableau
+        include_rows:
+            bool, include row generators
+        include_cols:
+            bool, include column generators
+        include_fused_rows:
+            bool, include fused row generators
+        include_fused_cols:
+            bool, include fused column generators
+
+    Returns:
+        Dict[int, int]: number of elements of each order, sorted by order
+    """
+    hist = collections.Counter()
+    cycle_types = cycle_type_histogram(yt, include_rows=include_rows, include_cols=include_cols, include_fused_rows=include_fused_rows,
+                                       include_fused_cols=include_fused_cols)
+    for cycle_type, count in cycle_types.items():
+        hist[functools.reduce(lambda a, b: a * b // math.gcd(a, b), cycle_type, 1)] += count
+    return dict(sorted(hist.items()))
+
+
+@functools.lru_cache(maxsize=256)
+def _symmetrizer_steps(yt: YoungTableau, include_rows: bool = True, include_cols: bool = True) -> Tuple[Tuple[Tuple[Tuple[int, ...], int], ...], ...]:
+    """Get the factors of the row symmetrizer and column antisymmetrizer as sums over coset representatives.
+
+    The sum over S_k factorises as the sum over S_{k - 1} times the sum over the representatives e, (j k)
+    for j < k of its cosets, so that each row or column of length k takes k - 1 steps of at most k terms
+    rather than k! terms. Each term is the axis permutation of a transposition and its sign in the sum.
+
+    Returns:
+        tuple: steps, each a tuple of (axes, sign) terms, rows first, then columns
+    """
+    start = 0 if yt.zero_indexed else 1
+    identity = tuple(range(sum(yt.parts())))
+    steps = []
+    for include, segments, sign in ((include_rows, yt.rows(), 1), (include_cols, yt.columns(), -1)):
+        if not include:
+            continue
+        for segment in segments:
+            axes = [label - start for label in segment]
+            for k in range(1, len(axes)):
+                terms = [(identity, 1)]
+                for j in range(k):
+                    swap = list(identity)
+                    swap[axes[j]], swap[axes[k]] = axes[k], axes[j]
+                    terms.append((tuple(swap), sign))
+                steps.append(tuple(terms))
+    return tuple(steps)
+
+
+def symmetrize(tensor: numpy.ndarray, yt: YoungTableau, include_rows: bool = True, include_cols: bool = True, normalize: bool = True) -> numpy.ndarray:
+    """Apply the symmetry of a Young Tableau to a tensor, whose axes correspond to the boxes of the tableau in order
+
+        - rows: the row symmetrizer, the sum of the tensor over permutations of indices within rows
+        - columns: the column antisymmetrizer, the signed sum over permutations of indices within columns
+        - rows and columns: the Young projector, the row symmetrizer followed by the column antisymmetrizer,
+          so that the result is antisymmetric in the indices of each column
+
+    The sums are accumulated one transposed view at a time over a coset factorisation of the row and column
+    groups, see _symmetrizer_steps, so that at most two tensors are held in memory whatever the group order.
+    For example, a rank 4 tensor projected by shape 2 + 2 has the index symmetries of the Riemann tensor, with
+    yt.dimension(d) independent components.
+
+    Args:
+        tensor:
+            numpy.ndarray, rank N = sum(p), with axes of equal length
+        yt:
+            YoungTableau
+        include_rows:
+            bool, symmetrize over rows
+        include_cols:
+            bool, antisymmetrize over columns
+        normalize:
+            bool, if True divide by the group orders, making the symmetrizers and the Young projector idempotent
+
+    Returns:
+        numpy.ndarray: tensor of the same shape, floating point if normalized
     """
-    return PermutationGroup(generators(yt, include_rows=include_rows, include_cols=include_cols, include_fused_rows=include_fused_rows, include_fused_cols=include_fused_cols))
+    if tensor.ndim != sum(yt.parts()):
+        raise ValueError(f"Tensor of rank {tensor.ndim} does not match {yt}, with {sum(yt.parts())} boxes")
+
+    dtype = numpy.result_type(tensor, float) if normalize else tensor.dtype
+    result = numpy.asarray(tensor, dtype=dtype)
+
+    for terms in _symmetrizer_steps(yt, include_rows=include_rows, include_cols=include_cols):
+        accumulated = numpy.zeros_like(result)
+        for axes, sign in terms:
+            if sign > 0:
+                accumulated += result.transpose(axes)
+            else:
+                accumulated -= result.transpose(axes)
+        if normalize:
+            accumulated /= len(terms)
+        result = accumulated
+
+    # The product of the normalized symmetrizers is idempotent up to |R| |C| / Prod(hook lengths)
+    if normalize and include_rows and include_cols:
+        result *= group_order(yt, include_cols=False) * group_order(yt, include_rows=False) / yt.hook_product()
+
+    return result
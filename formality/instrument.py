@@ -0,0 +1,186 @@
+"""Opt-in instrumentation of the hot paths of formality
+
+Named counters and timers are recorded by the comb and groups modules, e.g. partitions
+generated, groups built, elements enumerated and isomorphism candidates tried. Recording
+is disabled by default, when each hot path costs a single check of ENABLED, and is scoped
+to one experiment with the collect context manager:
+
+    with instrument.collect() as report:
+        run_experiment()
+    print(report.json())
+
+Names are dotted by phase, e.g. 'iso.candidates' or 'invariants.element_orders'.
+"""
+
+import contextlib
+import functools
+import json
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+# Whether counters and timers are recorded, checked by every instrumented hot path
+ENABLED = False
+
+_counters: Dict[str, int] = {}
+_timers: Dict[str, Dict[str, float]] = {}
+
+
+def enable():
+    """Start recording counters and timers"""
+    global ENABLED  # pylint: disable=global-statement
+    ENABLED = True
+
+
+def disable():
+    """Stop recording counters and timers, keeping those recorded so far"""
+    global ENABLED  # pylint: disable=global-statement
+    ENABLED = False
+
+
+def reset():
+    """Clear all counters and timers"""
+    _counters.clear()
+    _timers.clear()
+
+
+def count(name: str, n: int = 1):
+    """Increment a counter, if enabled
+
+    Args:
+        name:
+            str, name of the counter
+        n:
+            int, increment
+    """
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def _add_time(name: str, seconds: float, calls: int = 1):
+    """Add time to a timer"""
+    entry = _timers.setdefault(name, {'calls': 0, 'seconds': 0.0})
+    entry['calls'] += calls
+    entry['seconds'] += seconds
+
+
+@contextlib.contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Time a block of code, if enabled
+
+    Args:
+        name:
+            str, name of the timer
+    """
+    if not ENABLED:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add_time(name, time.perf_counter() - start)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function, if enabled
+
+    Args:
+        name:
+            str, name of the timer
+
+    Returns:
+        Callable: decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _add_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def stats() -> dict:
+    """Get the counters and timers recorded so far
+
+    Returns:
+        dict: 'counters', name to count, and 'timers', name to number of calls and total seconds
+    """
+    return {
+        'counters': dict(sorted(_counters.items())),
+        'timers': {name: dict(entry) for name, entry in sorted(_timers.items())},
+    }
+
+
+def dump(path: Optional[str] = None, **metadata) -> str:
+    """Dump the counters and timers recorded so far as JSON
+
+    Args:
+        path:
+            str, optional, file to write the JSON to
+        **metadata:
+            additional JSON-serialisable fields, e.g. the name of the experiment
+
+    Returns:
+        str: JSON
+    """
+    text = json.dumps({**metadata, **stats()}, indent=2)
+    if path is not None:
+        with open(path, 'w') as fid:
+            fid.write(text)
+    return text
+
+
+class Report:
+    """Counters and timers recorded within a collect block, available once the block exits"""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, Dict[str, float]] = {}
+
+    def to_dict(self) -> dict:
+        """Get the recorded counters and timers, as for stats"""
+        return {'counters': self.counters, 'timers': self.timers}
+
+    def json(self, **metadata) -> str:
+        """Get the recorded counters and timers as JSON, as for dump"""
+        return json.dumps({**metadata, **self.to_dict()}, indent=2)
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[Report]:
+    """Record counters and timers for a block of code only. Anything recorded before the block is
+    kept aside and restored afterwards, with the block's own records added to it if recording was
+    already enabled, so that collect blocks may be nested.
+
+    Returns:
+        Iterator[Report]: report, filled in when the block exits
+    """
+    was_enabled = ENABLED
+    counters, timers = dict(_counters), {name: dict(entry) for name, entry in _timers.items()}
+    reset()
+    enable()
+    report = Report()
+    try:
+        yield report
+    finally:
+        inner = stats()
+        report.counters, report.timers = inner['counters'], inner['timers']
+
+        # Restore the outer records, adding the inner ones if the outer scope was recording too
+        reset()
+        _counters.update(counters)
+        _timers.update(timers)
+        if was_enabled:
+            for name, n in report.counters.items():
+                _counters[name] = _counters.get(name, 0) + n
+            for name, entry in report.timers.items():
+                _add_time(name, entry['seconds'], calls=entry['calls'])
+        else:
+            disable()
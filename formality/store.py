@@ -0,0 +1,130 @@
+"""Content-addressed store of experiment results, backed by SQLite
+
+Each result is keyed by a hash of the parameters that produced it, so that a rerun, or
+a run over an extended range, finds the results it has already computed and only
+computes the missing ones. Results are committed one at a time as they are produced,
+so an interrupted run loses nothing that was finished.
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class SQLiteStore:
+    """Base of the persistent stores, a single SQLite table with a JSON value column, written
+    one row at a time and committed immediately. Subclasses set the TABLE name and its COLUMNS"""
+
+    TABLE = ''
+    COLUMNS = ''
+
+    def __init__(self, path: str = ':memory:'):
+        """Open (or create) a store
+
+        Args:
+            path:
+                str, path to the SQLite database file, default ':memory:' (not persistent)
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS {self.TABLE} ({self.COLUMNS})')
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _upsert(self, *values: Any):
+        """Insert or replace a row, committed immediately"""
+        self._upsert_many([values])
+
+    def _upsert_many(self, rows: Iterable[Tuple[Any, ...]]):
+        """Insert or replace rows of the same length, committed together"""
+        rows = list(rows)
+        if rows:
+            self._conn.executemany(f'INSERT OR REPLACE INTO {self.TABLE} VALUES ({", ".join("?" * len(rows[0]))})', rows)
+            self._conn.commit()
+
+    def _value(self, where: str, *args: Any) -> Optional[Any]:
+        """Get the decoded value of the row matching a condition, or None if missing"""
+        row = self._conn.execute(f'SELECT value FROM {self.TABLE} WHERE {where}', args).fetchone()
+        return None if row is None else json.loads(row[0])
+
+
+class ResultStore(SQLiteStore):
+    """Persistent store of experiment results, keyed by a hash of their parameters"""
+
+    TABLE = 'results'
+    COLUMNS = 'key TEXT PRIMARY KEY, params TEXT, value TEXT'
+
+    def __len__(self) -> int:
+        """Number of results in the store"""
+        return self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __contains__(self, params: Dict[str, Any]) -> bool:
+        """Check if the result of a set of parameters is in the store"""
+        return self._conn.execute('SELECT 1 FROM results WHERE key = ?', (self.key(params),)).fetchone() is not None
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        """Get the key of a set of parameters, the SHA-256 hash of their canonical JSON
+
+        Args:
+            params:
+                dict, JSON-serialisable parameters
+
+        Returns:
+            str: key
+        """
+        return hashlib.sha256(json.dumps(params, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Any]:
+        """Get the result of a set of parameters
+
+        Args:
+            params:
+                dict, JSON-serialisable parameters
+
+        Returns:
+            Any: result, or None if missing
+        """
+        return self._value('key = ?', self.key(params))
+
+    def put(self, params: Dict[str, Any], value: Any):
+        """Save the result of a set of parameters, committed immediately
+
+        Args:
+            params:
+                dict, JSON-serialisable parameters
+            value:
+                Any, JSON-serialisable result
+        """
+        self._upsert(self.key(params), json.dumps(params, sort_keys=True), json.dumps(value))
+
+    def missing(self, params: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get the sets of parameters whose results are not in the store
+
+        Args:
+            params:
+                Iterable[dict], sets of parameters
+
+        Returns:
+            List[dict]: sets of parameters without results, in the given order
+        """
+        return [p for p in params if p not in self]
+
+    def rows(self) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """Iterate over the results in the store
+
+        Returns:
+            Iterator[Tuple[dict, Any]]: pairs of parameters and result, in order of insertion
+        """
+        for params, value in self._conn.execute('SELECT params, value FROM results ORDER BY rowid'):
+            yield json.loads(params), json.loads(value)
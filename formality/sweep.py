@@ -0,0 +1,147 @@
+"""Utilities for running experiments over all partitions of n in parallel
+
+The partitions (or any other inputs, see imap) are generated in the parent process
+and dispatched to a pool of worker processes in fixed-size chunks. Results are yielded in partition order,
+with a bounded number of chunks in flight so memory use does not grow with n.
+"""
+
+import collections
+import concurrent.futures
+import importlib
+import itertools
+import os
+from typing import Any, Callable, Generator, Iterable, List, Optional, Tuple
+
+from maths.comb import partition
+
+# Modules imported by each worker on startup, so the first task does not pay for them
+WARM_MODULES = ("sympy.combinatorics",)
+
+
+def _warm(modules: Iterable[str]):
+    """Import modules in a freshly started worker process
+
+    Args:
+        modules:
+            Iterable[str], names of the modules to import
+    """
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _run_chunk(func: Callable[[List[int]], Any], chunk: List[List[int]]) -> List[Any]:
+    """Apply a function to each partition in a chunk
+
+    Args:
+        func:
+            Callable, function of a single partition
+        chunk:
+            List[List[int]], partitions
+
+    Returns:
+        list: results, in the order of the chunk
+    """
+    return [func(p) for p in chunk]
+
+
+def _chunked(items: Iterable[Any], chunk_size: int) -> Generator[List[Any], None, None]:
+    """Split an iterable into lists of at most chunk_size items"""
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def chunks(n: int, chunk_size: int, **restrictions) -> Generator[List[List[int]], None, None]:
+    """Generate the partitions of n in lists of at most chunk_size partitions
+
+    Args:
+        n:
+            int, number to partition
+        chunk_size:
+            int, number of partitions per chunk
+        **restrictions:
+            max_part, num_parts or min_part, passed to partition.generate_partitions
+
+    Returns:
+        Generator[List[List[int]]]: chunks of partitions
+    """
+    return _chunked(partition.generate_partitions(n, **restrictions), chunk_size)
+
+
+def imap(func: Callable[[Any], Any], items: Iterable[Any], workers: Optional[int] = None, *, chunk_size: int = 256, max_pending: Optional[int] = None,
+         warm_modules: Iterable[str] = WARM_MODULES) -> Generator[Tuple[Any, Any], None, None]:
+    """Apply a function to every item of an iterable using a pool of worker processes
+
+    Args:
+        func:
+            Callable, function of a single item, must be picklable (e.g. defined at module level)
+        items:
+            Iterable, inputs, consumed lazily
+        workers:
+            int, number of worker processes, default None (one per CPU). If 0, run in the current process
+        chunk_size:
+            int, number of items sent to a worker at once
+        max_pending:
+            int, maximum number of chunks in flight, default None (twice the number of workers)
+        warm_modules:
+            Iterable[str], modules imported by each worker on startup
+
+    Returns:
+        Generator[Tuple[Any, Any]]: pairs of item and result, in the order of the items
+    """
+    if workers == 0:
+        for item in items:
+            yield item, func(item)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_warm, initargs=(tuple(warm_modules),)) as executor:
+        pending = collections.deque()
+        try:
+            for chunk in _chunked(items, chunk_size):
+                pending.append((chunk, executor.submit(_run_chunk, func, chunk)))
+
+                # Stream out the oldest chunk once enough work is queued
+                if len(pending) >= max_pending:
+                    chunk, future = pending.popleft()
+                    yield from zip(chunk, future.result())
+
+            while pending:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        finally:
+            # Abandon queued work if the caller stops early
+            for _, future in pending:
+                future.cancel()
+
+
+def sweep(func: Callable[[List[int]], Any], n: int, workers: Optional[int] = None, *, chunk_size: int = 256, max_pending: Optional[int] = None,
+          warm_modules: Iterable[str] = WARM_MODULES, **restrictions) -> Generator[Tuple[List[int], Any], None, None]:
+    """Apply a function to every partition of n using a pool of worker processes, see imap
+
+    Args:
+        func:
+            Callable, function of a single partition, must be picklable (e.g. defined at module level)
+        n:
+            int, number to partition
+        workers:
+            int, number of worker processes, default None (one per CPU). If 0, run in the current process
+        chunk_size:
+            int, number of partitions sent to a worker at once
+        max_pending:
+            int, maximum number of chunks in flight, default None (twice the number of workers)
+        warm_modules:
+            Iterable[str], modules imported by each worker on startup
+        **restrictions:
+            max_part, num_parts or min_part, passed to partition.generate_partitions
+
+    Returns:
+        Generator[Tuple[List[int], Any]]: pairs of partition and result, in the order of partition.generate_partitions
+    """
+    return imap(func, partition.generate_partitions(n, **restrictions), workers=workers, chunk_size=chunk_size, max_pending=max_pending,
+                warm_modules=warm_modules)
@@ -0,0 +1,49 @@
+"""Tests for the mathexp.experiment and mathexp.cli modules."""
+
+import pytest
+
+from maths import cli, experiment
+from maths.store import ResultStore
+
+
+class TestExperiment:
+    """Test group"""
+
+    def test_families(self):
+        """Test families of partitions"""
+        assert list(experiment.FAMILIES['rectangular'](6)) == [[6], [3, 3], [2, 2, 2], [1] * 6]
+        assert list(experiment.FAMILIES['hook'](3)) == [[3], [2, 1], [1, 1, 1]]
+        assert list(experiment.FAMILIES['two_row'](4)) == [[2, 2], [3, 1]]
+
+    def test_parse_flags(self):
+        """Test parse_flags method"""
+        assert experiment.parse_flags('rows,fused_rows') == {'include_rows': True, 'include_cols': False, 'include_fused_rows': True, 'include_fused_cols': False}
+        with pytest.raises(ValueError):
+            experiment.parse_flags('rows,diagonals')
+
+    def test_compute(self):
+        """Test compute method, Y(2+2)_R is isomorphic to D8"""
+        rows = experiment.params('rectangular', [4], [experiment.parse_flags('rows,fused_rows')], compare=['dihedral'])
+        results = {tuple(row['partition']): experiment.compute(row) for row in rows}
+        assert results[(2, 2)] == {'order': 8, 'element_orders': [[1, 1], [2, 5], [4, 2]], 'compare_order': 8, 'iso_possible': True}
+        assert not results[(4,)]['iso_possible']
+
+    def test_run_resumes(self):
+        """Test a rerun over an extended range computes only the missing rows"""
+        flags = [experiment.parse_flags('rows,cols')]
+        with ResultStore() as store:
+            first = list(experiment.run(store, experiment.params('all', range(1, 5), flags)))
+            assert all(new for _, _, new in first)
+            second = list(experiment.run(store, experiment.params('all', range(1, 6), flags)))
+            assert sum(new for _, _, new in second) == 7
+            assert len(second) == len(store) == 18
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the sweep and show commands"""
+        path = str(tmp_path / 'results.db')
+        assert cli.main(['sweep', '--n', '2:3', '--flags', 'rows', '--compare', 'symmetric', '--store', path]) == 0
+        assert capsys.readouterr().out.splitlines()[0] == '1 + 1\trows\t1\tsymmetric\t2\tFalse'
+        assert cli.main(['sweep', '--n', '3', '--flags', 'rows', '--compare', 'symmetric', '--store', path]) == 0
+        assert capsys.readouterr().out == ''
+        assert cli.main(['show', '--store', path]) == 0
+        assert len(capsys.readouterr().out.splitlines()) == 5
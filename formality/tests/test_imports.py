@@ -0,0 +1,86 @@
+"""Tests for the import time of the comb and groups modules, which must not import sympy"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules importable without sympy
+MODULES = (
+    'maths.comb.partition',
+    'maths.comb.batch',
+    'maths.comb.young',
+    'maths.comb.standard',
+    'maths.comb.rsk',
+    'maths.groups.perm',
+    'maths.groups.cayley',
+    'maths.groups.invariants',
+    'maths.groups.iso',
+    'maths.groups.search',
+    'maths.groups.young',
+    'maths.groups.cache',
+    'maths.experiment',
+    'maths.cli',
+)
+
+# Budget for importing all of MODULES in a fresh interpreter, in seconds, importing sympy alone takes longer
+IMPORT_BUDGET = 1.0
+
+SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'sympy': sorted(m for m in sys.modules if m.split('.')[0] == 'sympy')}))
+"""
+
+
+def _run(code: str, *args: str) -> str:
+    """Run code in a fresh interpreter with the current import path, returning its output"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    return subprocess.run([sys.executable, '-c', code, *args], env=env, capture_output=True, text=True, check=True).stdout
+
+
+class TestImports:
+    """Test group"""
+
+    def test_no_sympy(self):
+        """Test that importing the comb and groups modules does not import sympy, within the budget"""
+        result = json.loads(_run(SCRIPT, *MODULES))
+        assert result['sympy'] == []
+        assert result['elapsed'] < IMPORT_BUDGET
+
+    def test_pure_integer_code(self):
+        """Test that partitions and Young Tableaux are generated and parsed without importing sympy"""
+        code = """
+import sys
+from maths.comb import partition
+from maths.comb.young import YoungTableau
+assert len(list(partition.generate_partitions(8))) == 22
+yt = YoungTableau([1, 3, 2])
+assert yt.parts() == (3, 2, 1) and YoungTableau("3 + 2 + 1") == yt
+for invalid in ([2, 0], [2.0, 1], "1 + 2", "2 + 0"):
+    try:
+        YoungTableau(invalid)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(invalid)
+print('sympy' in sys.modules)
+"""
+        assert _run(code).strip() == 'False'
+
+    def test_sympy_on_request(self):
+        """Test that sympy objects are still created on request"""
+        code = """
+from maths.comb import partition
+from maths.comb.young import YoungTableau
+from maths.groups import young
+assert partition.from_str("3 + 1").partition == [3, 1]
+assert YoungTableau("3 + 1").integer_partition().partition == [3, 1]
+assert young.group(YoungTableau("2 + 1"), include_cols=False).order() == 2
+assert young.Permutation(1, 2) == young.row_generators(YoungTableau("2 + 1"))[0]
+print('ok')
+"""
+        assert _run(code).strip() == 'ok'
@@ -0,0 +1,71 @@
+"""Tests for the mathexp.instrument module."""
+
+import json
+
+from sympy.combinatorics import DihedralGroup
+
+from maths import instrument
+from maths.comb import partition
+from maths.comb.young import YoungTableau
+from maths.groups import invariants, iso, young
+from maths.groups.iso import IsoMethod
+
+
+class TestInstrument:
+    """Test group"""
+
+    def test_disabled(self):
+        """Test nothing is recorded by default"""
+        instrument.reset()
+        list(partition.generate_partitions(5))
+        assert instrument.stats() == {'counters': {}, 'timers': {}}
+
+    def test_collect(self):
+        """Test counters and timers recorded within a collect block"""
+        with instrument.collect() as report:
+            list(partition.generate_partitions(5))
+        assert report.counters == {'partitions.generated': 7}
+
+        # Start from cold caches, so that the elements of both groups are enumerated
+        invariants.invariants.cache_clear()
+        with instrument.collect() as report:
+            A = young.group(YoungTableau("2 + 2"), include_cols=False, include_fused_rows=True)
+            iso.find_iso(A, DihedralGroup(4), IsoMethod.ElementOrders)
+
+        assert not instrument.ENABLED
+        assert report.counters['groups.built'] == 1
+        assert report.counters['young.generators.built'] == 3
+        assert report.counters['elements.enumerated'] == 16
+        assert report.counters['iso.candidates'] >= 1
+        assert report.counters['iso.products'] >= 64
+        assert report.timers['young.group']['calls'] == 1
+        assert 'invariants.elements' in report.timers
+        assert json.loads(report.json(experiment='d8'))['experiment'] == 'd8'
+
+    def test_nested(self):
+        """Test an inner collect block adds its records to an enclosing one"""
+        with instrument.collect() as outer:
+            instrument.count('a')
+            with instrument.collect() as inner:
+                instrument.count('a', 2)
+                with instrument.timer('t'):
+                    pass
+            instrument.count('b')
+
+        assert inner.counters == {'a': 2}
+        assert outer.counters == {'a': 3, 'b': 1}
+        assert outer.timers['t']['calls'] == 1
+
+    def test_dump(self, tmp_path):
+        """Test stats are dumped as JSON"""
+        path = str(tmp_path / 'stats.json')
+        instrument.reset()
+        instrument.enable()
+        try:
+            instrument.count('x', 3)
+            instrument.dump(path)
+        finally:
+            instrument.disable()
+            instrument.reset()
+        with open(path) as fid:
+            assert json.load(fid)['counters'] == {'x': 3}
@@ -0,0 +1,31 @@
+"""Tests for the mathexp.store module."""
+
+from maths.store import ResultStore
+
+
+class TestResultStore:
+    """Test group"""
+
+    def test_put_get(self):
+        """Test results are keyed by their parameters, whatever the order of the keys"""
+        with ResultStore() as store:
+            assert store.get({'a': 1, 'b': [2]}) is None
+            store.put({'a': 1, 'b': [2]}, {'order': 8})
+            assert store.get({'b': [2], 'a': 1}) == {'order': 8}
+            assert {'a': 1, 'b': [2]} in store
+            assert {'a': 2, 'b': [2]} not in store
+            assert len(store) == 1
+
+    def test_missing(self):
+        """Test missing returns the parameters without results, in order"""
+        with ResultStore() as store:
+            store.put({'n': 2}, 2)
+            assert store.missing([{'n': 1}, {'n': 2}, {'n': 3}]) == [{'n': 1}, {'n': 3}]
+
+    def test_persistent(self, tmp_path):
+        """Test results are kept across connections"""
+        path = str(tmp_path / 'results.db')
+        with ResultStore(path) as store:
+            store.put({'n': 2}, [1, 2])
+        with ResultStore(path) as store:
+            assert list(store.rows()) == [({'n': 2}, [1, 2])]
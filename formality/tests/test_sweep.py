@@ -0,0 +1,30 @@
+"""Tests for the mathexp.sweep module."""
+
+from maths import sweep
+from maths.comb import partition
+
+
+class TestSweep:
+    """Test group"""
+
+    def test_chunks(self):
+        """Test sweep.chunks method"""
+        chunks = list(sweep.chunks(6, 4))
+        assert [len(c) for c in chunks] == [4, 4, 3]
+        assert sum(chunks, []) == list(partition.generate_partitions(6))
+
+    def test_sweep_serial(self):
+        """Test sweep.sweep method in the current process"""
+        results = list(sweep.sweep(len, 5, workers=0))
+        assert results == [(p, len(p)) for p in partition.generate_partitions(5)]
+
+    def test_sweep_parallel(self):
+        """Test sweep.sweep method with worker processes, results must come back in order"""
+        results = list(sweep.sweep(max, 12, workers=2, chunk_size=5, max_pending=2, warm_modules=()))
+        assert results == [(p, max(p)) for p in partition.generate_partitions(12)]
+
+    def test_sweep_restricted(self):
+        """Test sweep.sweep method with restrictions on the partitions"""
+        results = list(sweep.sweep(len, 10, workers=2, num_parts=3))
+        assert [p for p, _ in results] == list(partition.generate_partitions(10, num_parts=3))
+        assert all(r == 3 for _, r in results)
@@ -3,13 +3,16 @@
 
 import pathlib
 
-from setuptools import setup
+from setuptools import find_packages, setup
 
 here = pathlib.Path(__file__).parent.resolve()
 
 # Get the long description from the README file
 long_description = (here / "README.md").read_text(encoding="utf-8")
 
+# The sources in formality/ are imported as the maths package
+packages = ["maths"] + ["maths." + name for name in find_packages("formality", exclude=["tests", "*.tests"])]
+
 setup(name="formality",
       version="0.0.2",
       description="Formality - Symbolic Mathematics",
@@ -30,18 +33,19 @@ setup(name="formality",
           "Programming Language :: Python :: 3 :: Only",
       ],
       keywords="symbolic math, combinatorics, finite groups",
-      packages=['formality'],
+      packages=packages,
+      package_dir={"maths": "formality"},
       python_requires=">=3.7, <4",
-      install_requires=["sympy"],
+      install_requires=["numpy", "sympy"],
       extras_require={  # Optional
           "dev": ["check-manifest"],
           "test": ["pytest", "pytest-cov"],
       },
-      # entry_points={  # Optional
-      #     "console_scripts": [
-      #         "torus=scripts.torus:main",
-      #     ],
-      # },
+      entry_points={
+          "console_scripts": [
+              "formality=maths.cli:main",
+          ],
+      },
       project_urls={  # Optional
           "Bug Reports": "https://github.com/JWKennington/formality/issues",
           "Funding": "https://www.buymeacoffee.com/locallytrivial",